@@ -0,0 +1,294 @@
+"""
+Deadline scheduler
+Giữ các mốc nhắc hạn của công việc đang mở trong một min-heap và chỉ thức dậy ở mốc gần nhất:
+nạp một lần bằng truy vấn theo index, sau đó cập nhật tăng dần khi công việc được tạo/dời hạn/hoàn thành
+"""
+import heapq
+import itertools
+import json
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from config.logging_config import get_logger
+from config.settings import config
+from domain.entities.task import OPEN_STATUSES, Task
+
+logger = get_logger('reminders')
+
+# (id, title, assigned_to, due_date) - một dòng của truy vấn nạp ban đầu
+Deadline = Tuple[int, str, Optional[int], datetime]
+
+# Ngủ tối đa một giờ mỗi lần: máy sleep hoặc đổi giờ hệ thống không làm trễ lần nhắc quá lâu
+MAX_WAIT_SECONDS = 3600.0
+# Dựng lại heap khi entry đã hủy vượt ngưỡng này và chiếm hơn nửa heap
+COMPACT_THRESHOLD = 1000
+
+
+@dataclass(frozen=True)
+class DeadlineReminder:
+    """Một lần nhắc: công việc hết hạn lúc ``due_date``, mốc nhắc trước ``lead_minutes`` phút"""
+    task_id: int
+    title: str
+    assigned_to: Optional[int]
+    due_date: datetime
+    lead_minutes: int
+
+    def message(self, now: Optional[datetime] = None) -> str:
+        remaining = max(self.due_date - (now or datetime.now()), timedelta(0))
+        if remaining >= timedelta(days=1):
+            left = f"{remaining.days} ngày"
+        elif remaining >= timedelta(hours=1):
+            left = f"{remaining.seconds // 3600} giờ"
+        else:
+            left = f"{max(1, remaining.seconds // 60)} phút"
+        return f"'{self.title}' hết hạn sau {left}"
+
+    def to_dict(self) -> dict:
+        return {
+            'task_id': self.task_id, 'title': self.title, 'assigned_to': self.assigned_to,
+            'due_date': self.due_date.isoformat(), 'lead_minutes': self.lead_minutes,
+        }
+
+
+class DeadlineScheduler:
+    """
+    Min-heap các mốc nhắc (due_date - lead) của công việc đang mở.
+
+    Luồng nền ngủ trên một Condition tới mốc gần nhất; mọi thay đổi lịch đều
+    đánh thức nó để tính lại thời gian chờ. Đổi/xóa công việc không tìm trong
+    heap mà đánh dấu entry cũ là đã hủy - entry hủy bị bỏ qua khi lên đỉnh heap.
+    Mốc nhắc đã qua mà công việc chưa tới hạn được gộp thành một lần nhắc ngay;
+    mốc đã phát cho cùng due_date không phát lại khi nạp lại lịch.
+    """
+
+    def __init__(self, load_deadlines: Callable[[datetime], Sequence[Deadline]],
+                 fetch_task: Optional[Callable[[int], Optional[Task]]] = None,
+                 leads_minutes: Iterable[int] = (1440, 60)):
+        self.load_deadlines = load_deadlines
+        self.fetch_task = fetch_task
+        self.leads = sorted({int(minutes) for minutes in leads_minutes}, reverse=True)
+        self._heap: List[list] = []  # [fire_at, seq, task_id (None = đã hủy), DeadlineReminder]
+        self._entries: Dict[int, List[list]] = {}
+        self._cancelled = 0
+        self._fired: Dict[int, Tuple[datetime, int]] = {}  # task_id -> (due_date, lead nhỏ nhất đã phát)
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._subscribers: List[Callable[[List[DeadlineReminder]], None]] = []
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+        self.fired_count = 0
+
+    def subscribe(self, callback: Callable[[List[DeadlineReminder]], None]):
+        """Đăng ký nhận lô nhắc hạn (gọi trên luồng scheduler)"""
+        self._subscribers.append(callback)
+
+    def __len__(self) -> int:
+        """Số mốc nhắc đang chờ"""
+        with self._condition:
+            return len(self._heap) - self._cancelled
+
+    @property
+    def next_fire_at(self) -> Optional[datetime]:
+        with self._condition:
+            self._drop_cancelled_top()
+            return self._heap[0][0] if self._heap else None
+
+    # Cập nhật lịch
+    def reload(self):
+        """Nạp lại toàn bộ từ database (một truy vấn theo index công việc đang mở)"""
+        now = datetime.now()
+        deadlines = self.load_deadlines(now)
+        with self._condition:
+            self._heap, self._entries, self._cancelled = [], {}, 0
+            open_ids = {deadline[0] for deadline in deadlines}
+            self._fired = {task_id: fired for task_id, fired in self._fired.items() if task_id in open_ids}
+            for task_id, title, assigned_to, due_date in deadlines:
+                self._schedule(task_id, title, assigned_to, due_date, now, heapify=False)
+            heapq.heapify(self._heap)
+            self._condition.notify_all()
+        logger.info(f"Deadline scheduler: {len(deadlines)} open deadlines, {len(self)} reminders")
+
+    def track(self, task: Task):
+        """Công việc vừa tạo/sửa: lên lịch lại theo due_date, bỏ lịch nếu không còn mở"""
+        if task.id is None:
+            return
+        due_date = task.due_date if task.status in OPEN_STATUSES else None
+        with self._condition:
+            self._schedule(task.id, task.title, task.assigned_to, due_date, datetime.now())
+            self._condition.notify_all()
+
+    def discard(self, task_id: int):
+        """Công việc bị xóa: bỏ các mốc nhắc còn lại"""
+        with self._condition:
+            self._cancel(task_id)
+            self._fired.pop(task_id, None)
+
+    def apply_change_events(self, events, max_fetches: int = 50):
+        """
+        Subscriber của change feed: chỉ đọc theo ID các công việc vừa đổi (mỗi ID một lần).
+        Sự kiện không có id hoặc lô quá ``max_fetches`` công việc quay về ``reload()``.
+        """
+        latest_ops = {}
+        for event in events:
+            if event.table != 'tasks':
+                continue
+            if event.id is None:
+                self.reload()
+                return
+            latest_ops[event.id] = event.op
+        if self.fetch_task is not None and sum(op != 'D' for op in latest_ops.values()) > max_fetches:
+            self.reload()
+            return
+
+        for task_id, op in latest_ops.items():
+            task = None if op == 'D' or self.fetch_task is None else self.fetch_task(task_id)
+            if task is None:
+                self.discard(task_id)
+            else:
+                self.track(task)
+
+    def _schedule(self, task_id: int, title: str, assigned_to: Optional[int],
+                  due_date: Optional[datetime], now: datetime, heapify: bool = True):
+        self._cancel(task_id)
+        if due_date is None or due_date <= now:
+            return
+        fired = self._fired.get(task_id)
+        leads = [lead for lead in self.leads if fired is None or fired[0] != due_date or lead < fired[1]]
+        entries = []
+        passed = [lead for lead in leads if due_date - timedelta(minutes=lead) <= now]
+        for lead in leads:
+            fire_at = due_date - timedelta(minutes=lead)
+            if lead in passed:
+                if lead != passed[-1]:
+                    continue
+                fire_at = now
+            entry = [fire_at, next(self._sequence), task_id,
+                     DeadlineReminder(task_id, title, assigned_to, due_date, lead)]
+            if heapify:
+                heapq.heappush(self._heap, entry)
+            else:
+                self._heap.append(entry)
+            entries.append(entry)
+        if entries:
+            self._entries[task_id] = entries
+
+    def _cancel(self, task_id: int):
+        for entry in self._entries.pop(task_id, ()):
+            entry[2] = None
+            self._cancelled += 1
+        if self._cancelled > COMPACT_THRESHOLD and self._cancelled * 2 > len(self._heap):
+            self._heap = [entry for entry in self._heap if entry[2] is not None]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+
+    def _drop_cancelled_top(self):
+        while self._heap and self._heap[0][2] is None:
+            heapq.heappop(self._heap)
+            self._cancelled -= 1
+
+    def _pop_due(self, now: datetime) -> List[DeadlineReminder]:
+        due = []
+        self._drop_cancelled_top()
+        while self._heap and self._heap[0][0] <= now:
+            _, _, task_id, reminder = heapq.heappop(self._heap)
+            if task_id is None:
+                self._cancelled -= 1
+                continue
+            remaining = [entry for entry in self._entries.get(task_id, ()) if entry[3] is not reminder]
+            if remaining:
+                self._entries[task_id] = remaining
+            else:
+                self._entries.pop(task_id, None)
+            self._fired[task_id] = (reminder.due_date, reminder.lead_minutes)
+            due.append(reminder)
+            self._drop_cancelled_top()
+        return due
+
+    # Luồng nền
+    def start(self):
+        """Nạp lịch rồi chờ trên daemon thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="deadline-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+    def _run(self):
+        try:
+            self.reload()
+        except Exception as e:
+            print(f"⚠️ Deadline scheduler failed to load: {e}")
+        while True:
+            with self._condition:
+                if self._stopped:
+                    return
+                now = datetime.now()
+                due = self._pop_due(now)
+                if not due:
+                    timeout = MAX_WAIT_SECONDS
+                    if self._heap:
+                        timeout = min(timeout, max(0.0, (self._heap[0][0] - now).total_seconds()))
+                    self._condition.wait(timeout)
+                    continue
+            self.fired_count += len(due)
+            self._dispatch(due)
+
+    def _dispatch(self, reminders: List[DeadlineReminder]):
+        for callback in list(self._subscribers):
+            try:
+                callback(reminders)
+            except Exception as e:
+                print(f"⚠️ Deadline reminder subscriber failed: {e}")
+
+
+def log_reminders(reminders: List[DeadlineReminder]):
+    """Subscriber ghi log mỗi lần nhắc"""
+    for reminder in reminders:
+        logger.info(f"Deadline reminder (task {reminder.task_id}, -{reminder.lead_minutes}m): {reminder.message()}")
+
+
+class ReminderOutbox:
+    """Subscriber nối lần nhắc vào file JSON lines cho dịch vụ gửi thông báo (email/chat) đọc"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, reminders: List[DeadlineReminder]):
+        lines = [json.dumps(dict(reminder.to_dict(), message=reminder.message()), ensure_ascii=False)
+                 for reminder in reminders]
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as handle:
+                handle.write("\n".join(lines) + "\n")
+
+
+_scheduler: Optional[DeadlineScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_deadline_scheduler(load_deadlines: Callable[[datetime], Sequence[Deadline]],
+                           fetch_task: Optional[Callable[[int], Optional[Task]]] = None
+                           ) -> Optional[DeadlineScheduler]:
+    """Scheduler dùng chung của ứng dụng (chưa start), hoặc None khi DEADLINE_REMINDERS_ENABLED tắt"""
+    global _scheduler
+    if not config.DEADLINE_REMINDERS_ENABLED:
+        return None
+    with _scheduler_lock:
+        if _scheduler is None:
+            leads = [value for value in config.DEADLINE_REMINDER_LEADS_MIN.split(",") if value.strip()]
+            _scheduler = DeadlineScheduler(load_deadlines, fetch_task, leads_minutes=leads)
+            _scheduler.subscribe(log_reminders)
+            if config.DEADLINE_REMINDER_OUTBOX:
+                _scheduler.subscribe(ReminderOutbox(config.DEADLINE_REMINDER_OUTBOX))
+        return _scheduler
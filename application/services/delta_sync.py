@@ -0,0 +1,123 @@
+"""
+Delta sync service
+Giữ danh sách đã tải của một bảng và làm mới bằng changed_since/deleted_since thay vì tải lại toàn bộ
+"""
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class DeltaSync:
+    """
+    Bản sao theo ID của một bảng phía client.
+
+    Lần ``refresh()`` đầu tiên tải toàn bộ; các lần sau chỉ lấy dòng có
+    ``updated_at`` sau watermark (lùi ``overlap`` để bù transaction commit
+    muộn) và ID đã xóa sau cursor tombstone. Chi phí mỗi lần làm mới tỉ lệ
+    với lượng thay đổi, và ``refresh()`` trả về False khi không có gì đổi để
+    GUI bỏ qua việc vẽ lại bảng.
+    """
+
+    def __init__(self, changed_since: Callable[[Optional[datetime]], List[Any]],
+                 deleted_since: Callable[[Optional[int]], Tuple[List[int], int]],
+                 sort_key: Callable[[Any], Any], reverse: bool = False, overlap_seconds: int = 5):
+        self.changed_since = changed_since
+        self.deleted_since = deleted_since
+        self.sort_key = sort_key
+        self.reverse = reverse
+        self.overlap = timedelta(seconds=overlap_seconds)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Bỏ dữ liệu đã giữ - lần refresh sau sẽ tải đầy đủ"""
+        self._items: Dict[int, Any] = {}
+        self._sorted: List[Any] = []
+        self.watermark: Optional[datetime] = None
+        self.delete_cursor: Optional[int] = None
+        self.loaded = False
+
+    @property
+    def items(self) -> List[Any]:
+        """Danh sách hiện tại, sắp xếp theo sort_key (giống thứ tự get_all())"""
+        return self._sorted
+
+    def refresh(self) -> bool:
+        """Đồng bộ với database, trả về True nếu danh sách có thay đổi"""
+        with self._lock:
+            return self._refresh_locked()
+
+    def apply_changes(self, changes: List[Tuple[str, Optional[int]]],
+                      fetch: Callable[[int], Optional[Any]], max_fetches: int = 50) -> bool:
+        """
+        Áp dụng sự kiện (op, id) từ change feed: mỗi dòng thêm/sửa tốn một lần
+        đọc theo ID, dòng xóa không cần truy vấn. Lô quá lớn hoặc sự kiện không
+        có id (đồng bộ lại) quay về ``refresh()`` theo watermark; sự kiện 'T'
+        (bảng bị TRUNCATE hoặc nạp hàng loạt) tải lại toàn bộ.
+        """
+        with self._lock:
+            if not self.loaded:
+                # Chưa tải lần nào - lần mở tab sẽ tải đầy đủ
+                return False
+
+            if any(op == 'T' for op, _ in changes):
+                self.reset()
+                return self._refresh_locked()
+
+            latest_ops = {}
+            for op, record_id in changes:
+                if record_id is None:
+                    return self._refresh_locked()
+                latest_ops[record_id] = op
+            if sum(op != 'D' for op in latest_ops.values()) > max_fetches:
+                return self._refresh_locked()
+
+            changed = False
+            for record_id, op in latest_ops.items():
+                item = None if op == 'D' else fetch(record_id)
+                if item is None:
+                    changed |= self._items.pop(record_id, None) is not None
+                elif self._items.get(record_id) != item:
+                    self._items[record_id] = item
+                    changed = True
+            if changed:
+                self._resort()
+            return changed
+
+    def _refresh_locked(self) -> bool:
+        if not self.loaded:
+            # Đặt cursor tombstone trước khi tải để không sót lần xóa xảy ra trong lúc tải
+            _, self.delete_cursor = self.deleted_since(None)
+            rows = self.changed_since(None)
+            self._items = {item.id: item for item in rows}
+            self._advance_watermark(rows)
+            self.loaded = True
+            self._resort()
+            return True
+
+        changed = False
+        rows = self.changed_since(self.watermark - self.overlap if self.watermark else None)
+        for item in rows:
+            if self._items.get(item.id) != item:
+                self._items[item.id] = item
+                changed = True
+        self._advance_watermark(rows)
+
+        deleted_ids, self.delete_cursor = self.deleted_since(self.delete_cursor)
+        for record_id in deleted_ids:
+            if self._items.pop(record_id, None) is not None:
+                changed = True
+
+        if changed:
+            self._resort()
+        return changed
+
+    def _advance_watermark(self, rows: List[Any]):
+        stamps = [row.updated_at for row in rows if row.updated_at is not None]
+        if stamps:
+            latest = max(stamps)
+            if self.watermark is None or latest > self.watermark:
+                self.watermark = latest
+
+    def _resort(self):
+        self._sorted = sorted(self._items.values(), key=self.sort_key, reverse=self.reverse)
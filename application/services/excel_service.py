@@ -3,17 +3,23 @@ Excel Export Service
 Provides functionality to export data to Excel files with formatting
 """
 
-import pandas as pd
 from datetime import datetime
 from typing import List, Any, Dict, Optional
 import os
 from pathlib import Path
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils.dataframe import dataframe_to_rows
 from tkinter import filedialog, messagebox
 import logging
 
+from config.lazy_import import lazy_import, lazy_from_import
+
+# pandas/openpyxl chỉ được import khi xuất file Excel lần đầu (không làm chậm khởi động GUI)
+pd = lazy_import('pandas')
+Workbook = lazy_from_import('openpyxl', 'Workbook')
+Font, PatternFill, Alignment, Border, Side = lazy_from_import(
+    'openpyxl.styles', 'Font', 'PatternFill', 'Alignment', 'Border', 'Side'
+)
+dataframe_to_rows = lazy_from_import('openpyxl.utils.dataframe', 'dataframe_to_rows')
+
 logger = logging.getLogger(__name__)
 
 
@@ -0,0 +1,53 @@
+"""
+Hours analytics
+Độ chính xác ước tính (thực tế / ước tính), mức sử dụng công suất và phân phối giờ thực tế
+theo thành viên, đơn vị và kỳ - tính bằng SQL ở repository, kết quả cache theo kỳ
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from config.settings import config
+from domain.entities.period import PERIOD_MONTHS, current_period
+
+
+class HoursAnalyticsService:
+    """
+    Gọi ``task_repository.get_hours_analytics`` và cache kết quả theo kỳ.
+
+    Kỳ đã kết thúc được giữ tới khi ``refresh``/``invalidate``; kỳ đang chạy
+    hết hạn sau ``cache_seconds`` vì công việc vẫn đang được hoàn thành.
+    """
+
+    def __init__(self, task_repository, capacity_per_month: Optional[float] = None,
+                 cache_seconds: Optional[float] = None):
+        self.task_repository = task_repository
+        self.capacity_per_month = capacity_per_month or config.HOURS_CAPACITY_PER_MONTH
+        self.cache_seconds = config.HOURS_ANALYTICS_CACHE_S if cache_seconds is None else cache_seconds
+        self._cache: Dict[Tuple[str, datetime], Tuple[float, dict]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, kind: str = 'month', at: Optional[datetime] = None, refresh: bool = False) -> dict:
+        """{'period', 'start', 'end', 'total', 'departments', 'members'} của kỳ chứa ``at`` (mặc định hiện tại)"""
+        now = datetime.now()
+        period = current_period(kind, at or now)
+        start, end = period.bounds()
+        key = (kind, start)
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is not None and not refresh:
+            computed_at, result = cached
+            if end <= now or time.monotonic() - computed_at < self.cache_seconds:
+                return result
+
+        capacity = self.capacity_per_month * PERIOD_MONTHS[kind]
+        result = dict(self.task_repository.get_hours_analytics(start, end, capacity),
+                      period=period.label, start=start, end=end)
+        with self._lock:
+            self._cache[key] = (time.monotonic(), result)
+        return result
+
+    def invalidate(self):
+        with self._lock:
+            self._cache.clear()
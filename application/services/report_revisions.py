@@ -0,0 +1,169 @@
+"""
+Report revisions
+Lịch sử nội dung báo cáo: phiên bản đầu lưu toàn văn, các phiên bản sau lưu delta theo dòng so với phiên bản
+trước, cứ ``snapshot_every`` phiên bản lại lưu toàn văn để dựng lại bất kỳ phiên bản nào chỉ cần áp ít delta
+"""
+import difflib
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from config.settings import config
+from domain.entities.report_revision import ReportRevision
+
+# Số báo cáo giữ toàn văn phiên bản mới nhất trong bộ nhớ (lưu liên tiếp không phải dựng lại)
+LATEST_CACHE_SIZE = 64
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def encode_delta(base: str, content: str) -> str:
+    """
+    Delta theo dòng dạng JSON: ``[i, j]`` chép dòng base[i:j], chuỗi là đoạn văn bản chèn thêm.
+    Dòng bị xóa không cần ghi gì.
+    """
+    base_lines = base.splitlines(keepends=True)
+    lines = content.splitlines(keepends=True)
+    ops = []
+    matcher = difflib.SequenceMatcher(None, base_lines, lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            ops.append([i1, i2])
+        elif tag in ('replace', 'insert'):
+            ops.append(''.join(lines[j1:j2]))
+    return json.dumps(ops, ensure_ascii=False, separators=(',', ':'))
+
+
+def apply_delta(base: str, delta: str) -> str:
+    """Dựng lại nội dung từ ``base`` và delta của encode_delta"""
+    base_lines = base.splitlines(keepends=True)
+    parts = []
+    for op in json.loads(delta):
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            parts.extend(base_lines[op[0]:op[1]])
+    return ''.join(parts)
+
+
+@dataclass(frozen=True)
+class DiffRow:
+    """Một dòng của bảng so sánh hai cột; số dòng None là phía đó không có dòng tương ứng"""
+    tag: str  # equal / replace / delete / insert
+    old_number: Optional[int]
+    old_text: str
+    new_number: Optional[int]
+    new_text: str
+
+
+def side_by_side(old: str, new: str) -> List[DiffRow]:
+    """Ghép dòng hai phiên bản theo cặp cho bảng so sánh trái/phải"""
+    old_lines, new_lines = old.splitlines(), new.splitlines()
+    rows = []
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        for offset in range(max(i2 - i1, j2 - j1)):
+            i, j = i1 + offset, j1 + offset
+            has_old, has_new = i < i2, j < j2
+            row_tag = tag if tag != 'replace' or (has_old and has_new) else ('delete' if has_old else 'insert')
+            rows.append(DiffRow(row_tag,
+                                i + 1 if has_old else None, old_lines[i] if has_old else '',
+                                j + 1 if has_new else None, new_lines[j] if has_new else ''))
+    return rows
+
+
+class ReportRevisionService:
+    """
+    Ghi và dựng lại phiên bản nội dung báo cáo qua ``revision_repository``.
+
+    Delta luôn so với phiên bản ngay trước; phiên bản số 1, mỗi ``snapshot_every``
+    phiên bản và phiên bản mà delta không nhỏ hơn toàn văn được lưu toàn văn.
+    Dựng lại phiên bản N đọc snapshot gần nhất và các delta tới N trong một truy
+    vấn, áp tối đa ``snapshot_every - 1`` delta.
+    """
+
+    def __init__(self, revision_repository, snapshot_every: Optional[int] = None):
+        self.revision_repository = revision_repository
+        self.snapshot_every = max(1, snapshot_every or config.REPORT_REVISION_SNAPSHOT_EVERY)
+        self._latest: 'OrderedDict[int, Tuple[int, str]]' = OrderedDict()  # report_id -> (revision, toàn văn)
+        self._lock = threading.Lock()
+
+    def record(self, report_id: int, content: Optional[str], created_by: Optional[int] = None,
+               previous: Optional[str] = None) -> Optional[ReportRevision]:
+        """
+        Ghi ``content`` thành phiên bản mới nếu khác phiên bản mới nhất (None nếu không đổi).
+        ``previous``: nội dung trước khi sửa - với báo cáo chưa có lịch sử được ghi làm phiên bản 1.
+        """
+        content = content or ''
+        latest = self.revision_repository.get_latest(report_id)
+        if latest is None and previous is not None and previous != content:
+            latest = self._store(report_id, 1, previous, None, None)
+        if latest is None:
+            return self._store(report_id, 1, content, None, created_by)
+        if latest.content_sha256 == content_hash(content):
+            return None
+        base = self.get_content(report_id, latest.revision)
+        return self._store(report_id, latest.revision + 1, content, base, created_by)
+
+    def _store(self, report_id: int, revision: int, content: str, base: Optional[str],
+               created_by: Optional[int]) -> ReportRevision:
+        is_snapshot = base is None or (revision - 1) % self.snapshot_every == 0
+        data = content
+        if not is_snapshot:
+            data = encode_delta(base, content)
+            if len(data) >= len(content):
+                is_snapshot, data = True, content
+        stored = self.revision_repository.create(ReportRevision(
+            report_id=report_id, revision=revision, is_snapshot=is_snapshot, data=data,
+            content_length=len(content), content_sha256=content_hash(content), created_by=created_by,
+        ))
+        self._remember(report_id, revision, content)
+        return stored
+
+    def get_content(self, report_id: int, revision: Optional[int] = None) -> str:
+        """Toàn văn phiên bản ``revision`` (mặc định mới nhất)"""
+        if revision is None:
+            latest = self.revision_repository.get_latest(report_id)
+            if latest is None:
+                raise ValueError(f"Báo cáo {report_id} chưa có lịch sử phiên bản")
+            revision = latest.revision
+        with self._lock:
+            cached = self._latest.get(report_id)
+        if cached is not None and cached[0] == revision:
+            return cached[1]
+
+        chain = self.revision_repository.get_chain(report_id, revision)
+        if not chain or chain[-1].revision != revision or not chain[0].is_snapshot:
+            raise ValueError(f"Không tìm thấy phiên bản {revision} của báo cáo {report_id}")
+        content = chain[0].data
+        for step in chain[1:]:
+            content = step.data if step.is_snapshot else apply_delta(content, step.data)
+        if content_hash(content) != chain[-1].content_sha256:
+            raise ValueError(f"Phiên bản {revision} của báo cáo {report_id} bị hỏng")
+        return content
+
+    def list_revisions(self, report_id: int) -> List[ReportRevision]:
+        """Metadata các phiên bản, mới nhất trước (không đọc nội dung)"""
+        return self.revision_repository.get_by_report(report_id)
+
+    def diff(self, report_id: int, old_revision: int, new_revision: int) -> List[DiffRow]:
+        """Bảng so sánh hai cột giữa hai phiên bản"""
+        return side_by_side(self.get_content(report_id, old_revision), self.get_content(report_id, new_revision))
+
+    def delete_report(self, report_id: int) -> int:
+        """Xóa lịch sử khi báo cáo bị xóa"""
+        with self._lock:
+            self._latest.pop(report_id, None)
+        return self.revision_repository.delete_by_report(report_id)
+
+    def _remember(self, report_id: int, revision: int, content: str):
+        with self._lock:
+            self._latest[report_id] = (revision, content)
+            self._latest.move_to_end(report_id)
+            while len(self._latest) > LATEST_CACHE_SIZE:
+                self._latest.popitem(last=False)
@@ -0,0 +1,47 @@
+"""
+Workload service
+Tổng quan công việc của một thành viên (quá hạn / sắp hết hạn / đang làm) từ một truy vấn theo index
+(assigned_to, status, due_date) - phân nhóm trên server, Python không tính ngày cho từng công việc
+"""
+from datetime import datetime, timedelta
+from typing import Optional
+
+# Workload thuộc domain (repository trả về trực tiếp), giữ import cũ từ service
+from domain.entities.task import OPEN_STATUSES, TaskStatus, Workload
+
+
+def upcoming_window(now: datetime, days: int):
+    """[now, until) của nhóm sắp hết hạn - còn 0..days ngày tròn như get_days_remaining()"""
+    return now, now + timedelta(days=days + 1)
+
+
+class WorkloadService:
+    """Tính Workload qua ``task_repository.get_workload`` (một truy vấn), fallback về hai lần tải danh sách"""
+
+    def __init__(self, task_repository, upcoming_days: int = 7):
+        self.task_repository = task_repository
+        self.upcoming_days = upcoming_days
+
+    def get_workload(self, member_id: int, counts_only: bool = False,
+                     now: Optional[datetime] = None) -> Workload:
+        """Workload của ``member_id``; ``counts_only`` chỉ đọc một dòng đếm (cho widget tóm tắt)"""
+        start, until = upcoming_window(now or datetime.now(), self.upcoming_days)
+        if hasattr(self.task_repository, 'get_workload'):
+            return self.task_repository.get_workload(member_id, start, until, counts_only)
+
+        # Fallback nếu repository chưa có phương thức này
+        assigned = self.task_repository.get_by_assignee(member_id)
+        workload = Workload(
+            assigned_to_me=len(assigned),
+            created_by_me=len(self.task_repository.get_by_assigner(member_id)),
+            overdue_tasks=[task for task in assigned if task.status == TaskStatus.OVERDUE],
+            upcoming_tasks=[task for task in assigned if task.status in OPEN_STATUSES
+                            and task.due_date and start <= task.due_date < until],
+            in_progress_tasks=[task for task in assigned if task.status == TaskStatus.IN_PROGRESS],
+        )
+        workload.overdue = len(workload.overdue_tasks)
+        workload.upcoming = len(workload.upcoming_tasks)
+        workload.in_progress = len(workload.in_progress_tasks)
+        if counts_only:
+            workload.overdue_tasks, workload.upcoming_tasks, workload.in_progress_tasks = [], [], []
+        return workload
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
 from domain.entities.member import Member, MemberType, MemberStatus
 from domain.repositories.member_repository import IMemberRepository
@@ -48,6 +48,14 @@ class MemberManagementUseCase:
         """Lấy danh sách tất cả thành viên"""
         return self.member_repository.get_all()
     
+    def get_members_changed_since(self, watermark: Optional[datetime]) -> List[Member]:
+        """Lấy thành viên được tạo/cập nhật sau watermark (tất cả nếu None)"""
+        return self.member_repository.changed_since(watermark)
+    
+    def get_deleted_member_ids(self, cursor: Optional[int]) -> Tuple[List[int], int]:
+        """Lấy ID thành viên đã xóa sau cursor tombstone, kèm cursor mới"""
+        return self.member_repository.deleted_since(cursor)
+    
     def get_members_by_type(self, member_type: MemberType) -> List[Member]:
         """Lấy danh sách thành viên theo loại"""
         return self.member_repository.get_by_type(member_type)
@@ -116,6 +124,11 @@ class MemberManagementUseCase:
     
     def get_member_statistics(self) -> dict:
         """Lấy thống kê thành viên"""
+        if hasattr(self.member_repository, 'load_frame'):
+            # Một lần đọc dạng cột thay cho get_all() + get_by_status() dựng entity chỉ để đếm
+            return self.member_repository.load_frame().statistics()
+        
+        # Fallback nếu repository chưa có phương thức này
         total_members = len(self.member_repository.get_all())
         union_members = self.member_repository.count_by_type(MemberType.UNION_MEMBER)
         association_members = self.member_repository.count_by_type(MemberType.ASSOCIATION_MEMBER)
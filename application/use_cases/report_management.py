@@ -1,7 +1,14 @@
-from typing import List, Optional
-from datetime import datetime
+import mimetypes
+import os
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple, Union
+from datetime import date, datetime
+from config.settings import config
+from domain.entities.attachment import Attachment
+from domain.entities.period import parse_period
 from domain.entities.report import Report, ReportType, ReportStatus
+from domain.entities.report_revision import ReportRevision
 from domain.repositories.report_repository import IReportRepository
+from application.services.report_revisions import DiffRow
 
 
 class ReportManagementUseCase:
@@ -9,6 +16,11 @@ class ReportManagementUseCase:
     
     def __init__(self, report_repository: IReportRepository):
         self.report_repository = report_repository
+        # File đính kèm: repository metadata + kho nội dung, gắn khi khởi tạo ứng dụng
+        self.attachment_repository = None
+        self.attachment_store = None
+        # Lịch sử nội dung (ReportRevisionService), gắn khi khởi tạo ứng dụng
+        self.revision_service = None
     
     def create_report(self, report_data: dict) -> Report:
         """Tạo báo cáo mới"""
@@ -22,7 +34,9 @@ class ReportManagementUseCase:
             submitted_by=report_data.get('submitted_by')
         )
         
-        return self.report_repository.create(report)
+        created = self.report_repository.create(report)
+        self._record_revision(created.id, created.content, created.created_by or created.submitted_by)
+        return created
     
     def get_report_by_id(self, report_id: int) -> Optional[Report]:
         """Lấy báo cáo theo ID"""
@@ -32,6 +46,14 @@ class ReportManagementUseCase:
         """Lấy tất cả báo cáo"""
         return self.report_repository.get_all()
     
+    def get_reports_changed_since(self, watermark: Optional[datetime]) -> List[Report]:
+        """Lấy báo cáo được tạo/cập nhật sau watermark (tất cả nếu None)"""
+        return self.report_repository.changed_since(watermark)
+    
+    def get_deleted_report_ids(self, cursor: Optional[int]) -> Tuple[List[int], int]:
+        """Lấy ID báo cáo đã xóa sau cursor tombstone, kèm cursor mới"""
+        return self.report_repository.deleted_since(cursor)
+    
     def get_reports_by_type(self, report_type: ReportType) -> List[Report]:
         """Lấy báo cáo theo loại"""
         return self.report_repository.get_by_type(report_type)
@@ -44,6 +66,42 @@ class ReportManagementUseCase:
         """Lấy báo cáo theo kỳ"""
         return self.report_repository.get_by_period(period)
     
+    def get_reports_covering(self, day: date) -> List[Report]:
+        """Lấy báo cáo có kỳ chứa ngày ``day`` (VD: báo cáo tháng, quý và năm của ngày đó)"""
+        if hasattr(self.report_repository, 'get_covering'):
+            return self.report_repository.get_covering(day)
+        
+        # Fallback nếu repository chưa có phương thức này
+        reports = []
+        for report in self.report_repository.get_all():
+            period = parse_period(report.period)
+            if period and period.start <= day <= period.end:
+                reports.append(report)
+        return reports
+    
+    def get_reports_in_period(self, period_text: str, contained: bool = True) -> List[Report]:
+        """
+        Lấy báo cáo thuộc kỳ ``period_text`` (VD: "Q3-2024" gồm cả báo cáo các tháng 7-9);
+        ``contained=False`` lấy mọi báo cáo có kỳ giao với kỳ này (gồm cả báo cáo năm)
+        """
+        period = parse_period(period_text)
+        if period is None:
+            raise ValueError(f"Không nhận ra kỳ báo cáo: {period_text}")
+        if hasattr(self.report_repository, 'get_by_period_range'):
+            return self.report_repository.get_by_period_range(period.start, period.end, contained)
+        
+        # Fallback nếu repository chưa có phương thức này
+        reports = []
+        for report in self.report_repository.get_all():
+            other = parse_period(report.period)
+            if other is None:
+                continue
+            if contained and period.start <= other.start and other.end <= period.end:
+                reports.append(report)
+            elif not contained and other.start <= period.end and other.end >= period.start:
+                reports.append(report)
+        return reports
+    
     def get_reports_by_submitter(self, submitter_id: int) -> List[Report]:
         """Lấy báo cáo theo người nộp"""
         return self.report_repository.get_by_submitter(submitter_id)
@@ -71,12 +129,44 @@ class ReportManagementUseCase:
             raise ValueError("Không thể chỉnh sửa báo cáo đã được duyệt")
         
         # Cập nhật các thuộc tính
+        previous_content = existing_report.content
         for key, value in update_data.items():
             if hasattr(existing_report, key) and key not in ['id', 'created_at']:
                 setattr(existing_report, key, value)
         
         existing_report.updated_at = datetime.now()
-        return self.report_repository.update(existing_report)
+        updated = self.report_repository.update(existing_report)
+        self._record_revision(updated.id, updated.content, update_data.get('updated_by'), previous_content)
+        return updated
+    
+    def _record_revision(self, report_id: int, content: str, created_by: Optional[int] = None,
+                         previous: Optional[str] = None):
+        if self.revision_service is None:
+            return
+        try:
+            self.revision_service.record(report_id, content, created_by, previous)
+        except Exception as e:
+            # Báo cáo đã lưu - lỗi ghi lịch sử không làm hỏng thao tác của người dùng
+            print(f"⚠️ Không thể ghi phiên bản báo cáo {report_id}: {e}")
+    
+    def get_report_revisions(self, report_id: int) -> List[ReportRevision]:
+        """Lấy danh sách phiên bản nội dung của báo cáo, mới nhất trước"""
+        self._require_revisions()
+        return self.revision_service.list_revisions(report_id)
+    
+    def get_report_revision_content(self, report_id: int, revision: Optional[int] = None) -> str:
+        """Lấy toàn văn một phiên bản (mặc định mới nhất)"""
+        self._require_revisions()
+        return self.revision_service.get_content(report_id, revision)
+    
+    def get_report_diff(self, report_id: int, old_revision: int, new_revision: int) -> List[DiffRow]:
+        """So sánh hai phiên bản dạng hai cột cho người duyệt"""
+        self._require_revisions()
+        return self.revision_service.diff(report_id, old_revision, new_revision)
+    
+    def _require_revisions(self):
+        if self.revision_service is None:
+            raise ValueError("Chưa bật lịch sử phiên bản báo cáo")
     
     def submit_report(self, report_id: int, submitted_by_id: int) -> Report:
         """Nộp báo cáo"""
@@ -124,10 +214,88 @@ class ReportManagementUseCase:
         if report.status not in [ReportStatus.DRAFT, ReportStatus.REJECTED]:
             raise ValueError("Chỉ có thể xóa báo cáo ở trạng thái nháp hoặc bị từ chối")
         
-        return self.report_repository.delete(report_id)
+        deleted = self.report_repository.delete(report_id)
+        if deleted and self.attachment_repository is not None:
+            for attachment in self.attachment_repository.get_by_report(report_id):
+                self.remove_attachment(attachment.id)
+        if deleted and self.revision_service is not None:
+            self.revision_service.delete_report(report_id)
+        return deleted
+    
+    def add_attachment(self, report_id: int, source: Union[str, BinaryIO], file_name: Optional[str] = None,
+                       uploaded_by: Optional[int] = None) -> Attachment:
+        """Đính kèm file (đường dẫn hoặc stream) vào báo cáo - nội dung trùng chỉ lưu một lần"""
+        self._require_attachments()
+        report = self.report_repository.get_by_id(report_id)
+        if not report:
+            raise ValueError(f"Không tìm thấy báo cáo với ID {report_id}")
+        if report.status == ReportStatus.APPROVED:
+            raise ValueError("Không thể đính kèm file vào báo cáo đã được duyệt")
+        
+        file_name = os.path.basename(file_name or (source if isinstance(source, str) else ''))
+        extension = os.path.splitext(file_name)[1].lstrip('.').lower()
+        if extension not in config.ALLOWED_EXTENSIONS:
+            raise ValueError(f"Không hỗ trợ định dạng file: {file_name}")
+        
+        sha256, size = self.attachment_store.put(source)
+        return self.attachment_repository.create(Attachment(
+            report_id=report_id,
+            file_name=file_name,
+            content_type=mimetypes.guess_type(file_name)[0] or 'application/octet-stream',
+            size=size,
+            sha256=sha256,
+            uploaded_by=uploaded_by
+        ))
+    
+    def get_report_attachments(self, report_id: int) -> List[Attachment]:
+        """Lấy metadata file đính kèm của báo cáo (không đọc nội dung)"""
+        self._require_attachments()
+        return self.attachment_repository.get_by_report(report_id)
+    
+    def count_report_attachments(self, report_ids: Iterable[int]) -> Dict[int, int]:
+        """Số file đính kèm theo báo cáo cho danh sách báo cáo"""
+        self._require_attachments()
+        return self.attachment_repository.count_by_reports(report_ids)
+    
+    def open_attachment(self, attachment_id: int):
+        """Context manager trả về nội dung chỉ đọc (bytes hoặc mmap với file lớn)"""
+        return self.attachment_store.open(self._get_attachment(attachment_id).sha256)
+    
+    def export_attachment(self, attachment_id: int, destination: str):
+        """Lưu file đính kèm ra đường dẫn ``destination``"""
+        self.attachment_store.copy_to(self._get_attachment(attachment_id).sha256, destination)
+    
+    def remove_attachment(self, attachment_id: int) -> bool:
+        """
+        Bỏ file đính kèm (chỉ xóa metadata). Nội dung không còn báo cáo nào dùng được
+        ``collect_attachment_garbage`` dọn sau - xóa ngay sẽ tranh chấp với lần tải lên
+        trùng nội dung đã qua ``put`` nhưng chưa ghi metadata.
+        """
+        self._require_attachments()
+        return self.attachment_repository.delete(attachment_id)
+    
+    def collect_attachment_garbage(self) -> int:
+        """Xóa nội dung trong kho không còn file đính kèm nào trỏ tới, trả về số đối tượng đã xóa"""
+        self._require_attachments()
+        return self.attachment_store.collect_garbage(self.attachment_repository.get_referenced_sha256)
+    
+    def _get_attachment(self, attachment_id: int) -> Attachment:
+        self._require_attachments()
+        attachment = self.attachment_repository.get_by_id(attachment_id)
+        if not attachment:
+            raise ValueError(f"Không tìm thấy file đính kèm với ID {attachment_id}")
+        return attachment
+    
+    def _require_attachments(self):
+        if self.attachment_repository is None or self.attachment_store is None:
+            raise ValueError("Chưa cấu hình kho file đính kèm")
     
     def get_report_statistics(self) -> dict:
         """Lấy thống kê báo cáo"""
+        if hasattr(self.report_repository, 'load_frame'):
+            return self.report_repository.load_frame().statistics()
+        
+        # Fallback nếu repository chưa có phương thức này
         total_reports = len(self.report_repository.get_all())
         draft_reports = self.report_repository.count_by_status(ReportStatus.DRAFT)
         submitted_reports = self.report_repository.count_by_status(ReportStatus.SUBMITTED)
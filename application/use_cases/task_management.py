@@ -1,7 +1,10 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime, timedelta
-from domain.entities.task import Task, TaskPriority, TaskStatus
+from domain.entities.task import OPEN_STATUSES, Task, TaskPriority, TaskStatus
+from domain.entities.frames import TaskFrame
 from domain.repositories.task_repository import ITaskRepository
+from application.services.hours_analytics import HoursAnalyticsService
+from application.services.workload import WorkloadService
 
 
 class TaskManagementUseCase:
@@ -9,6 +12,9 @@ class TaskManagementUseCase:
     
     def __init__(self, task_repository: ITaskRepository):
         self.task_repository = task_repository
+        self.workload_service = WorkloadService(task_repository)
+        self.hours_analytics = HoursAnalyticsService(task_repository)
+        self.deadline_scheduler = None  # DeadlineScheduler được báo mỗi lần tạo/sửa/xóa công việc
     
     def create_task(self, task_data: dict) -> Task:
         """Tạo công việc mới"""
@@ -25,7 +31,7 @@ class TaskManagementUseCase:
             notes=task_data.get('notes', '')
         )
         
-        return self.task_repository.create(task)
+        return self._track_deadline(self.task_repository.create(task))
     
     def get_task_by_id(self, task_id: int) -> Optional[Task]:
         """Lấy công việc theo ID"""
@@ -35,6 +41,14 @@ class TaskManagementUseCase:
         """Lấy tất cả công việc"""
         return self.task_repository.get_all()
     
+    def get_tasks_changed_since(self, watermark: Optional[datetime]) -> List[Task]:
+        """Lấy công việc được tạo/cập nhật sau watermark (tất cả nếu None)"""
+        return self.task_repository.changed_since(watermark)
+    
+    def get_deleted_task_ids(self, cursor: Optional[int]) -> Tuple[List[int], int]:
+        """Lấy ID công việc đã xóa sau cursor tombstone, kèm cursor mới"""
+        return self.task_repository.deleted_since(cursor)
+    
     def get_tasks_by_assignee(self, assignee_id: int) -> List[Task]:
         """Lấy công việc được giao cho người dùng"""
         return self.task_repository.get_by_assignee(assignee_id)
@@ -60,6 +74,17 @@ class TaskManagementUseCase:
         end_date = datetime.now() + timedelta(days=days)
         return self.task_repository.get_by_due_date_range(datetime.now(), end_date)
     
+    def get_open_deadlines(self, since: datetime) -> List[Tuple[int, str, Optional[int], datetime]]:
+        """(id, title, assigned_to, due_date) của công việc đang mở có hạn sau ``since``, theo due_date"""
+        if hasattr(self.task_repository, 'get_open_deadlines'):
+            return self.task_repository.get_open_deadlines(since)
+        
+        # Fallback nếu repository chưa có phương thức này
+        tasks = sorted((task for task in self.task_repository.get_all()
+                        if task.status in OPEN_STATUSES and task.due_date and task.due_date > since),
+                       key=lambda task: task.due_date)
+        return [(task.id, task.title, task.assigned_to, task.due_date) for task in tasks]
+    
     def search_tasks_by_title(self, title: str) -> List[Task]:
         """Tìm kiếm công việc theo tiêu đề"""
         return self.task_repository.search_by_title(title)
@@ -76,7 +101,7 @@ class TaskManagementUseCase:
                 setattr(existing_task, key, value)
         
         existing_task.updated_at = datetime.now()
-        return self.task_repository.update(existing_task)
+        return self._track_deadline(self.task_repository.update(existing_task))
     
     def start_task(self, task_id: int) -> Task:
         """Bắt đầu công việc"""
@@ -88,7 +113,7 @@ class TaskManagementUseCase:
             raise ValueError("Chỉ có thể bắt đầu công việc ở trạng thái chưa bắt đầu")
         
         task.start_task()
-        return self.task_repository.update(task)
+        return self._track_deadline(self.task_repository.update(task))
     
     def complete_task(self, task_id: int, actual_hours: Optional[float] = None) -> Task:
         """Hoàn thành công việc"""
@@ -103,7 +128,7 @@ class TaskManagementUseCase:
             raise ValueError("Không thể hoàn thành công việc đã bị hủy")
         
         task.complete_task(actual_hours)
-        return self.task_repository.update(task)
+        return self._track_deadline(self.task_repository.update(task))
     
     def cancel_task(self, task_id: int, reason: str = "") -> Task:
         """Hủy bỏ công việc"""
@@ -118,7 +143,7 @@ class TaskManagementUseCase:
             raise ValueError("Công việc đã bị hủy")
         
         task.cancel_task(reason)
-        return self.task_repository.update(task)
+        return self._track_deadline(self.task_repository.update(task))
     
     def update_task_progress(self, task_id: int, percentage: int) -> Task:
         """Cập nhật tiến độ công việc"""
@@ -133,7 +158,7 @@ class TaskManagementUseCase:
             raise ValueError("Tiến độ phải trong khoảng 0-100%")
         
         task.update_progress(percentage)
-        return self.task_repository.update(task)
+        return self._track_deadline(self.task_repository.update(task))
     
     def assign_task(self, task_id: int, assignee_id: int, assigner_id: int) -> Task:
         """Giao việc cho người khác"""
@@ -148,7 +173,7 @@ class TaskManagementUseCase:
         task.assigned_by = assigner_id
         task.updated_at = datetime.now()
         
-        return self.task_repository.update(task)
+        return self._track_deadline(self.task_repository.update(task))
     
     def delete_task(self, task_id: int) -> bool:
         """Xóa công việc"""
@@ -156,31 +181,34 @@ class TaskManagementUseCase:
         if not task:
             raise ValueError(f"Không tìm thấy công việc với ID {task_id}")
         
-        return self.task_repository.delete(task_id)
+        deleted = self.task_repository.delete(task_id)
+        if deleted and self.deadline_scheduler is not None:
+            self.deadline_scheduler.discard(task_id)
+        return deleted
+    
+    def _track_deadline(self, task: Task) -> Task:
+        """Báo scheduler nhắc hạn (nếu có) công việc vừa tạo/sửa để lên lịch lại"""
+        if self.deadline_scheduler is not None:
+            self.deadline_scheduler.track(task)
+        return task
     
     def get_task_statistics(self) -> dict:
         """Lấy thống kê công việc"""
         return self.task_repository.get_task_statistics()
     
-    def get_my_tasks(self, user_id: int) -> dict:
-        """Lấy tổng quan công việc của người dùng"""
-        assigned_tasks = self.get_tasks_by_assignee(user_id)
-        created_tasks = self.get_tasks_by_assigner(user_id)
-        
-        my_overdue = [task for task in assigned_tasks if task.is_overdue()]
-        my_upcoming = [task for task in assigned_tasks 
-                      if task.due_date and task.get_days_remaining() is not None 
-                      and 0 <= task.get_days_remaining() <= 7]
-        my_in_progress = [task for task in assigned_tasks 
-                         if task.status == TaskStatus.IN_PROGRESS]
-        
-        return {
-            'assigned_to_me': len(assigned_tasks),
-            'created_by_me': len(created_tasks),
-            'overdue': len(my_overdue),
-            'upcoming': len(my_upcoming),
-            'in_progress': len(my_in_progress),
-            'overdue_tasks': my_overdue,
-            'upcoming_tasks': my_upcoming,
-            'in_progress_tasks': my_in_progress
-        }
\ No newline at end of file
+    def get_task_frame(self) -> TaskFrame:
+        """Lấy toàn bộ công việc dạng cột NumPy để phân tích"""
+        if hasattr(self.task_repository, 'load_frame'):
+            return self.task_repository.load_frame()
+        
+        # Fallback nếu repository chưa có phương thức này
+        return TaskFrame.from_entities(self.task_repository.get_all())
+    
+    def get_hours_analytics(self, period_kind: str = 'month', at: Optional[datetime] = None,
+                            refresh: bool = False) -> dict:
+        """Ước tính vs thực tế, công suất và phân phối giờ theo thành viên/đơn vị của kỳ (month/quarter/year)"""
+        return self.hours_analytics.get(period_kind, at, refresh)
+    
+    def get_my_tasks(self, user_id: int, counts_only: bool = False) -> dict:
+        """Lấy tổng quan công việc của người dùng (``counts_only``: chỉ số lượng, không kèm danh sách)"""
+        return self.workload_service.get_workload(user_id, counts_only).to_dict()
@@ -0,0 +1,3 @@
+"""
+Benchmark suite cho repository và use case
+"""
@@ -0,0 +1,255 @@
+"""
+Benchmark cases
+Mỗi phương thức của IMemberRepository / IReportRepository / ITaskRepository và các luồng use case chính
+"""
+import itertools
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List
+
+from sqlalchemy import func
+
+from benchmarks.harness import BenchmarkCase
+from domain.entities.member import Member, MemberType, MemberStatus
+from domain.entities.report import Report, ReportType, ReportStatus
+from domain.entities.task import Task, TaskPriority, TaskStatus
+from infrastructure.database.connection import db_manager
+from infrastructure.database.models import MemberModel, ReportModel, TaskModel
+
+
+@dataclass
+class BenchmarkContext:
+    """Các giá trị mẫu lấy từ dataset hiện tại để tham số hóa truy vấn"""
+    member_id: int
+    member_code: str
+    member_name_fragment: str
+    executive_id: int
+    report_id: int
+    report_period: str
+    submitter_id: int
+    task_id: int
+    assignee_id: int
+    assigner_id: int
+    counts: dict
+
+
+def load_context() -> BenchmarkContext:
+    """Chọn bản ghi mẫu (ở giữa bảng) và đếm số dòng mỗi bảng"""
+    session = db_manager.get_session()
+    try:
+        counts = {
+            'members': session.query(func.count(MemberModel.id)).scalar(),
+            'reports': session.query(func.count(ReportModel.id)).scalar(),
+            'tasks': session.query(func.count(TaskModel.id)).scalar(),
+        }
+        if not all(counts.values()):
+            raise RuntimeError("Dataset is empty - load data with --load or generate_data.py first")
+
+        def middle(model, *columns):
+            return session.query(*columns).order_by(model.id).offset(
+                session.query(func.count(model.id)).scalar() // 2).first()
+
+        member = middle(MemberModel, MemberModel.id, MemberModel.member_code, MemberModel.full_name)
+        executive = session.query(MemberModel.id).filter(
+            MemberModel.member_type == MemberType.EXECUTIVE).first()
+        report = middle(ReportModel, ReportModel.id, ReportModel.period)
+        submitter = session.query(ReportModel.submitted_by).filter(
+            ReportModel.submitted_by.isnot(None)).first()
+        task = middle(TaskModel, TaskModel.id)
+        assignee = session.query(TaskModel.assigned_to).filter(TaskModel.assigned_to.isnot(None)).first()
+        assigner = session.query(TaskModel.assigned_by).filter(TaskModel.assigned_by.isnot(None)).first()
+
+        return BenchmarkContext(
+            member_id=member.id,
+            member_code=member.member_code,
+            member_name_fragment=member.full_name.split()[-1],
+            executive_id=executive.id if executive else member.id,
+            report_id=report.id,
+            report_period=report.period,
+            submitter_id=submitter[0] if submitter else member.id,
+            task_id=task.id,
+            assignee_id=assignee[0] if assignee else member.id,
+            assigner_id=assigner[0] if assigner else member.id,
+            counts=counts,
+        )
+    finally:
+        session.close()
+
+
+# Mã duy nhất cho bản ghi tạo trong lúc benchmark (member_code tối đa 20 ký tự)
+_RUN_TAG = format(int(time.time()) % 36 ** 5, 'x')
+_sequence = itertools.count(1)
+
+
+def _bench_code() -> str:
+    return f"BM{_RUN_TAG}{next(_sequence):07d}"
+
+
+def _new_member() -> Member:
+    return Member(member_code=_bench_code(), full_name="Benchmark Thành Viên",
+                  member_type=MemberType.UNION_MEMBER, status=MemberStatus.ACTIVE,
+                  join_date=datetime.now(), department="Benchmark")
+
+
+def _new_report(submitter_id: int) -> Report:
+    return Report(title=f"Benchmark báo cáo {_bench_code()}", report_type=ReportType.MONTHLY,
+                  period=datetime.now().strftime("%Y-%m"), content="Benchmark",
+                  status=ReportStatus.DRAFT, submitted_by=submitter_id)
+
+
+def _new_task(assignee_id: int, assigner_id: int) -> Task:
+    return Task(title=f"Benchmark công việc {_bench_code()}", priority=TaskPriority.MEDIUM,
+                status=TaskStatus.NOT_STARTED, assigned_to=assignee_id, assigned_by=assigner_id,
+                start_date=datetime.now(), due_date=datetime.now() + timedelta(days=7),
+                estimated_hours=4.0)
+
+
+def repository_cases(ctx: BenchmarkContext, member_repo, report_repo, task_repo) -> List[BenchmarkCase]:
+    """Một case cho mỗi phương thức của ba repository interface"""
+    now = datetime.now()
+
+    def delete_member(result, *args):
+        member_repo.delete(result.id)
+
+    def delete_report(result, *args):
+        report_repo.delete(result.id)
+
+    def delete_task(result, *args):
+        task_repo.delete(result.id)
+
+    def created_report():
+        return (report_repo.create(_new_report(ctx.submitter_id)),)
+
+    def created_task():
+        return (task_repo.create(_new_task(ctx.assignee_id, ctx.assigner_id)),)
+
+    def cleanup_report(result, report):
+        report_repo.delete(report.id)
+
+    def cleanup_task(result, task):
+        task_repo.delete(task.id)
+
+    def touch(entity, field: str = 'notes'):
+        setattr(entity, field, f"benchmark {datetime.now().isoformat()}")
+        return (entity,)
+
+    return [
+        # Members
+        BenchmarkCase("member.create", lambda: member_repo.create(_new_member()), teardown=delete_member),
+        BenchmarkCase("member.get_by_id", lambda: member_repo.get_by_id(ctx.member_id)),
+        BenchmarkCase("member.get_by_member_code", lambda: member_repo.get_by_member_code(ctx.member_code)),
+        BenchmarkCase("member.get_all", member_repo.get_all, heavy=True),
+        BenchmarkCase("member.get_by_type", lambda: member_repo.get_by_type(MemberType.EXECUTIVE), heavy=True),
+        BenchmarkCase("member.get_by_status", lambda: member_repo.get_by_status(MemberStatus.SUSPENDED),
+                      heavy=True),
+        BenchmarkCase("member.search_by_name", lambda: member_repo.search_by_name(ctx.member_name_fragment),
+                      heavy=True),
+        BenchmarkCase("member.update", member_repo.update,
+                      setup=lambda: touch(member_repo.get_by_id(ctx.member_id))),
+        BenchmarkCase("member.delete", member_repo.delete,
+                      setup=lambda: (member_repo.create(_new_member()).id,)),
+        BenchmarkCase("member.count_by_type", lambda: member_repo.count_by_type(MemberType.UNION_MEMBER)),
+        BenchmarkCase("member.changed_since", lambda: member_repo.changed_since(now - timedelta(hours=1))),
+        BenchmarkCase("member.deleted_since", lambda: member_repo.deleted_since(0)),
+
+        # Reports
+        BenchmarkCase("report.create", lambda: report_repo.create(_new_report(ctx.submitter_id)),
+                      teardown=delete_report),
+        BenchmarkCase("report.get_by_id", lambda: report_repo.get_by_id(ctx.report_id)),
+        BenchmarkCase("report.get_all", report_repo.get_all, heavy=True),
+        BenchmarkCase("report.get_by_type", lambda: report_repo.get_by_type(ReportType.SPECIAL), heavy=True),
+        BenchmarkCase("report.get_by_status", lambda: report_repo.get_by_status(ReportStatus.SUBMITTED),
+                      heavy=True),
+        BenchmarkCase("report.get_by_period", lambda: report_repo.get_by_period(ctx.report_period)),
+        BenchmarkCase("report.get_by_submitter", lambda: report_repo.get_by_submitter(ctx.submitter_id)),
+        BenchmarkCase("report.get_by_date_range",
+                      lambda: report_repo.get_by_date_range(now - timedelta(days=30), now), heavy=True),
+        BenchmarkCase("report.search_by_title", lambda: report_repo.search_by_title("Kế hoạch"), heavy=True),
+        BenchmarkCase("report.update", report_repo.update, setup=lambda: touch(created_report()[0], 'content'),
+                      teardown=cleanup_report),
+        BenchmarkCase("report.delete", report_repo.delete,
+                      setup=lambda: (report_repo.create(_new_report(ctx.submitter_id)).id,)),
+        BenchmarkCase("report.count_by_status", lambda: report_repo.count_by_status(ReportStatus.APPROVED)),
+        BenchmarkCase("report.changed_since", lambda: report_repo.changed_since(now - timedelta(hours=1))),
+        BenchmarkCase("report.deleted_since", lambda: report_repo.deleted_since(0)),
+
+        # Tasks
+        BenchmarkCase("task.create", lambda: task_repo.create(_new_task(ctx.assignee_id, ctx.assigner_id)),
+                      teardown=delete_task),
+        BenchmarkCase("task.get_by_id", lambda: task_repo.get_by_id(ctx.task_id)),
+        BenchmarkCase("task.get_all", task_repo.get_all, heavy=True),
+        BenchmarkCase("task.get_by_assignee", lambda: task_repo.get_by_assignee(ctx.assignee_id)),
+        BenchmarkCase("task.get_by_assigner", lambda: task_repo.get_by_assigner(ctx.assigner_id), heavy=True),
+        BenchmarkCase("task.get_by_status", lambda: task_repo.get_by_status(TaskStatus.ON_HOLD), heavy=True),
+        BenchmarkCase("task.get_by_priority", lambda: task_repo.get_by_priority(TaskPriority.URGENT),
+                      heavy=True),
+        BenchmarkCase("task.get_by_due_date_range",
+                      lambda: task_repo.get_by_due_date_range(now, now + timedelta(days=7)), heavy=True),
+        BenchmarkCase("task.get_overdue_tasks", task_repo.get_overdue_tasks, heavy=True),
+        BenchmarkCase("task.search_by_title", lambda: task_repo.search_by_title("hội nghị"), heavy=True),
+        BenchmarkCase("task.update", task_repo.update, setup=lambda: touch(created_task()[0]),
+                      teardown=cleanup_task),
+        BenchmarkCase("task.delete", task_repo.delete,
+                      setup=lambda: (task_repo.create(_new_task(ctx.assignee_id, ctx.assigner_id)).id,)),
+        BenchmarkCase("task.count_by_status", lambda: task_repo.count_by_status(TaskStatus.IN_PROGRESS)),
+        BenchmarkCase("task.get_task_statistics", task_repo.get_task_statistics),
+        BenchmarkCase("task.changed_since", lambda: task_repo.changed_since(now - timedelta(hours=1))),
+        BenchmarkCase("task.deleted_since", lambda: task_repo.deleted_since(0)),
+    ]
+
+
+def use_case_cases(ctx: BenchmarkContext, member_use_case, report_use_case, task_use_case) -> List[BenchmarkCase]:
+    """Các luồng chính mà GUI gọi: tạo, cập nhật, duyệt, thống kê, tìm kiếm"""
+    member_repo = member_use_case.member_repository
+    report_repo = report_use_case.report_repository
+    task_repo = task_use_case.task_repository
+
+    def member_data():
+        return ({'member_code': _bench_code(), 'full_name': "Benchmark Thành Viên",
+                 'member_type': MemberType.UNION_MEMBER, 'department': "Benchmark"},)
+
+    def submitted_report():
+        report = report_repo.create(_new_report(ctx.submitter_id))
+        report_use_case.submit_report(report.id, ctx.submitter_id)
+        return (report.id,)
+
+    def new_task_id():
+        return (task_repo.create(_new_task(ctx.assignee_id, ctx.assigner_id)).id,)
+
+    return [
+        BenchmarkCase("use_case.create_member", member_use_case.create_member, setup=member_data,
+                      teardown=lambda result, data: member_repo.delete(result.id)),
+        BenchmarkCase("use_case.update_member",
+                      lambda: member_use_case.update_member(ctx.member_id, {'notes': datetime.now().isoformat()})),
+        BenchmarkCase("use_case.create_report",
+                      lambda: report_use_case.create_report({
+                          'title': f"Benchmark báo cáo {_bench_code()}", 'period': datetime.now().strftime("%Y-%m"),
+                          'submitted_by': ctx.submitter_id}),
+                      teardown=lambda result: report_repo.delete(result.id)),
+        BenchmarkCase("use_case.approve_report",
+                      lambda report_id: report_use_case.approve_report(report_id, ctx.executive_id),
+                      setup=submitted_report,
+                      teardown=lambda result, report_id: report_repo.delete(report_id)),
+        BenchmarkCase("use_case.create_task",
+                      lambda: task_use_case.create_task({
+                          'title': f"Benchmark công việc {_bench_code()}", 'assigned_to': ctx.assignee_id,
+                          'assigned_by': ctx.assigner_id, 'due_date': datetime.now() + timedelta(days=7)}),
+                      teardown=lambda result: task_repo.delete(result.id)),
+        BenchmarkCase("use_case.update_task_progress",
+                      lambda task_id: task_use_case.update_task_progress(task_id, 50),
+                      setup=new_task_id, teardown=lambda result, task_id: task_repo.delete(task_id)),
+        BenchmarkCase("use_case.complete_task", task_use_case.complete_task,
+                      setup=new_task_id, teardown=lambda result, task_id: task_repo.delete(task_id)),
+        BenchmarkCase("use_case.member_statistics", member_use_case.get_member_statistics, heavy=True),
+        BenchmarkCase("use_case.report_statistics", report_use_case.get_report_statistics, heavy=True),
+        BenchmarkCase("use_case.task_statistics", task_use_case.get_task_statistics),
+        BenchmarkCase("use_case.my_tasks", lambda: task_use_case.get_my_tasks(ctx.assigner_id), heavy=True),
+        BenchmarkCase("use_case.my_tasks_counts", lambda: task_use_case.get_my_tasks(ctx.assigner_id, counts_only=True)),
+        BenchmarkCase("use_case.search_members",
+                      lambda: member_use_case.search_members(ctx.member_name_fragment), heavy=True),
+        BenchmarkCase("use_case.search_reports", lambda: report_use_case.search_reports_by_title("Báo cáo"),
+                      heavy=True),
+        BenchmarkCase("use_case.search_tasks", lambda: task_use_case.search_tasks_by_title("Tổng hợp"),
+                      heavy=True),
+    ]
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Đo tốc độ (objects/second) và kích thước (byte/entity) khi dựng entity từ dòng database:
+dataclass thường như trước đây, constructor của entity slotted và ``hydrate()``
+
+Ví dụ:
+    python benchmarks/entity_hydration.py --rows 1000000
+    python benchmarks/entity_hydration.py --rows 200000 --entity task
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import field, fields, make_dataclass
+from datetime import datetime
+from typing import Callable, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from domain.entities import Member, Report, Task
+
+ENTITIES = {'member': Member, 'report': Report, 'task': Task}
+TEMPLATE_COUNT = 1000  # Số dòng mẫu khác nhau, dùng lặp lại cho đủ --rows
+
+
+def _legacy_class(cls):
+    """Dataclass thường có __dict__ và __post_init__ ghi đè updated_at - cách hydrate trước đây"""
+    def post_init(self):
+        if self.created_at is None:
+            self.created_at = datetime.now()
+        self.updated_at = datetime.now()
+
+    spec = [(f.name, f.type, field(default=f.default)) for f in fields(cls)]
+    return make_dataclass(f"Legacy{cls.__name__}", spec, namespace={'__post_init__': post_init})
+
+
+def _templates(cls) -> List[dict]:
+    base = {f.name: f.default for f in fields(cls)}
+    stamp = datetime(2025, 6, 1, 8, 30)
+    return [dict(base, id=i + 1, created_at=stamp, updated_at=stamp) for i in range(TEMPLATE_COUNT)]
+
+
+def _measure(build: Callable[[dict], object], templates: List[dict], rows: int):
+    """(objects/second, byte/entity) khi dựng ``rows`` entity và giữ tất cả trong một list"""
+    repeats, remainder = divmod(rows, len(templates))
+    source = templates * repeats + templates[:remainder]
+    gc.collect()
+    gc.disable()  # GC thế hệ trẻ chạy liên tục khi tạo hàng triệu object làm nhiễu phép đo thời gian
+    try:
+        start = time.perf_counter()
+        entities = [build(values) for values in source]
+        elapsed = time.perf_counter() - start
+    finally:
+        gc.enable()
+    del entities
+    gc.collect()
+
+    # Lần thứ hai dưới tracemalloc: chỉ tính phần cấp phát cho entity (giá trị field dùng chung giữa các dòng)
+    sample = source[:min(rows, 100_000)]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    entities = [build(values) for values in sample]
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    per_entity = (allocated - sys.getsizeof(entities)) / len(sample)
+    del entities
+    return rows / elapsed, per_entity
+
+
+def run(cls, rows: int):
+    legacy = _legacy_class(cls)
+    templates = _templates(cls)
+
+    def legacy_hydrate(values):
+        entity = legacy(**values)
+        entity.updated_at = values['updated_at']
+        return entity
+
+    variants = [
+        ("dataclass + __post_init__", legacy_hydrate),
+        ("slotted constructor", lambda values: cls(**values)),
+        ("slotted hydrate()", lambda values: cls.hydrate(**values)),
+    ]
+    print(f"🏁 {cls.__name__}: {rows:,} rows")
+    print(f"   {'Variant':<28} {'objects/s':>12} {'bytes/entity':>14}")
+    for name, build in variants:
+        rate, size = _measure(build, templates, rows)
+        print(f"   {name:<28} {rate:>12,.0f} {size:>14,.0f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark hydrate entity")
+    parser.add_argument("--rows", type=lambda value: int(value.replace('_', '')), default=1_000_000)
+    parser.add_argument("--entity", choices=sorted(ENTITIES), help="Chỉ đo một entity (mặc định cả ba)")
+    args = parser.parse_args(argv)
+
+    for name in ([args.entity] if args.entity else sorted(ENTITIES)):
+        run(ENTITIES[name], args.rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+So sánh thống kê công việc trên list entity (vòng lặp Python) và trên TaskFrame (NumPy):
+thời gian dựng, thời gian thống kê/lọc/đếm theo tháng và bộ nhớ
+
+Ví dụ:
+    python benchmarks/frame_analytics.py --rows 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from domain.entities.frames import TaskFrame
+from domain.entities.task import Task, TaskPriority, TaskStatus
+from infrastructure.monitoring.memory_report import deep_sizeof
+
+
+def _tasks(rows: int, seed: int) -> List[Task]:
+    rng = random.Random(seed)
+    statuses, priorities = list(TaskStatus), list(TaskPriority)
+    start = datetime(2024, 1, 1)
+    tasks = []
+    for i in range(rows):
+        created = start + timedelta(minutes=rng.randrange(0, 800_000))
+        tasks.append(Task.hydrate(
+            id=i + 1, title="", description="", priority=rng.choice(priorities), status=rng.choice(statuses),
+            assigned_to=rng.randrange(1, 5000), assigned_by=rng.randrange(1, 50), start_date=created,
+            due_date=created + timedelta(days=rng.randrange(1, 60)), completed_date=None,
+            estimated_hours=float(rng.randrange(1, 40)), actual_hours=float(rng.randrange(0, 50)),
+            progress_percentage=rng.randrange(0, 101), notes="", created_at=created, updated_at=created,
+        ))
+    return tasks
+
+
+def _loop_statistics(tasks: List[Task]) -> dict:
+    """Cách cũ: duyệt từng entity"""
+    stats = Counter(total=len(tasks))
+    for task in tasks:
+        status = task.status.value if hasattr(task.status, 'value') else task.status
+        priority = task.priority.value if hasattr(task.priority, 'value') else task.priority
+        if status == "completed":
+            stats['completed'] += 1
+        elif status == "in_progress":
+            stats['in_progress'] += 1
+        elif status == "not_started":
+            stats['pending'] += 1
+        if priority in ("high", "urgent"):
+            stats['high_priority'] += 1
+        if status == "overdue":
+            stats['overdue'] += 1
+    return dict(stats)
+
+
+def _loop_by_month(tasks: List[Task]) -> dict:
+    return dict(Counter(task.created_at.strftime("%Y-%m") for task in tasks
+                        if task.status != TaskStatus.CANCELLED))
+
+
+def _timed(label: str, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"   {label:<44} {(time.perf_counter() - start) * 1000:>10.1f} ms")
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark TaskFrame")
+    parser.add_argument("--rows", type=lambda value: int(value.replace('_', '')), default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    print(f"🏁 {args.rows:,} tasks")
+    tasks = _timed("dựng list entity", lambda: _tasks(args.rows, args.seed))
+    frame = _timed("TaskFrame.from_entities", lambda: TaskFrame.from_entities(tasks))
+
+    loop_stats = _timed("thống kê - vòng lặp entity", lambda: _loop_statistics(tasks))
+    frame_stats = _timed("thống kê - TaskFrame", lambda: frame.statistics())
+    _timed("đếm theo tháng (trừ đã hủy) - vòng lặp", lambda: _loop_by_month(tasks))
+    _timed("đếm theo tháng (trừ đã hủy) - TaskFrame",
+           lambda: frame.count_by_period('created_at', 'M', ~frame.mask('status', TaskStatus.CANCELLED)))
+    _timed("lọc người được giao < 100 - vòng lặp",
+           lambda: [task for task in tasks if task.assigned_to < 100])
+    _timed("lọc người được giao < 100 - TaskFrame", lambda: frame.filter(frame['assigned_to'] < 100))
+
+    mismatched = {key for key in frame_stats if loop_stats.get(key, 0) != frame_stats[key]}
+    print(f"   {'kết quả giống nhau':<44} {'✅' if not mismatched else '❌ ' + ', '.join(sorted(mismatched))}")
+
+    sample = tasks[::max(1, len(tasks) // 10_000)]
+    entity_bytes = deep_sizeof(sample) / len(sample) * len(tasks)
+    print(f"   {'bộ nhớ list entity (ước lượng)':<44} {entity_bytes / 1024 / 1024:>10.1f} MB")
+    print(f"   {'bộ nhớ TaskFrame':<44} {frame.nbytes / 1024 / 1024:>10.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""
+Benchmark harness
+Đo độ trễ (p50/p95), số round trip tới database và rows/second cho từng benchmark case
+"""
+import json
+import os
+import platform
+import statistics
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import event
+
+
+@dataclass
+class BenchmarkCase:
+    """
+    Một phép đo.
+
+    ``setup`` chạy ngoài vùng đo và trả về tuple tham số cho ``run``;
+    ``teardown`` nhận kết quả của ``run`` cùng các tham số đó để dọn dữ liệu.
+    Case ``heavy`` (get_all...) chạy ít lần hơn trên dataset lớn.
+    """
+    name: str
+    run: Callable[..., Any]
+    setup: Optional[Callable[[], tuple]] = None
+    teardown: Optional[Callable[..., None]] = None
+    heavy: bool = False
+
+
+@dataclass
+class BenchmarkResult:
+    """Kết quả đo của một case"""
+    name: str
+    iterations: int
+    p50_ms: float
+    p95_ms: float
+    mean_ms: float
+    round_trips: float  # Trung bình số câu lệnh SQL mỗi lần chạy
+    rows_per_second: float
+    rows: float  # Trung bình số dòng trả về mỗi lần chạy
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            'iterations': self.iterations,
+            'p50_ms': round(self.p50_ms, 3),
+            'p95_ms': round(self.p95_ms, 3),
+            'mean_ms': round(self.mean_ms, 3),
+            'round_trips': round(self.round_trips, 2),
+            'rows_per_second': round(self.rows_per_second, 1),
+            'rows': round(self.rows, 1),
+        }
+        data.update(self.extra)
+        return data
+
+
+class RoundTripCounter:
+    """Đếm số câu lệnh gửi tới database qua SQLAlchemy engine events"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+        return False
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Percentile theo nội suy tuyến tính (values không cần sắp xếp)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * pct / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _count_rows(result: Any) -> int:
+    if result is None or result is False:
+        return 0
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    return 1
+
+
+def run_case(case: BenchmarkCase, counter: RoundTripCounter,
+             iterations: int, warmup: int = 1) -> BenchmarkResult:
+    """Chạy một case ``warmup + iterations`` lần, chỉ đo phần ``run``"""
+    timings: List[float] = []
+    round_trips: List[int] = []
+    rows: List[int] = []
+
+    for index in range(warmup + iterations):
+        args = case.setup() if case.setup else ()
+
+        counter.count = 0
+        started = time.perf_counter()
+        result = case.run(*args)
+        elapsed = time.perf_counter() - started
+        executed = counter.count
+
+        if case.teardown:
+            case.teardown(result, *args)
+
+        if index < warmup:
+            continue
+        timings.append(elapsed)
+        round_trips.append(executed)
+        rows.append(_count_rows(result))
+
+    total_time = sum(timings)
+    return BenchmarkResult(
+        name=case.name,
+        iterations=iterations,
+        p50_ms=percentile(timings, 50) * 1000,
+        p95_ms=percentile(timings, 95) * 1000,
+        mean_ms=statistics.mean(timings) * 1000,
+        round_trips=statistics.mean(round_trips),
+        rows_per_second=(sum(rows) / total_time) if total_time > 0 else 0.0,
+        rows=statistics.mean(rows),
+    )
+
+
+def run_suite(cases: List[BenchmarkCase], engine, iterations: int,
+              heavy_iterations: int, warmup: int = 1) -> Dict[str, Dict[str, Any]]:
+    """Chạy tất cả case, lỗi của một case không dừng cả suite"""
+    results = {}
+    with RoundTripCounter(engine) as counter:
+        for case in cases:
+            count = heavy_iterations if case.heavy else iterations
+            try:
+                result = run_case(case, counter, count, warmup)
+            except Exception as e:
+                print(f"❌ {case.name}: {e}")
+                results[case.name] = {'error': str(e)}
+                continue
+            results[case.name] = result.to_dict()
+            print(f"  {case.name:<45} p50 {result.p50_ms:9.2f} ms  p95 {result.p95_ms:9.2f} ms  "
+                  f"rt {result.round_trips:5.1f}  {result.rows_per_second:12,.0f} rows/s")
+    return results
+
+
+# Baseline JSON
+def build_report(datasets: Dict[str, Dict[str, Any]], label: str = "") -> Dict[str, Any]:
+    """Gói kết quả kèm metadata môi trường để lưu thành baseline"""
+    return {
+        'label': label,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'datasets': datasets,
+    }
+
+
+def save_report(report: Dict[str, Any], path: str):
+    """Ghi kết quả ra file JSON"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def load_report(path: str) -> Dict[str, Any]:
+    """Đọc file baseline JSON"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def dataset_key(counts: Dict[str, int]) -> str:
+    """Khóa dataset trong file kết quả: tổng số dòng - giống nhau dù dữ liệu nạp bằng --load hay có sẵn"""
+    return str(sum(counts.values()))
+
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any],
+                    tolerance: float = 0.2, min_delta_ms: float = 0.5) -> List[str]:
+    """
+    So sánh kết quả với baseline, trả về danh sách regression.
+
+    Một case bị coi là chậm đi khi p50 hoặc p95 tăng quá ``tolerance`` (tỉ lệ)
+    và quá ``min_delta_ms`` (tránh nhiễu ở các case dưới 1 ms). Số round trip
+    là tất định nên bất kỳ mức tăng nào cũng bị báo.
+
+    Raise ValueError khi không có dataset hoặc case nào so sánh được - so sánh
+    rỗng không được coi là "không có regression".
+    """
+    regressions = []
+    baseline_datasets = baseline.get('datasets', {})
+    current_datasets = current.get('datasets', {})
+    shared = [dataset for dataset in current_datasets if dataset in baseline_datasets]
+    if not shared:
+        raise ValueError(
+            f"No dataset in common with the baseline: current {sorted(current_datasets)}, "
+            f"baseline {sorted(baseline_datasets)} (datasets are keyed by total row count)"
+        )
+
+    compared = 0
+    for dataset in shared:
+        baseline_cases = baseline_datasets[dataset]
+        for name, result in current_datasets[dataset].items():
+            before = baseline_cases.get(name)
+            if not before or 'error' in before or 'error' in result:
+                continue
+            compared += 1
+
+            for metric in ('p50_ms', 'p95_ms'):
+                old, new = before[metric], result[metric]
+                if new > old * (1 + tolerance) and new - old > min_delta_ms:
+                    regressions.append(
+                        f"[{dataset}] {name}: {metric} {old:.2f} -> {new:.2f} ms "
+                        f"(+{(new / old - 1) * 100 if old else 100:.0f}%)"
+                    )
+            if result['round_trips'] > before['round_trips']:
+                regressions.append(
+                    f"[{dataset}] {name}: round trips {before['round_trips']} -> {result['round_trips']}"
+                )
+    if not compared:
+        raise ValueError(f"No benchmark case in common with the baseline for dataset(s) {', '.join(shared)}")
+    return regressions
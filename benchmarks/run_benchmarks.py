@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Chạy benchmark cho repository và use case trên PostgreSQL local
+
+Ví dụ:
+    # Nạp lại dữ liệu tổng hợp ở từng kích thước rồi lưu baseline (XÓA dữ liệu hiện có!)
+    python benchmarks/run_benchmarks.py --load --sizes 10000,100000 --output benchmarks/results/baseline.json
+
+    # Đo trên dữ liệu hiện có và so sánh với baseline
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/baseline.json --tolerance 0.2
+"""
+import argparse
+import os
+import sys
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.harness import build_report, compare_reports, dataset_key, load_report, run_suite, save_report
+
+DEFAULT_RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def _parse_sizes(value: str) -> List[int]:
+    return [int(part.replace('_', '')) for part in value.split(',') if part.strip()]
+
+
+def _load_dataset(size: int, seed: int, as_of: datetime):
+    """Sinh lại dataset ``size`` dòng bằng generate_data (TRUNCATE các bảng)"""
+    from infrastructure.database.generate_data import (
+        SyntheticDataGenerator, generate_to_database, resolve_counts
+    )
+
+    counts = resolve_counts(size, None, None, None)
+    print(f"📊 Loading {size:,} rows (seed={seed})...")
+    generate_to_database(SyntheticDataGenerator(seed=seed, as_of=as_of), counts, truncate=True)
+
+
+def run_dataset(iterations: int, heavy_iterations: int, warmup: int, only: Optional[str]) -> Tuple[str, dict]:
+    """Chạy toàn bộ case trên dataset đang có trong database, trả về (khóa dataset, kết quả)"""
+    from application.use_cases.member_management import MemberManagementUseCase
+    from application.use_cases.report_management import ReportManagementUseCase
+    from application.use_cases.task_management import TaskManagementUseCase
+    from benchmarks.cases import load_context, repository_cases, use_case_cases
+    from infrastructure.database.connection import db_manager
+    from infrastructure.repositories import MemberRepository, ReportRepository, TaskRepository
+
+    ctx = load_context()
+    print(f"   members={ctx.counts['members']:,} reports={ctx.counts['reports']:,} tasks={ctx.counts['tasks']:,}")
+
+    member_repo, report_repo, task_repo = MemberRepository(), ReportRepository(), TaskRepository()
+    cases = repository_cases(ctx, member_repo, report_repo, task_repo) + use_case_cases(
+        ctx,
+        MemberManagementUseCase(member_repo),
+        ReportManagementUseCase(report_repo),
+        TaskManagementUseCase(task_repo),
+    )
+    if only:
+        cases = [case for case in cases if only in case.name]
+
+    key = dataset_key(ctx.counts)
+    print(f"🏁 Dataset {key} rows")
+    return key, run_suite(cases, db_manager.get_engine(), iterations, heavy_iterations, warmup)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark repository và use case")
+    parser.add_argument("--load", action="store_true",
+                        help="Sinh lại dữ liệu cho từng kích thước trong --sizes (TRUNCATE members/reports/tasks)")
+    parser.add_argument("--sizes", type=_parse_sizes, default=[10_000, 100_000],
+                        help="Các kích thước dataset khi dùng --load, ví dụ 10000,100000,1000000")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--as-of", type=datetime.fromisoformat, default=datetime(2025, 6, 1),
+                        help="Ngày tham chiếu của dữ liệu sinh ra")
+    parser.add_argument("--iterations", type=int, default=20, help="Số lần đo mỗi case")
+    parser.add_argument("--heavy-iterations", type=int, default=5,
+                        help="Số lần đo cho case trả về nhiều dòng (get_all, thống kê, tìm kiếm)")
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--only", help="Chỉ chạy case có tên chứa chuỗi này, ví dụ 'task.'")
+    parser.add_argument("--label", default="", help="Nhãn ghi vào file kết quả (commit, máy...)")
+    parser.add_argument("--output", help="File JSON kết quả (mặc định benchmarks/results/<thời gian>.json)")
+    parser.add_argument("--compare", metavar="BASELINE", help="So sánh với file baseline JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Mức chậm đi cho phép so với baseline (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    # Cả hai chế độ đều lấy khóa theo tổng số dòng đếm được, để baseline --load so sánh được với dữ liệu có sẵn
+    datasets = {}
+    if args.load:
+        for size in args.sizes:
+            _load_dataset(size, args.seed, args.as_of)
+            key, results = run_dataset(args.iterations, args.heavy_iterations, args.warmup, args.only)
+            datasets[key] = results
+    else:
+        key, results = run_dataset(args.iterations, args.heavy_iterations, args.warmup, args.only)
+        datasets[key] = results
+
+    report = build_report(datasets, args.label)
+    output = args.output or os.path.join(DEFAULT_RESULTS_DIR, datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    save_report(report, output)
+    print(f"💾 Results saved to {output}")
+
+    if args.compare:
+        try:
+            regressions = compare_reports(load_report(args.compare), report, args.tolerance)
+        except ValueError as e:
+            print(f"❌ Cannot compare with {args.compare}: {e}")
+            return 2
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s) vs {args.compare}:")
+            for line in regressions:
+                print(f"   {line}")
+            return 1
+        print(f"✅ No regressions vs {args.compare} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+So sánh CPU phía client mỗi lần gọi giữa session.query() dựng mới từng lần (cách cũ)
+và statement dựng sẵn trong infrastructure/repositories/statements.py
+
+Ví dụ:
+    # SQLite in-memory - chỉ đo phần Python (dựng câu lệnh, cache key, compile, ORM)
+    python benchmarks/statement_cache.py --calls 5000
+
+    # Trên PostgreSQL đã cấu hình (.env), dùng dữ liệu hiện có
+    python benchmarks/statement_cache.py --postgres --calls 2000
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from domain.entities.member import MemberStatus, MemberType
+from domain.entities.report import ReportStatus, ReportType
+from domain.entities.task import TaskPriority, TaskStatus
+from infrastructure.database.models import Base, MemberModel, ReportModel, TaskModel
+from infrastructure.repositories import statements
+
+
+def _seed(session, rows: int):
+    now = datetime.now()
+    for i in range(rows):
+        session.add(MemberModel(member_code=f"M{i:06d}", full_name=f"Member {i}", member_type=MemberType.UNION_MEMBER,
+                                status=MemberStatus.ACTIVE, created_at=now, updated_at=now - timedelta(minutes=i)))
+        session.add(ReportModel(title=f"Report {i}", report_type=ReportType.MONTHLY, period="2025-06",
+                                status=ReportStatus.SUBMITTED, created_at=now, updated_at=now))
+        session.add(TaskModel(title=f"Task {i}", priority=TaskPriority.MEDIUM, status=TaskStatus.IN_PROGRESS,
+                              assigned_to=i % 50 + 1, due_date=now + timedelta(days=i % 30),
+                              created_at=now, updated_at=now))
+    session.commit()
+
+
+def _cases(member_code: str, watermark: datetime) -> List[Tuple[str, Callable, Callable]]:
+    """(tên, cách cũ, statement dựng sẵn) - cả hai nhận session"""
+    return [
+        ("member.get_by_id",
+         lambda s: s.query(MemberModel).filter(MemberModel.id == 1).first(),
+         lambda s: s.scalars(statements.MEMBER_BY_ID, {'id': 1}).first()),
+        ("member.get_by_member_code",
+         lambda s: s.query(MemberModel).filter(MemberModel.member_code == member_code).first(),
+         lambda s: s.scalars(statements.MEMBER_BY_CODE, {'member_code': member_code}).first()),
+        ("task.get_by_assignee",
+         lambda s: s.query(TaskModel).filter(TaskModel.assigned_to == 1).order_by(TaskModel.due_date.asc()).all(),
+         lambda s: s.scalars(statements.TASK_BY_ASSIGNEE, {'assigned_to': 1}).all()),
+        ("report.count_by_status",
+         lambda s: s.query(func.count(ReportModel.id)).filter(ReportModel.status == ReportStatus.SUBMITTED).scalar(),
+         lambda s: s.scalar(statements.REPORT_COUNT_BY_STATUS, {'status': ReportStatus.SUBMITTED})),
+        ("member.changed_since",
+         lambda s: s.query(MemberModel).filter(MemberModel.updated_at > watermark)
+         .order_by(MemberModel.updated_at, MemberModel.id).all(),
+         lambda s: s.scalars(statements.MEMBER_CHANGED_SINCE, {'watermark': watermark}).all()),
+    ]
+
+
+def _cpu_per_call_us(session_factory, call: Callable, calls: int, warmup: int) -> float:
+    session = session_factory()
+    try:
+        for _ in range(warmup):
+            call(session)
+            session.expunge_all()
+        start = time.process_time()
+        for _ in range(calls):
+            call(session)
+            session.expunge_all()  # Không để identity map làm nhẹ lần gọi sau
+        return (time.process_time() - start) / calls * 1_000_000
+    finally:
+        session.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="CPU mỗi lần gọi: session.query() so với statement dựng sẵn")
+    parser.add_argument("--postgres", action="store_true", help="Đo trên PostgreSQL đã cấu hình thay vì SQLite")
+    parser.add_argument("--rows", type=int, default=200, help="Số dòng mỗi bảng khi seed SQLite")
+    parser.add_argument("--calls", type=int, default=3000, help="Số lần gọi mỗi case")
+    parser.add_argument("--warmup", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    if args.postgres:
+        from dotenv import load_dotenv
+        load_dotenv()
+        from infrastructure.database.connection import db_manager
+        session_factory = db_manager.get_session_factory()
+        with session_factory() as session:
+            member_code = session.scalar(select(MemberModel.member_code).limit(1)) or "M000000"
+    else:
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        session_factory = sessionmaker(bind=engine)
+        with session_factory() as session:
+            _seed(session, args.rows)
+        member_code = "M000001"
+
+    watermark = datetime.now() - timedelta(minutes=10)
+    print(f"🏁 {args.calls} calls/case ({'PostgreSQL' if args.postgres else 'SQLite in-memory'})")
+    print(f"   {'Case':<28} {'query() µs':>12} {'cached µs':>12} {'Saved':>10}")
+    for name, legacy, cached in _cases(member_code, watermark):
+        before = _cpu_per_call_us(session_factory, legacy, args.calls, args.warmup)
+        after = _cpu_per_call_us(session_factory, cached, args.calls, args.warmup)
+        print(f"   {name:<28} {before:>12.1f} {after:>12.1f} {(before - after) / before:>10.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,9 @@
 from .settings import AppConfig, config
 from .logging_config import setup_logging, get_logger
+from .lazy_import import LazyModule, lazy_import, lazy_from_import
 
 __all__ = [
     'AppConfig', 'config',
-    'setup_logging', 'get_logger'
+    'setup_logging', 'get_logger',
+    'LazyModule', 'lazy_import', 'lazy_from_import'
 ]
\ No newline at end of file
@@ -0,0 +1,75 @@
+"""
+Lazy import helpers
+Trì hoãn import các thư viện nặng (pandas, openpyxl, matplotlib...) đến lần sử dụng đầu tiên
+"""
+import importlib
+import threading
+from typing import Any
+
+
+_import_lock = threading.Lock()
+
+
+class LazyModule:
+    """Proxy cho một module, chỉ import thật khi truy cập thuộc tính đầu tiên"""
+
+    def __init__(self, module_name: str):
+        self.__dict__['_module_name'] = module_name
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            with _import_lock:
+                module = self.__dict__['_module']
+                if module is None:
+                    module = importlib.import_module(self.__dict__['_module_name'])
+                    self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._load(), name)
+
+    def __setattr__(self, name: str, value: Any):
+        setattr(self._load(), name, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__['_module'] is not None else "not loaded"
+        return f"<LazyModule '{self.__dict__['_module_name']}' ({state})>"
+
+
+class LazyAttribute:
+    """Proxy cho một class/hàm trong module, dùng thay cho `from module import name`"""
+
+    def __init__(self, module_name: str, attr_name: str):
+        self._module = LazyModule(module_name)
+        self._attr_name = attr_name
+        self._target = None
+
+    def _resolve(self):
+        if self._target is None:
+            self._target = getattr(self._module, self._attr_name)
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._resolve(), name)
+
+    def __repr__(self) -> str:
+        return f"<LazyAttribute '{self._attr_name}'>"
+
+
+def lazy_import(module_name: str) -> LazyModule:
+    """Tạo proxy lazy cho module"""
+    return LazyModule(module_name)
+
+
+def lazy_from_import(module_name: str, *names: str):
+    """Tạo proxy lazy cho các tên trong module (tương đương `from module import a, b`)"""
+    proxies = tuple(LazyAttribute(module_name, name) for name in names)
+    return proxies[0] if len(proxies) == 1 else proxies
@@ -11,6 +11,8 @@ class AppConfig:
     DB_NAME: str = os.getenv("DB_NAME", "union_management")
     DB_USERNAME: str = os.getenv("DB_USERNAME", "postgres")
     DB_PASSWORD: str = os.getenv("DB_PASSWORD", "postgres")
+    DB_DRIVER: str = os.getenv("DB_DRIVER", "psycopg2")  # "psycopg" (v3) để dùng server-side prepared statement
+    DB_PREPARE_THRESHOLD: str = os.getenv("DB_PREPARE_THRESHOLD", "5")  # psycopg 3: prepare sau N lần chạy, rỗng = tắt
     
     # Application settings
     APP_NAME: str = os.getenv("APP_NAME", "Union Management System")
@@ -26,6 +28,74 @@ class AppConfig:
     MAX_FILE_SIZE: int = int(os.getenv("MAX_FILE_SIZE", "10485760"))  # 10MB
     ALLOWED_EXTENSIONS: set = set(os.getenv("ALLOWED_EXTENSIONS", "pdf,doc,docx,xls,xlsx,png,jpg,jpeg").split(","))
     
+    # SQL instrumentation - fingerprint/thời gian/số dòng theo repository method
+    SQL_INSTRUMENTATION_ENABLED: bool = os.getenv("SQL_INSTRUMENTATION_ENABLED", "False").lower() == "true"
+    SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", "200"))
+    SLOW_QUERY_LOG: str = os.getenv("SLOW_QUERY_LOG", "logs/slow_queries.log")
+    N_PLUS_ONE_THRESHOLD: int = int(os.getenv("N_PLUS_ONE_THRESHOLD", "10"))  # Cùng câu SQL trong một thao tác
+    
+    # Tracing - span từ thao tác GUI tới SQL, ghi JSON lines
+    TRACING_ENABLED: bool = os.getenv("TRACING_ENABLED", "False").lower() == "true"
+    TRACE_FILE: str = os.getenv("TRACE_FILE", "logs/traces.jsonl")
+    
+    # Sampling profiler - bật từ đầu bằng biến môi trường, hoặc từ menu ẩn (chuột phải vào logo)
+    PROFILER_ENABLED: bool = os.getenv("PROFILER_ENABLED", "False").lower() == "true"
+    PROFILER_SAMPLE_HZ: float = float(os.getenv("PROFILER_SAMPLE_HZ", "20"))
+    PROFILER_FLUSH_S: float = float(os.getenv("PROFILER_FLUSH_S", "60"))  # Ghi file định kỳ khi chạy liên tục
+    
+    # Memory report - ngân sách và tracemalloc (tốn thêm bộ nhớ/CPU khi bật từ đầu)
+    MEMORY_BUDGET_MB: float = float(os.getenv("MEMORY_BUDGET_MB", "500"))
+    MEMORY_CHECK_INTERVAL_S: float = float(os.getenv("MEMORY_CHECK_INTERVAL_S", "60"))
+    MEMORY_TRACEMALLOC_ENABLED: bool = os.getenv("MEMORY_TRACEMALLOC_ENABLED", "False").lower() == "true"
+    MEMORY_TRACEMALLOC_FRAMES: int = int(os.getenv("MEMORY_TRACEMALLOC_FRAMES", "1"))
+    
+    # Metrics - counter/histogram theo use case, repository và connection pool
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "False").lower() == "true"
+    METRICS_INTERVAL_S: float = float(os.getenv("METRICS_INTERVAL_S", "15"))
+    METRICS_PROMETHEUS_FILE: str = os.getenv("METRICS_PROMETHEUS_FILE", "logs/metrics.prom")
+    METRICS_SNAPSHOT_FILE: str = os.getenv("METRICS_SNAPSHOT_FILE", "logs/metrics_snapshots.json")
+    METRICS_SNAPSHOT_HISTORY: int = int(os.getenv("METRICS_SNAPSHOT_HISTORY", "240"))  # Số snapshot giữ lại
+    
+    # Job đánh dấu công việc quá hạn trên server (UPDATE theo lô, an toàn khi nhiều client cùng chạy)
+    OVERDUE_JOB_ENABLED: bool = os.getenv("OVERDUE_JOB_ENABLED", "True").lower() == "true"
+    OVERDUE_JOB_INTERVAL_S: float = float(os.getenv("OVERDUE_JOB_INTERVAL_S", "300"))
+    OVERDUE_JOB_BATCH_SIZE: int = int(os.getenv("OVERDUE_JOB_BATCH_SIZE", "5000"))
+    
+    # Nhắc hạn công việc - min-heap các mốc nhắc, chỉ thức dậy ở mốc gần nhất
+    DEADLINE_REMINDERS_ENABLED: bool = os.getenv("DEADLINE_REMINDERS_ENABLED", "True").lower() == "true"
+    DEADLINE_REMINDER_LEADS_MIN: str = os.getenv("DEADLINE_REMINDER_LEADS_MIN", "1440,60")  # Nhắc trước N phút
+    DEADLINE_REMINDER_OUTBOX: str = os.getenv("DEADLINE_REMINDER_OUTBOX", "logs/reminders_outbox.jsonl")  # Rỗng = tắt
+    
+    # Phân tích giờ ước tính/thực tế - công suất chuẩn mỗi thành viên và thời gian cache kỳ đang chạy
+    HOURS_CAPACITY_PER_MONTH: float = float(os.getenv("HOURS_CAPACITY_PER_MONTH", "160"))
+    HOURS_ANALYTICS_CACHE_S: float = float(os.getenv("HOURS_ANALYTICS_CACHE_S", "300"))
+    
+    # Lịch sử nội dung báo cáo - delta giữa các phiên bản, toàn văn mỗi N phiên bản để giới hạn số delta phải áp
+    REPORT_REVISION_SNAPSHOT_EVERY: int = int(os.getenv("REPORT_REVISION_SNAPSHOT_EVERY", "10"))
+    
+    # Performance budgets
+    IMPORT_TIME_BUDGET_MS: int = int(os.getenv("IMPORT_TIME_BUDGET_MS", "1500"))  # Cold-start import của GUI
+    
+    # GUI settings
+    PREFETCH_TABS: bool = os.getenv("PREFETCH_TABS", "True").lower() == "true"  # Tải trước dữ liệu các tab ở nền
+    PREFETCH_DELAY_MS: int = int(os.getenv("PREFETCH_DELAY_MS", "1500"))
+    DELTA_SYNC_OVERLAP_SECONDS: int = int(os.getenv("DELTA_SYNC_OVERLAP_SECONDS", "5"))  # Đọc lùi khi làm mới tăng dần
+    UI_WATCHDOG_ENABLED: bool = os.getenv("UI_WATCHDOG_ENABLED", "True").lower() == "true"  # Đo độ trễ event loop
+    UI_WATCHDOG_INTERVAL_MS: int = int(os.getenv("UI_WATCHDOG_INTERVAL_MS", "50"))
+    UI_STALL_THRESHOLD_MS: float = float(os.getenv("UI_STALL_THRESHOLD_MS", "100"))
+
+    # Local read replica (SQLite) - đọc danh sách tại máy, ghi vẫn gửi PostgreSQL
+    LOCAL_REPLICA_ENABLED: bool = os.getenv("LOCAL_REPLICA_ENABLED", "False").lower() == "true"
+    LOCAL_REPLICA_PATH: str = os.getenv("LOCAL_REPLICA_PATH", "data/local_replica.sqlite3")
+    LOCAL_REPLICA_SYNC_INTERVAL_S: float = float(os.getenv("LOCAL_REPLICA_SYNC_INTERVAL_S", "30"))
+    LOCAL_REPLICA_BATCH_SIZE: int = int(os.getenv("LOCAL_REPLICA_BATCH_SIZE", "5000"))
+    LOCAL_REPLICA_OVERLAP_SECONDS: int = int(os.getenv("LOCAL_REPLICA_OVERLAP_SECONDS", "60"))
+
+    # Change feed (LISTEN/NOTIFY) - thấy thay đổi của client khác trong khoảng một giây
+    CHANGE_NOTIFY_ENABLED: bool = os.getenv("CHANGE_NOTIFY_ENABLED", "True").lower() == "true"
+    CHANGE_NOTIFY_DEBOUNCE_MS: int = int(os.getenv("CHANGE_NOTIFY_DEBOUNCE_MS", "200"))  # Gom sự kiện liên tiếp
+    CHANGE_NOTIFY_RECONNECT_S: float = float(os.getenv("CHANGE_NOTIFY_RECONNECT_S", "5"))
+
     @classmethod
     def load_from_env_file(cls, env_file: str = ".env") -> None:
         """Load configuration from .env file"""
@@ -37,14 +107,14 @@ class AppConfig:
     def get_database_url(cls) -> str:
         """Get complete database connection URL for PostgreSQL"""
         return (
-            f"postgresql+psycopg2://{cls.DB_USERNAME}:{cls.DB_PASSWORD}@{cls.DB_HOST}:{cls.DB_PORT}/{cls.DB_NAME}"
+            f"postgresql+{cls.DB_DRIVER}://{cls.DB_USERNAME}:{cls.DB_PASSWORD}@{cls.DB_HOST}:{cls.DB_PORT}/{cls.DB_NAME}"
         )
     
     @classmethod
     def get_database_url_without_db(cls) -> str:
         """Get connection URL to PostgreSQL server without database (for creating database)"""
         return (
-            f"postgresql+psycopg2://{cls.DB_USERNAME}:{cls.DB_PASSWORD}@{cls.DB_HOST}:{cls.DB_PORT}/postgres"
+            f"postgresql+{cls.DB_DRIVER}://{cls.DB_USERNAME}:{cls.DB_PASSWORD}@{cls.DB_HOST}:{cls.DB_PORT}/postgres"
         )
     
     @classmethod
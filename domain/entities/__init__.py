@@ -1,9 +1,12 @@
 from .member import Member, MemberType, MemberStatus
 from .report import Report, ReportType, ReportStatus
 from .task import Task, TaskPriority, TaskStatus
+from .attachment import Attachment
+from .report_revision import ReportRevision
 
 __all__ = [
     'Member', 'MemberType', 'MemberStatus',
     'Report', 'ReportType', 'ReportStatus', 
-    'Task', 'TaskPriority', 'TaskStatus'
+    'Task', 'TaskPriority', 'TaskStatus',
+    'Attachment', 'ReportRevision'
 ]
\ No newline at end of file
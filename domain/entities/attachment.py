@@ -0,0 +1,24 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from domain.entities.hydration import slotted
+
+
+@slotted
+@dataclass
+class Attachment:
+    """Entity cho File đính kèm của báo cáo - chỉ metadata, nội dung nằm trong kho theo SHA-256"""
+    id: Optional[int] = None
+    report_id: Optional[int] = None
+    file_name: str = ""
+    content_type: str = ""
+    size: int = 0  # Số byte
+    sha256: str = ""  # Khóa nội dung trong AttachmentStore
+    uploaded_by: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+    def __post_init__(self):
+        # Chỉ chạy khi tạo mới trong ứng dụng - dòng đọc từ database đi qua hydrate()
+        if self.created_at is None:
+            self.created_at = datetime.now()
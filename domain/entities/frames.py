@@ -0,0 +1,259 @@
+"""
+Entity frames
+Tập entity dạng cột NumPy cho thống kê: enum thành mã int8, ngày thành datetime64,
+chuỗi mã hóa từ điển (mã int32 + danh sách giá trị) - lọc, đếm theo nhóm và theo kỳ không cần vòng lặp Python
+"""
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from config.lazy_import import lazy_import
+from domain.entities.member import MemberStatus, MemberType
+from domain.entities.report import ReportStatus, ReportType
+from domain.entities.task import TaskPriority, TaskStatus
+
+# NumPy chỉ được import khi dựng frame đầu tiên (không làm chậm khởi động GUI)
+np = lazy_import('numpy')
+
+# Kiểu cột: lớp Enum, hoặc một trong các chuỗi dưới đây
+ID, FLOAT, PERCENT, DATE, TEXT = 'id', 'float', 'percent', 'date', 'text'
+MISSING_ID = -1  # Giá trị của cột ID khi NULL
+MISSING_CODE = -1  # Mã của enum/chuỗi khi NULL hoặc không nhận ra
+CHUNK_ROWS = 50_000
+PERIOD_UNITS = {'D': 'datetime64[D]', 'M': 'datetime64[M]', 'Y': 'datetime64[Y]'}
+EPOCH = datetime(1970, 1, 1)
+SECOND = timedelta(seconds=1)
+NAT_SECONDS = -2 ** 63  # Biểu diễn int64 của NaT
+
+
+class ColumnFrame:
+    """
+    Các cột cùng độ dài của một tập entity. Lớp con khai báo ``COLUMNS`` là
+    ``(tên cột, kiểu)`` theo đúng thứ tự cột trong câu SELECT nạp frame.
+    """
+
+    COLUMNS: Tuple[Tuple[str, Any], ...] = ()
+
+    def __init__(self, columns: Dict[str, Any], categories: Dict[str, List[str]]):
+        self.columns = columns
+        self.categories = categories  # Cột TEXT: mã -> chuỗi
+        self._kinds = dict(self.COLUMNS)
+
+    # Dựng frame
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[Sequence[tuple]]) -> 'ColumnFrame':
+        """Nạp từ các khối dòng (ví dụ ``result.partitions()``) - mỗi khối chuyển thẳng thành mảng"""
+        parts: Dict[str, list] = {name: [] for name, _ in cls.COLUMNS}
+        lookups: Dict[str, Dict[Any, int]] = {name: {} for name, kind in cls.COLUMNS if kind == TEXT}
+        for rows in chunks:
+            if not rows:
+                continue
+            for (name, kind), values in zip(cls.COLUMNS, zip(*rows)):
+                parts[name].append(_to_array(kind, values, lookups.get(name)))
+        columns = {
+            name: np.concatenate(parts[name]) if parts[name] else _to_array(kind, (), lookups.get(name))
+            for name, kind in cls.COLUMNS
+        }
+        categories = {name: list(lookup) for name, lookup in lookups.items()}
+        return cls(columns, categories)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple], chunk_rows: int = CHUNK_ROWS) -> 'ColumnFrame':
+        chunk = []
+        chunks = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_rows:
+                chunks.append(chunk)
+                chunk = []
+        chunks.append(chunk)
+        return cls.from_chunks(chunks)
+
+    @classmethod
+    def from_entities(cls, entities: Sequence[Any]) -> 'ColumnFrame':
+        """Dựng từ danh sách entity đã có trong bộ nhớ (ví dụ dữ liệu đang hiển thị) - đọc theo từng cột"""
+        lookups: Dict[str, Dict[Any, int]] = {name: {} for name, kind in cls.COLUMNS if kind == TEXT}
+        columns = {
+            name: _to_array(kind, [getattr(entity, name, None) for entity in entities], lookups.get(name))
+            for name, kind in cls.COLUMNS
+        }
+        return cls(columns, {name: list(lookup) for name, lookup in lookups.items()})
+
+    # Thông tin
+    def __len__(self) -> int:
+        first = next(iter(self.columns.values()), None)
+        return 0 if first is None else len(first)
+
+    @property
+    def nbytes(self) -> int:
+        """Bộ nhớ của các mảng (không tính danh sách giá trị của cột TEXT)"""
+        return sum(array.nbytes for array in self.columns.values())
+
+    def __getitem__(self, name: str):
+        return self.columns[name]
+
+    # Lọc
+    def codes_for(self, name: str, values: Iterable[Any]) -> List[int]:
+        """Mã của các giá trị enum/chuỗi trong cột ``name`` (bỏ qua giá trị không có trong cột)"""
+        kind = self._kinds[name]
+        if kind == TEXT:
+            index = {value: code for code, value in enumerate(self.categories[name])}
+            return [index[value] for value in values if value in index]
+        if isinstance(kind, type) and issubclass(kind, Enum):
+            return [code for code in (_enum_code(kind, value) for value in values) if code != MISSING_CODE]
+        return list(values)
+
+    def mask(self, name: str, *values) -> Any:
+        """Mảng bool: dòng có cột ``name`` bằng một trong ``values``"""
+        return np.isin(self.columns[name], self.codes_for(name, values))
+
+    def between(self, name: str, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Any:
+        """Mảng bool: cột ngày nằm trong [start, end) (NaT luôn bị loại)"""
+        column = self.columns[name]
+        result = ~np.isnat(column)
+        if start is not None:
+            result &= column >= np.datetime64(start, 's')
+        if end is not None:
+            result &= column < np.datetime64(end, 's')
+        return result
+
+    def filter(self, mask) -> 'ColumnFrame':
+        """Frame mới chỉ gồm các dòng có ``mask`` True (dùng chung danh sách giá trị chuỗi)"""
+        return type(self)({name: array[mask] for name, array in self.columns.items()}, self.categories)
+
+    # Gom nhóm
+    def count_by(self, name: str, mask=None) -> Dict[Any, int]:
+        """Số dòng theo từng giá trị của cột: enum theo ``.value``, chuỗi theo giá trị, số theo số"""
+        column = self.columns[name] if mask is None else self.columns[name][mask]
+        kind = self._kinds[name]
+        if kind == TEXT or (isinstance(kind, type) and issubclass(kind, Enum)):
+            labels = self.categories[name] if kind == TEXT else [member.value for member in kind]
+            counts = np.bincount(column[column >= 0], minlength=len(labels))
+            result = {label: int(count) for label, count in zip(labels, counts) if count}
+            missing = int(np.count_nonzero(column < 0))
+            if missing:
+                result[None] = missing
+            return result
+        values, counts = np.unique(column, return_counts=True)
+        return {value.item(): int(count) for value, count in zip(values, counts)}
+
+    def count_by_period(self, name: str, unit: str = 'M', mask=None) -> Dict[str, int]:
+        """
+        Số dòng theo kỳ của cột ngày: ``unit`` là 'D' (ngày), 'W' (tuần, bắt đầu thứ Hai),
+        'M' (tháng) hoặc 'Y' (năm). Khóa là ngày đầu kỳ dạng ISO, theo thứ tự thời gian.
+        """
+        column = self.columns[name] if mask is None else self.columns[name][mask]
+        column = column[~np.isnat(column)]
+        if unit == 'W':
+            days = column.astype('datetime64[D]')
+            # 1970-01-01 là thứ Năm: lùi về thứ Hai đầu tuần
+            buckets = days - ((days.view('int64') + 3) % 7).astype('timedelta64[D]')
+        elif unit in PERIOD_UNITS:
+            buckets = column.astype(PERIOD_UNITS[unit])
+        else:
+            raise ValueError(f"Đơn vị kỳ không hợp lệ: {unit}")
+        values, counts = np.unique(buckets, return_counts=True)
+        return {str(value): int(count) for value, count in zip(values, counts)}
+
+
+def _enum_code(enum_class, value) -> int:
+    members = list(enum_class)
+    if isinstance(value, enum_class):
+        return members.index(value)
+    for code, member in enumerate(members):
+        if value == member.value or value == member.name:
+            return code
+    return MISSING_CODE
+
+
+def _to_array(kind, values: Sequence[Any], lookup: Optional[Dict[Any, int]]):
+    count = len(values)
+    if kind == ID:
+        return np.fromiter((MISSING_ID if value is None else value for value in values), dtype=np.int64, count=count)
+    if kind == FLOAT:
+        return np.fromiter((np.nan if value is None else value for value in values), dtype=np.float32, count=count)
+    if kind == PERCENT:
+        return np.fromiter((value or 0 for value in values), dtype=np.int16, count=count)
+    if kind == DATE:
+        # Trừ datetime nhanh hơn nhiều so với để NumPy tự chuyển từng đối tượng datetime
+        return np.fromiter((NAT_SECONDS if value is None else (value - EPOCH) // SECOND for value in values),
+                           dtype=np.int64, count=count).view('datetime64[s]')
+    if kind == TEXT:
+        # Mã mới được cấp theo thứ tự xuất hiện, dùng chung giữa các khối
+        return np.fromiter((MISSING_CODE if value is None else lookup.setdefault(value, len(lookup))
+                            for value in values), dtype=np.int32, count=count)
+    codes = {member: code for code, member in enumerate(kind)}
+    codes.update({member.value: code for code, member in enumerate(kind)})
+    return np.fromiter((codes.get(value, MISSING_CODE) for value in values), dtype=np.int8, count=count)
+
+
+class MemberFrame(ColumnFrame):
+    """Thành viên dạng cột"""
+
+    COLUMNS = (
+        ('id', ID), ('member_type', MemberType), ('status', MemberStatus), ('department', TEXT),
+        ('position', TEXT), ('gender', TEXT), ('date_of_birth', DATE), ('join_date', DATE), ('created_at', DATE),
+    )
+
+    def statistics(self) -> dict:
+        """Cùng khóa với MemberManagementUseCase.get_member_statistics"""
+        by_type = self.count_by('member_type')
+        by_status = self.count_by('status')
+        return {
+            'total': len(self),
+            'union_members': by_type.get(MemberType.UNION_MEMBER.value, 0),
+            'association_members': by_type.get(MemberType.ASSOCIATION_MEMBER.value, 0),
+            'executives': by_type.get(MemberType.EXECUTIVE.value, 0),
+            'active': by_status.get(MemberStatus.ACTIVE.value, 0),
+            'inactive': by_status.get(MemberStatus.INACTIVE.value, 0),
+        }
+
+
+class ReportFrame(ColumnFrame):
+    """Báo cáo dạng cột"""
+
+    COLUMNS = (
+        ('id', ID), ('report_type', ReportType), ('status', ReportStatus), ('period', TEXT),
+        ('created_by', ID), ('submitted_by', ID), ('approved_by', ID),
+        ('submitted_at', DATE), ('approved_at', DATE), ('created_at', DATE),
+    )
+
+    def statistics(self) -> dict:
+        """Cùng khóa với ReportManagementUseCase.get_report_statistics"""
+        by_status = self.count_by('status')
+        approved = by_status.get(ReportStatus.APPROVED.value, 0)
+        rejected = by_status.get(ReportStatus.REJECTED.value, 0)
+        return {
+            'total': len(self),
+            'draft': by_status.get(ReportStatus.DRAFT.value, 0),
+            'submitted': by_status.get(ReportStatus.SUBMITTED.value, 0),
+            'approved': approved,
+            'rejected': rejected,
+            'approval_rate': (approved / (approved + rejected) * 100) if (approved + rejected) > 0 else 0,
+        }
+
+
+class TaskFrame(ColumnFrame):
+    """Công việc dạng cột"""
+
+    COLUMNS = (
+        ('id', ID), ('status', TaskStatus), ('priority', TaskPriority), ('assigned_to', ID), ('assigned_by', ID),
+        ('start_date', DATE), ('due_date', DATE), ('completed_date', DATE), ('created_at', DATE),
+        ('estimated_hours', FLOAT), ('actual_hours', FLOAT), ('progress_percentage', PERCENT),
+    )
+
+    def overdue_mask(self) -> Any:
+        """Công việc quá hạn (trạng thái do job quá hạn trên server đánh dấu)"""
+        return self.mask('status', TaskStatus.OVERDUE)
+
+    def statistics(self) -> Dict[str, int]:
+        """Cùng khóa với TaskActions.get_task_statistics"""
+        by_status = self.count_by('status')
+        return {
+            'total': len(self),
+            'completed': by_status.get(TaskStatus.COMPLETED.value, 0),
+            'in_progress': by_status.get(TaskStatus.IN_PROGRESS.value, 0),
+            'pending': by_status.get(TaskStatus.NOT_STARTED.value, 0),
+            'overdue': by_status.get(TaskStatus.OVERDUE.value, 0),
+            'high_priority': int(np.count_nonzero(self.mask('priority', TaskPriority.HIGH, TaskPriority.URGENT))),
+        }
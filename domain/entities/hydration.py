@@ -0,0 +1,35 @@
+"""
+Slotted entities
+Dựng lại dataclass với __slots__ (tương đương dataclass(slots=True) của Python 3.10+, chạy được từ 3.8)
+và sinh constructor ``hydrate`` cho dòng đọc từ database
+"""
+from dataclasses import fields
+
+
+def slotted(cls):
+    """
+    Decorator đặt trên ``@dataclass``: entity không còn ``__dict__`` (nhỏ hơn, truy cập thuộc tính nhanh hơn)
+    và có ``cls.hydrate(**giá trị mọi field)`` - gán thẳng từng slot, bỏ qua giá trị mặc định và
+    ``__post_init__`` để giữ nguyên created_at/updated_at của database.
+    """
+    names = tuple(f.name for f in fields(cls))
+    namespace = dict(cls.__dict__)
+    for name in names:
+        # Giá trị mặc định đã nằm trong __init__ do dataclass sinh ra, thuộc tính cấp class sẽ đè lên slot
+        namespace.pop(name, None)
+    namespace.pop('__dict__', None)
+    namespace.pop('__weakref__', None)
+    namespace['__slots__'] = names
+    slotted_cls = type(cls)(cls.__name__, cls.__bases__, namespace)
+    slotted_cls.hydrate = classmethod(_make_hydrate(names))
+    return slotted_cls
+
+
+def _make_hydrate(names: tuple):
+    # Sinh code giống cách dataclass sinh __init__: không vòng lặp setattr, không kiểm tra mặc định
+    body = "\n".join(f"    self.{name} = {name}" for name in names) or "    pass"
+    source = (f"def hydrate(cls, *, {', '.join(names)}):\n"
+              f"    self = _new(cls)\n{body}\n    return self\n")
+    namespace = {'_new': object.__new__}
+    exec(source, namespace)
+    return namespace['hydrate']
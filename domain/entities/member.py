@@ -3,6 +3,8 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional, List
 
+from domain.entities.hydration import slotted
+
 
 class MemberType(Enum):
     """Loại thành viên"""
@@ -18,6 +20,7 @@ class MemberStatus(Enum):
     SUSPENDED = "suspended"  # Đình chỉ
 
 
+@slotted
 @dataclass
 class Member:
     """Entity cho Đoàn viên/Hội viên"""
@@ -39,9 +42,11 @@ class Member:
     updated_at: Optional[datetime] = None
 
     def __post_init__(self):
+        # Chỉ chạy khi tạo mới trong ứng dụng - dòng đọc từ database đi qua hydrate()
+        now = datetime.now()
         if self.created_at is None:
-            self.created_at = datetime.now()
-        self.updated_at = datetime.now()
+            self.created_at = now
+        self.updated_at = now
 
     def is_active(self) -> bool:
         """Kiểm tra thành viên có đang hoạt động không"""
@@ -0,0 +1,91 @@
+"""
+Report period
+Chuẩn hóa chuỗi kỳ báo cáo nhập tự do ("2024-01", "Tháng 01/2024", "Q1-2024", "Quý 1/2024", "2024-H1",
+"Năm 2024", ...) thành khoảng ngày [start, end] - dùng chung cho form báo cáo, repository và migration
+"""
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Optional, Tuple
+
+# Loại kỳ -> số tháng
+PERIOD_MONTHS = {'month': 1, 'quarter': 3, 'half': 6, 'year': 12}
+# Kỳ dài nhất (năm): kỳ giao với [start, end] phải bắt đầu sau start - MAX_PERIOD_DAYS
+MAX_PERIOD_DAYS = 366
+
+_PATTERNS = [
+    # (regex, loại kỳ, nhóm chứa năm, nhóm chứa số thứ tự tháng/quý/nửa năm)
+    (r'(\d{4})[-/.](\d{1,2})', 'month', 1, 2),
+    (r'(?:tháng|thang|t)\s*(\d{1,2})\s*[-/.]\s*(\d{4})', 'month', 2, 1),
+    (r'(\d{1,2})[-/.](\d{4})', 'month', 2, 1),
+    (r'(?:q|quý|quy)\s*([1-4])\s*[-/.\s]\s*(\d{4})', 'quarter', 2, 1),
+    (r'(\d{4})\s*[-/.\s]\s*q([1-4])', 'quarter', 1, 2),
+    (r'(\d{4})\s*[-/.\s]\s*h([12])', 'half', 1, 2),
+    (r'h([12])\s*[-/.\s]\s*(\d{4})', 'half', 2, 1),
+    (r'(?:năm|nam)?\s*(\d{4})', 'year', 1, None),
+]
+_COMPILED = [(re.compile(rf'^\s*{pattern}\s*$', re.IGNORECASE), kind, year_group, number_group)
+             for pattern, kind, year_group, number_group in _PATTERNS]
+
+
+@dataclass(frozen=True)
+class Period:
+    """Một kỳ: ``start``/``end`` là ngày đầu/ngày cuối (bao gồm) của kỳ"""
+    kind: str
+    year: int
+    number: int  # Tháng 1-12, quý 1-4, nửa năm 1-2; 1 với kỳ năm
+    start: date
+    end: date
+
+    @property
+    def label(self) -> str:
+        """Nhãn theo định dạng của nút "Tháng này/Quý này/Năm này" trên form"""
+        if self.kind == 'month':
+            return f"Tháng {self.number:02d}/{self.year}"
+        if self.kind == 'quarter':
+            return f"Quý {self.number}/{self.year}"
+        if self.kind == 'half':
+            return f"{self.year}-H{self.number}"
+        return f"Năm {self.year}"
+
+    def bounds(self) -> Tuple[datetime, datetime]:
+        """[đầu kỳ, đầu kỳ sau) dạng datetime cho lọc theo cột thời gian"""
+        return (datetime.combine(self.start, datetime.min.time()),
+                datetime.combine(self.end + timedelta(days=1), datetime.min.time()))
+
+
+def make_period(kind: str, year: int, number: int = 1) -> Period:
+    """Kỳ thứ ``number`` (tháng/quý/nửa năm) của năm ``year``"""
+    if kind not in PERIOD_MONTHS:
+        raise ValueError(f"Loại kỳ không hợp lệ: {kind}")
+    months = PERIOD_MONTHS[kind]
+    if not 1 <= number <= 12 // months:
+        raise ValueError(f"Kỳ {kind} số {number} không hợp lệ")
+    first_month = (number - 1) * months + 1
+    start = date(year, first_month, 1)
+    after = first_month + months
+    end = date(year + (after - 1) // 12, (after - 1) % 12 + 1, 1) - timedelta(days=1)
+    return Period(kind, year, number, start, end)
+
+
+def current_period(kind: str, at: Optional[datetime] = None) -> Period:
+    """Kỳ loại ``kind`` (month/quarter/half/year) chứa thời điểm ``at`` (mặc định bây giờ)"""
+    at = at or datetime.now()
+    return make_period(kind, at.year, (at.month - 1) // PERIOD_MONTHS[kind] + 1)
+
+
+def parse_period(text: Optional[str]) -> Optional[Period]:
+    """Kỳ của chuỗi nhập tự do, None nếu không nhận ra (VD: "2023-Special")"""
+    if not text:
+        return None
+    for pattern, kind, year_group, number_group in _COMPILED:
+        match = pattern.match(text)
+        if match is None:
+            continue
+        year = int(match.group(year_group))
+        number = int(match.group(number_group)) if number_group else 1
+        try:
+            return make_period(kind, year, number)
+        except ValueError:
+            return None
+    return None
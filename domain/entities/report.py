@@ -3,6 +3,8 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
+from domain.entities.hydration import slotted
+
 
 class ReportType(Enum):
     """Loại báo cáo"""
@@ -20,6 +22,7 @@ class ReportStatus(Enum):
     REJECTED = "rejected"  # Từ chối
 
 
+@slotted
 @dataclass
 class Report:
     """Entity cho Báo cáo"""
@@ -40,9 +43,11 @@ class Report:
     updated_at: Optional[datetime] = None
 
     def __post_init__(self):
+        # Chỉ chạy khi tạo mới trong ứng dụng - dòng đọc từ database đi qua hydrate()
+        now = datetime.now()
         if self.created_at is None:
-            self.created_at = datetime.now()
-        self.updated_at = datetime.now()
+            self.created_at = now
+        self.updated_at = now
 
     def submit(self, submitted_by_id: int):
         """Nộp báo cáo"""
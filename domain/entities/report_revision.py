@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from domain.entities.hydration import slotted
+
+
+@slotted
+@dataclass
+class ReportRevision:
+    """Entity cho một phiên bản nội dung báo cáo"""
+    id: Optional[int] = None
+    report_id: Optional[int] = None
+    revision: int = 1  # Số phiên bản, tăng dần từ 1 trong mỗi báo cáo
+    is_snapshot: bool = True  # True: ``data`` là toàn văn; False: delta so với phiên bản trước
+    data: Optional[str] = None  # None khi chỉ đọc metadata (danh sách phiên bản)
+    content_length: int = 0
+    content_sha256: str = ""  # Hash toàn văn - so trùng không cần dựng lại nội dung
+    created_by: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+    def __post_init__(self):
+        # Chỉ chạy khi tạo mới trong ứng dụng - dòng đọc từ database đi qua hydrate()
+        if self.created_at is None:
+            self.created_at = datetime.now()
@@ -1,7 +1,9 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
+
+from domain.entities.hydration import slotted
 
 
 class TaskPriority(Enum):
@@ -22,6 +24,11 @@ class TaskStatus(Enum):
     OVERDUE = "overdue"  # Quá hạn
 
 
+# Công việc đang mở (điều kiện của index ix_tasks_open_due_date): job quá hạn đánh dấu, bộ nhắc hạn theo dõi
+OPEN_STATUSES = (TaskStatus.NOT_STARTED, TaskStatus.IN_PROGRESS, TaskStatus.ON_HOLD)
+
+
+@slotted
 @dataclass
 class Task:
     """Entity cho Công việc"""
@@ -43,9 +50,11 @@ class Task:
     updated_at: Optional[datetime] = None
 
     def __post_init__(self):
+        # Chỉ chạy khi tạo mới trong ứng dụng - dòng đọc từ database đi qua hydrate()
+        now = datetime.now()
         if self.created_at is None:
-            self.created_at = datetime.now()
-        self.updated_at = datetime.now()
+            self.created_at = now
+        self.updated_at = now
 
     def start_task(self):
         """Bắt đầu công việc"""
@@ -82,14 +91,38 @@ class Task:
             self.updated_at = datetime.now()
 
     def is_overdue(self) -> bool:
-        """Kiểm tra công việc có quá hạn không"""
-        if self.due_date is None or self.status in [TaskStatus.COMPLETED, TaskStatus.CANCELLED]:
-            return False
-        return datetime.now() > self.due_date
+        """Kiểm tra công việc có quá hạn không (trạng thái do job quá hạn trên server đánh dấu)"""
+        return self.status == TaskStatus.OVERDUE
 
     def get_days_remaining(self) -> Optional[int]:
         """Lấy số ngày còn lại"""
         if self.due_date is None:
             return None
         delta = self.due_date - datetime.now()
-        return delta.days
\ No newline at end of file
+        return delta.days
+
+
+@dataclass
+class Workload:
+    """Số lượng theo nhóm và (trừ chế độ chỉ đếm) danh sách công việc của từng nhóm"""
+    assigned_to_me: int = 0
+    created_by_me: int = 0
+    overdue: int = 0
+    upcoming: int = 0
+    in_progress: int = 0
+    overdue_tasks: List[Task] = field(default_factory=list)
+    upcoming_tasks: List[Task] = field(default_factory=list)
+    in_progress_tasks: List[Task] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        """Cùng khóa với TaskManagementUseCase.get_my_tasks trước đây"""
+        return {
+            'assigned_to_me': self.assigned_to_me,
+            'created_by_me': self.created_by_me,
+            'overdue': self.overdue,
+            'upcoming': self.upcoming,
+            'in_progress': self.in_progress,
+            'overdue_tasks': self.overdue_tasks,
+            'upcoming_tasks': self.upcoming_tasks,
+            'in_progress_tasks': self.in_progress_tasks,
+        }
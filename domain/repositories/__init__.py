@@ -1,9 +1,13 @@
 from .member_repository import IMemberRepository
 from .report_repository import IReportRepository  
 from .task_repository import ITaskRepository
+from .attachment_repository import IAttachmentRepository
+from .report_revision_repository import IReportRevisionRepository
 
 __all__ = [
     'IMemberRepository',
     'IReportRepository',
-    'ITaskRepository'
+    'ITaskRepository',
+    'IAttachmentRepository',
+    'IReportRevisionRepository'
 ]
\ No newline at end of file
@@ -0,0 +1,37 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Set
+from domain.entities.attachment import Attachment
+
+
+class IAttachmentRepository(ABC):
+    """Interface cho Attachment Repository (metadata file đính kèm)"""
+    
+    @abstractmethod
+    def create(self, attachment: Attachment) -> Attachment:
+        """Ghi metadata file đính kèm"""
+        pass
+    
+    @abstractmethod
+    def get_by_id(self, attachment_id: int) -> Optional[Attachment]:
+        """Lấy file đính kèm theo ID"""
+        pass
+    
+    @abstractmethod
+    def get_by_report(self, report_id: int) -> List[Attachment]:
+        """Lấy các file đính kèm của một báo cáo"""
+        pass
+    
+    @abstractmethod
+    def count_by_reports(self, report_ids: Iterable[int]) -> Dict[int, int]:
+        """Đếm file đính kèm theo báo cáo (cho danh sách báo cáo)"""
+        pass
+    
+    @abstractmethod
+    def get_referenced_sha256(self, hashes: Iterable[str]) -> Set[str]:
+        """Các hash trong ``hashes`` còn file đính kèm trỏ tới (cho dọn kho nội dung)"""
+        pass
+    
+    @abstractmethod
+    def delete(self, attachment_id: int) -> bool:
+        """Xóa metadata file đính kèm"""
+        pass
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from datetime import datetime
 from domain.entities.member import Member, MemberType, MemberStatus
 
 
@@ -54,4 +55,14 @@ class IMemberRepository(ABC):
     @abstractmethod
     def count_by_type(self, member_type: MemberType) -> int:
         """Đếm số thành viên theo loại"""
+        pass
+    
+    @abstractmethod
+    def changed_since(self, watermark: Optional[datetime]) -> List[Member]:
+        """Lấy thành viên được tạo/cập nhật sau watermark (tất cả nếu None), theo updated_at tăng dần"""
+        pass
+    
+    @abstractmethod
+    def deleted_since(self, cursor: Optional[int]) -> Tuple[List[int], int]:
+        """Lấy ID thành viên đã xóa sau cursor của bảng tombstone, trả về (ids, cursor mới)"""
         pass
\ No newline at end of file
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
 from domain.entities.report import Report, ReportType, ReportStatus
 
@@ -65,4 +65,14 @@ class IReportRepository(ABC):
     @abstractmethod
     def count_by_status(self, status: ReportStatus) -> int:
         """Đếm số báo cáo theo trạng thái"""
+        pass
+    
+    @abstractmethod
+    def changed_since(self, watermark: Optional[datetime]) -> List[Report]:
+        """Lấy báo cáo được tạo/cập nhật sau watermark (tất cả nếu None), theo updated_at tăng dần"""
+        pass
+    
+    @abstractmethod
+    def deleted_since(self, cursor: Optional[int]) -> Tuple[List[int], int]:
+        """Lấy ID báo cáo đã xóa sau cursor của bảng tombstone, trả về (ids, cursor mới)"""
         pass
\ No newline at end of file
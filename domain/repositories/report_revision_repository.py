@@ -0,0 +1,32 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from domain.entities.report_revision import ReportRevision
+
+
+class IReportRevisionRepository(ABC):
+    """Interface cho Report Revision Repository"""
+    
+    @abstractmethod
+    def create(self, revision: ReportRevision) -> ReportRevision:
+        """Ghi một phiên bản mới"""
+        pass
+    
+    @abstractmethod
+    def get_latest(self, report_id: int) -> Optional[ReportRevision]:
+        """Metadata phiên bản mới nhất (không kèm data)"""
+        pass
+    
+    @abstractmethod
+    def get_chain(self, report_id: int, revision: int) -> List[ReportRevision]:
+        """Snapshot gần nhất không sau ``revision`` và các delta tới ``revision``, theo thứ tự"""
+        pass
+    
+    @abstractmethod
+    def get_by_report(self, report_id: int) -> List[ReportRevision]:
+        """Metadata các phiên bản của báo cáo (không kèm data), mới nhất trước"""
+        pass
+    
+    @abstractmethod
+    def delete_by_report(self, report_id: int) -> int:
+        """Xóa lịch sử phiên bản của báo cáo"""
+        pass
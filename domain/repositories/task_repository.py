@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
 from domain.entities.task import Task, TaskPriority, TaskStatus
 
@@ -75,4 +75,14 @@ class ITaskRepository(ABC):
     @abstractmethod
     def get_task_statistics(self) -> dict:
         """Lấy thống kê công việc"""
+        pass
+    
+    @abstractmethod
+    def changed_since(self, watermark: Optional[datetime]) -> List[Task]:
+        """Lấy công việc được tạo/cập nhật sau watermark (tất cả nếu None), theo updated_at tăng dần"""
+        pass
+    
+    @abstractmethod
+    def deleted_since(self, cursor: Optional[int]) -> Tuple[List[int], int]:
+        """Lấy ID công việc đã xóa sau cursor của bảng tombstone, trả về (ids, cursor mới)"""
         pass
\ No newline at end of file
@@ -1,9 +1,18 @@
 from .connection import DatabaseManager, db_manager, Base
-from .models import MemberModel, ReportModel, TaskModel
-from .setup import init_database, create_tables, drop_tables
+from .models import MemberModel, ReportModel, TaskModel, AttachmentModel, ReportRevisionModel, SchemaVersionModel, DeletedRecordModel
+from .schema import SCHEMA_VERSION, CHANGE_CHANNEL, get_schema_version, is_schema_current, migrate_schema, ensure_database
 
 __all__ = [
     'DatabaseManager', 'db_manager', 'Base',
-    'MemberModel', 'ReportModel', 'TaskModel',
+    'MemberModel', 'ReportModel', 'TaskModel', 'AttachmentModel', 'ReportRevisionModel', 'SchemaVersionModel', 'DeletedRecordModel',
+    'SCHEMA_VERSION', 'CHANGE_CHANNEL', 'get_schema_version', 'is_schema_current', 'migrate_schema', 'ensure_database',
     'init_database', 'create_tables', 'drop_tables'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    # setup.py chứa toàn bộ dữ liệu mẫu - chỉ import khi thực sự cần bootstrap
+    if name in ('init_database', 'create_tables', 'drop_tables'):
+        from . import setup
+        return getattr(setup, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,159 @@
+"""
+Change listener
+Nhận sự kiện thay đổi (table, id, op) từ trigger pg_notify và phân phối cho cache/tab đang mở
+"""
+import json
+import select
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from config.settings import config
+from infrastructure.database.connection import db_manager
+from infrastructure.database.schema import CHANGE_CHANNEL
+
+WATCHED_TABLES = ('members', 'reports', 'tasks')
+
+# op của sự kiện không có id: đồng bộ lại cả bảng theo delta (sau khi kết nối lại hoặc câu lệnh đổi nhiều dòng)
+OP_RESYNC = 'R'
+# Bảng bị TRUNCATE hoặc nạp hàng loạt dữ liệu cũ (generate_data): bỏ dữ liệu đã giữ, tải lại toàn bộ
+OP_RELOAD = 'T'
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """Một thay đổi dòng: op là 'I', 'U', 'D' (hoặc 'R'/'T' - đồng bộ lại/tải lại cả bảng, id None)"""
+    table: str
+    id: Optional[int]
+    op: str
+
+
+def parse_payload(payload: str) -> Optional[ChangeEvent]:
+    """Đọc payload JSON của notify_statement_change(), bỏ qua payload không hợp lệ"""
+    try:
+        data = json.loads(payload)
+        record_id = data['id']
+        return ChangeEvent(table=data['table'], id=None if record_id is None else int(record_id), op=data['op'])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+class ChangeListener:
+    """
+    Luồng LISTEN trên một kết nối psycopg riêng (tách khỏi pool, autocommit).
+
+    Sự kiện đến trong ``debounce`` giây được gom lại và gửi một lần cho mọi
+    subscriber trên luồng listener - subscriber tự chuyển việc cập nhật GUI
+    về luồng Tk. Mất kết nối thì thử lại sau ``reconnect_delay`` và phát sự
+    kiện RESYNC cho từng bảng vì thông báo trong lúc mất kết nối không được giữ.
+    """
+
+    def __init__(self, channel: str = CHANGE_CHANNEL, debounce_seconds: float = 0.2,
+                 reconnect_delay: float = 5.0):
+        self.channel = channel
+        self.debounce = debounce_seconds
+        self.reconnect_delay = reconnect_delay
+        self._subscribers: List[Callable[[List[ChangeEvent]], None]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, callback: Callable[[List[ChangeEvent]], None]):
+        """Đăng ký nhận lô sự kiện; subscriber được gọi theo thứ tự đăng ký"""
+        self._subscribers.append(callback)
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="change-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        connected_before = False
+        while not self._stop.is_set():
+            connection = None
+            try:
+                connection = self._connect()
+                if connected_before:
+                    self._dispatch([ChangeEvent(table, None, OP_RESYNC) for table in WATCHED_TABLES])
+                connected_before = True
+                self._listen(connection.driver_connection)
+            except Exception as e:
+                print(f"⚠️ Change listener lost connection: {e}")
+                self._stop.wait(self.reconnect_delay)
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+    def _connect(self):
+        # Kết nối LISTEN sống suốt phiên nên tách khỏi pool để không chiếm chỗ của truy vấn thường
+        connection = db_manager.get_engine().raw_connection()
+        connection.detach()
+        dbapi_connection = connection.driver_connection
+        dbapi_connection.autocommit = True
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"LISTEN {self.channel}")
+        cursor.close()
+        return connection
+
+    def _listen(self, dbapi_connection):
+        pending: List[ChangeEvent] = []
+        flush_at: Optional[float] = None
+        while not self._stop.is_set():
+            timeout = 1.0 if flush_at is None else max(0.0, flush_at - time.monotonic())
+            for payload in self._receive(dbapi_connection, timeout):
+                event = parse_payload(payload)
+                if event is not None:
+                    pending.append(event)
+            if pending and flush_at is None:
+                flush_at = time.monotonic() + self.debounce
+
+            if flush_at is not None and time.monotonic() >= flush_at:
+                self._dispatch(pending)
+                pending, flush_at = [], None
+
+    @staticmethod
+    def _receive(dbapi_connection, timeout: float) -> List[str]:
+        """Payload của các NOTIFY đến trong ``timeout`` giây (psycopg2 hoặc psycopg 3)"""
+        if not hasattr(dbapi_connection, 'poll'):
+            return [notify.payload for notify in dbapi_connection.notifies(timeout=timeout, stop_after=1)]
+        readable, _, _ = select.select([dbapi_connection], [], [], timeout)
+        if not readable:
+            return []
+        dbapi_connection.poll()
+        payloads = []
+        while dbapi_connection.notifies:
+            payloads.append(dbapi_connection.notifies.pop(0).payload)
+        return payloads
+
+    def _dispatch(self, events: List[ChangeEvent]):
+        for callback in list(self._subscribers):
+            try:
+                callback(events)
+            except Exception as e:
+                print(f"⚠️ Change subscriber failed: {e}")
+
+
+_listener: Optional[ChangeListener] = None
+_listener_lock = threading.Lock()
+
+
+def get_change_listener() -> Optional[ChangeListener]:
+    """Listener dùng chung của ứng dụng (chưa start), hoặc None khi CHANGE_NOTIFY_ENABLED tắt"""
+    global _listener
+    if not config.CHANGE_NOTIFY_ENABLED:
+        return None
+    with _listener_lock:
+        if _listener is None:
+            _listener = ChangeListener(
+                debounce_seconds=config.CHANGE_NOTIFY_DEBOUNCE_MS / 1000.0,
+                reconnect_delay=config.CHANGE_NOTIFY_RECONNECT_S,
+            )
+        return _listener
@@ -49,13 +49,28 @@ class DatabaseManager:
                 connection_string,
                 echo=False,  # Set True để debug SQL queries
                 pool_pre_ping=True,
-                pool_recycle=300
+                pool_recycle=300,
+                connect_args=self._connect_args()
             )
             if include_db:
+                if self.config.config.SQL_INSTRUMENTATION_ENABLED:
+                    from infrastructure.database.query_instrumentation import install_instrumentation
+                    install_instrumentation(engine)
+                if self.config.config.TRACING_ENABLED:
+                    from infrastructure.monitoring.tracing import install_sql_tracing
+                    install_sql_tracing(engine)
                 self._engine = engine
             return engine
         return self._engine
     
+    def _connect_args(self) -> dict:
+        """Tham số cho DBAPI - psycopg 3 tự prepare câu lệnh phía server sau DB_PREPARE_THRESHOLD lần chạy"""
+        if self.config.config.DB_DRIVER != 'psycopg':
+            return {}  # psycopg2 không hỗ trợ server-side prepared statement
+        threshold = self.config.config.DB_PREPARE_THRESHOLD.strip()
+        # None tắt hẳn prepare (cần khi đi qua PgBouncer ở chế độ transaction pooling)
+        return {'prepare_threshold': int(threshold) if threshold else None}
+    
     def check_database_exists(self) -> bool:
         """Kiểm tra database có tồn tại không"""
         try:
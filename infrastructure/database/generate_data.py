@@ -0,0 +1,517 @@
+"""
+Synthetic data generator cho Union Management System
+Sinh dữ liệu giả lập quy mô lớn (10k - 5M dòng) có thể tái lập theo seed, nạp vào PostgreSQL bằng COPY
+
+Ví dụ:
+    python infrastructure/database/generate_data.py --rows 100000 --seed 42 --truncate
+    python infrastructure/database/generate_data.py --members 200000 --reports 50000 --tasks 1000000
+    python infrastructure/database/generate_data.py --rows 10000 --csv-dir out/   # chỉ ghi file CSV
+"""
+import argparse
+import csv
+import io
+import os
+import random
+import sys
+import time
+import unicodedata
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+# Thêm thư mục gốc của project vào Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from domain.entities.member import MemberType, MemberStatus
+from domain.entities.period import parse_period
+from domain.entities.report import ReportType, ReportStatus
+from domain.entities.task import TaskPriority, TaskStatus
+
+
+# Tỷ lệ chia khi chỉ truyền --rows
+ROW_SPLIT = {'members': 0.4, 'reports': 0.1, 'tasks': 0.5}
+
+MIN_ROWS = 10_000
+MAX_ROWS = 5_000_000
+
+MEMBER_COLUMNS = [
+    'member_code', 'full_name', 'date_of_birth', 'gender', 'phone', 'email', 'address',
+    'position', 'department', 'member_type', 'status', 'join_date', 'notes',
+    'created_at', 'updated_at'
+]
+REPORT_COLUMNS = [
+    'title', 'report_type', 'period', 'period_start', 'period_end', 'content', 'attachments', 'status', 'created_by',
+    'submitted_by', 'submitted_at', 'approved_by', 'approved_at', 'rejection_reason',
+    'created_at', 'updated_at'
+]
+TASK_COLUMNS = [
+    'title', 'description', 'priority', 'status', 'assigned_to', 'assigned_by',
+    'start_date', 'due_date', 'completed_date', 'estimated_hours', 'actual_hours',
+    'progress_percentage', 'notes', 'created_at', 'updated_at'
+]
+
+# Họ phổ biến và tỷ lệ xấp xỉ
+FAMILY_NAMES = [
+    ("Nguyễn", 38), ("Trần", 11), ("Lê", 9.5), ("Phạm", 7), ("Hoàng", 5.1), ("Huỳnh", 5.1),
+    ("Phan", 4.5), ("Vũ", 3.9), ("Võ", 3.9), ("Đặng", 2.1), ("Bùi", 2), ("Đỗ", 1.4),
+    ("Hồ", 1.3), ("Ngô", 1.3), ("Dương", 1), ("Lý", 0.5), ("Đinh", 0.5), ("Trương", 0.5),
+]
+MALE_MIDDLE_NAMES = ["Văn", "Hữu", "Đức", "Minh", "Quang", "Thanh", "Công", "Xuân", "Gia", "Anh"]
+FEMALE_MIDDLE_NAMES = ["Thị", "Ngọc", "Thu", "Thanh", "Minh", "Phương", "Kim", "Bảo", "Hồng", "Diệu"]
+MALE_GIVEN_NAMES = [
+    "An", "Bình", "Cường", "Dũng", "Đạt", "Hải", "Hiếu", "Hoàng", "Hùng", "Huy", "Khang",
+    "Khoa", "Kiên", "Long", "Minh", "Nam", "Nghĩa", "Phong", "Phúc", "Quân", "Sơn", "Tài",
+    "Thắng", "Thành", "Trung", "Tuấn", "Việt", "Vinh", "Vũ",
+]
+FEMALE_GIVEN_NAMES = [
+    "Anh", "Chi", "Dung", "Giang", "Hà", "Hạnh", "Hằng", "Hoa", "Hương", "Lan", "Linh",
+    "Mai", "My", "Nga", "Ngân", "Nhung", "Oanh", "Phương", "Quyên", "Thảo", "Thủy", "Trang",
+    "Trinh", "Uyên", "Vân", "Vy", "Yến",
+]
+EMAIL_DOMAINS = ["gmail.com", "yahoo.com", "outlook.com", "company.com"]
+PHONE_PREFIXES = ["090", "091", "093", "094", "096", "097", "098", "032", "033", "034", "035",
+                  "070", "076", "077", "078", "081", "083", "084", "085", "086", "088", "089"]
+
+# Phòng ban và tỷ lệ quy mô
+DEPARTMENTS = [
+    ("Phòng Kinh doanh", 18), ("Phòng Kỹ thuật", 16), ("Phòng Kế toán", 9), ("Phòng Nhân sự", 7),
+    ("Phòng Marketing", 9), ("Phòng IT", 12), ("Phòng Pháp chế", 4), ("Phòng Hành chính", 8),
+    ("Phòng Sản xuất", 14), ("Ban Giám đốc", 2), ("Đoàn thanh niên", 1),
+]
+STAFF_POSITIONS = ["Nhân viên", "Chuyên viên", "Chuyên viên chính", "Kỹ sư", "Cán sự"]
+LEAD_POSITIONS = ["Trưởng phòng", "Phó phòng", "Tổ trưởng"]
+EXECUTIVE_POSITIONS = ["Bí thư Đoàn", "Phó Bí thư Đoàn", "Ủy viên BCH", "Chủ tịch Hội", "Phó Chủ tịch Hội"]
+CITIES = [("TP.HCM", 30), ("Hà Nội", 28), ("Đà Nẵng", 8), ("Hải Phòng", 7), ("Cần Thơ", 6),
+          ("Bình Dương", 7), ("Đồng Nai", 6), ("Huế", 4), ("Nha Trang", 4)]
+STREETS = ["Lê Lợi", "Trần Hưng Đạo", "Nguyễn Huệ", "Hai Bà Trưng", "Lý Thường Kiệt",
+           "Điện Biên Phủ", "Cách Mạng Tháng 8", "Nguyễn Trãi", "Võ Văn Tần", "Phan Đình Phùng"]
+
+REPORT_TOPICS = ["hoạt động Đoàn", "công tác Hội", "phong trào thanh niên", "công tác tổ chức",
+                 "tài chính", "thi đua khen thưởng", "sinh hoạt chi đoàn", "tình nguyện"]
+TASK_VERBS = ["Chuẩn bị", "Tổ chức", "Tổng hợp", "Rà soát", "Cập nhật", "Lập kế hoạch", "Báo cáo",
+              "Triển khai", "Kiểm tra", "Hoàn thiện"]
+TASK_OBJECTS = ["hồ sơ đoàn viên", "hội nghị chi đoàn", "danh sách hội viên", "kế hoạch quý",
+                "chương trình tình nguyện", "đợt sinh hoạt chuyên đề", "quỹ hội", "báo cáo thi đua",
+                "giải thể thao", "lớp bồi dưỡng cảm tình Đoàn"]
+
+
+def _weighted(rng: random.Random, weighted_items: Sequence[tuple]):
+    """Chọn ngẫu nhiên theo trọng số từ danh sách (item, weight)"""
+    items, weights = zip(*weighted_items)
+    return rng.choices(items, weights=weights)[0]
+
+
+def _ascii_slug(text: str) -> str:
+    """Bỏ dấu tiếng Việt để dùng trong email (VD: Hùng -> hung)"""
+    text = text.replace('Đ', 'D').replace('đ', 'd')
+    return unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode().lower()
+
+
+def _fmt(value) -> str:
+    """Định dạng giá trị cho CSV của COPY (chuỗi rỗng = NULL)"""
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if hasattr(value, 'name') and hasattr(value, 'value'):
+        # SQLAlchemy Enum lưu tên của enum (VD: UNION_MEMBER)
+        return value.name
+    return str(value)
+
+
+class SyntheticDataGenerator:
+    """Sinh dữ liệu members/reports/tasks có thể tái lập theo seed và mốc thời gian"""
+
+    def __init__(self, seed: int = 42, as_of: Optional[datetime] = None, code_prefix: str = "SD"):
+        self.seed = seed
+        self.as_of = as_of or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.code_prefix = code_prefix
+        # Thông tin thành viên đã sinh, dùng để giao việc/nộp báo cáo nhất quán
+        self.member_departments: List[int] = []
+        self.executive_indexes: List[int] = []
+
+    def _rng(self, table: str) -> random.Random:
+        # Mỗi bảng có stream riêng để số dòng của bảng này không làm thay đổi dữ liệu bảng khác
+        return random.Random(f"{self.seed}:{table}")
+
+    def _random_datetime(self, rng: random.Random, start: datetime, end: datetime) -> datetime:
+        span = max((end - start).total_seconds(), 1)
+        return start + timedelta(seconds=int(rng.random() * span))
+
+    # Members
+    def generate_members(self, count: int) -> Iterator[list]:
+        rng = self._rng('members')
+        departments = [name for name, _ in DEPARTMENTS]
+        department_weights = [weight for _, weight in DEPARTMENTS]
+        self.member_departments = []
+        self.executive_indexes = []
+
+        for index in range(count):
+            is_male = rng.random() < 0.52
+            family = _weighted(rng, FAMILY_NAMES)
+            middle = rng.choice(MALE_MIDDLE_NAMES if is_male else FEMALE_MIDDLE_NAMES)
+            given = rng.choice(MALE_GIVEN_NAMES if is_male else FEMALE_GIVEN_NAMES)
+            full_name = f"{family} {middle} {given}"
+
+            # Tuổi tập trung quanh 28, trong khoảng 18-60
+            age_years = rng.triangular(18, 60, 28)
+            date_of_birth = self.as_of - timedelta(days=int(age_years * 365.25))
+            join_date = self._random_datetime(
+                rng, max(date_of_birth + timedelta(days=16 * 365), self.as_of - timedelta(days=15 * 365)),
+                self.as_of - timedelta(days=1)
+            )
+
+            department_index = rng.choices(range(len(departments)), weights=department_weights)[0]
+            roll = rng.random()
+            if roll < 0.04:
+                member_type = MemberType.EXECUTIVE
+                position = rng.choice(EXECUTIVE_POSITIONS)
+                self.executive_indexes.append(index)
+            elif roll < 0.35:
+                member_type = MemberType.ASSOCIATION_MEMBER
+                position = rng.choice(LEAD_POSITIONS if rng.random() < 0.1 else STAFF_POSITIONS)
+            else:
+                member_type = MemberType.UNION_MEMBER
+                position = rng.choice(LEAD_POSITIONS if rng.random() < 0.05 else STAFF_POSITIONS)
+            self.member_departments.append(department_index)
+
+            status_roll = rng.random()
+            status = (MemberStatus.ACTIVE if status_roll < 0.88 else
+                      MemberStatus.INACTIVE if status_roll < 0.97 else MemberStatus.SUSPENDED)
+
+            email = f"{_ascii_slug(given)}.{index}@{rng.choice(EMAIL_DOMAINS)}" if rng.random() < 0.9 else None
+            phone = f"{rng.choice(PHONE_PREFIXES)}{rng.randrange(10**7):07d}" if rng.random() < 0.95 else None
+            address = (f"{rng.randint(1, 999)} Đường {rng.choice(STREETS)}, "
+                       f"{_weighted(rng, CITIES)}") if rng.random() < 0.8 else None
+
+            created_at = join_date
+            updated_at = self._random_datetime(rng, created_at, self.as_of)
+
+            yield [
+                f"{self.code_prefix}{index:07d}", full_name, date_of_birth.replace(hour=0, minute=0, second=0),
+                "Nam" if is_male else "Nữ", phone, email, address, position,
+                departments[department_index], member_type, status,
+                join_date.replace(hour=0, minute=0, second=0), None, created_at, updated_at
+            ]
+
+    # Reports
+    @staticmethod
+    def _period_for(rng: random.Random, report_type: ReportType, moment: datetime) -> str:
+        """Sinh chuỗi kỳ báo cáo theo các định dạng đang có trong hệ thống"""
+        quarter = (moment.month - 1) // 3 + 1
+        form_style = rng.random() < 0.3  # Định dạng của nút "Tháng này/Quý này/Năm này" trên form
+        if report_type == ReportType.MONTHLY:
+            return f"Tháng {moment.month:02d}/{moment.year}" if form_style else f"{moment.year}-{moment.month:02d}"
+        if report_type == ReportType.QUARTERLY:
+            return f"Quý {quarter}/{moment.year}" if form_style else f"Q{quarter}-{moment.year}"
+        if report_type == ReportType.ANNUAL:
+            return f"Năm {moment.year}" if form_style else f"{moment.year}"
+        return f"{moment.year}-H{1 if moment.month <= 6 else 2}" if rng.random() < 0.5 else f"{moment.year}-Special"
+
+    def generate_reports(self, count: int, member_ids: Sequence[int]) -> Iterator[list]:
+        rng = self._rng('reports')
+        executives = [member_ids[i] for i in self.executive_indexes if i < len(member_ids)] or list(member_ids[:1])
+        start = self.as_of - timedelta(days=3 * 365)
+
+        for index in range(count):
+            report_type = _weighted(rng, [(ReportType.MONTHLY, 60), (ReportType.QUARTERLY, 25),
+                                          (ReportType.ANNUAL, 8), (ReportType.SPECIAL, 7)])
+            period_moment = self._random_datetime(rng, start, self.as_of)
+            period = self._period_for(rng, report_type, period_moment)
+            parsed = parse_period(period)
+
+            # Báo cáo được tạo ngay sau kỳ báo cáo
+            created_at = min(period_moment + timedelta(days=rng.randint(0, 20), hours=rng.randint(8, 17)), self.as_of)
+            age_days = (self.as_of - created_at).days
+            author = rng.choice(member_ids) if member_ids else None
+
+            # Báo cáo cũ phần lớn đã được duyệt
+            roll = rng.random()
+            if age_days > 60:
+                status = (ReportStatus.APPROVED if roll < 0.85 else
+                          ReportStatus.REJECTED if roll < 0.95 else ReportStatus.SUBMITTED)
+            else:
+                status = (ReportStatus.DRAFT if roll < 0.35 else ReportStatus.SUBMITTED if roll < 0.75 else
+                          ReportStatus.APPROVED if roll < 0.93 else ReportStatus.REJECTED)
+
+            submitted_by = submitted_at = approved_by = approved_at = None
+            rejection_reason = None
+            if status != ReportStatus.DRAFT:
+                submitted_by = author
+                submitted_at = min(created_at + timedelta(days=rng.randint(0, 5), hours=rng.randint(0, 8)), self.as_of)
+            if status in (ReportStatus.APPROVED, ReportStatus.REJECTED):
+                approved_by = rng.choice(executives) if executives else None
+                approved_at = min(submitted_at + timedelta(days=rng.randint(1, 10)), self.as_of)
+            if status == ReportStatus.REJECTED:
+                rejection_reason = rng.choice(["Thiếu số liệu", "Cần bổ sung minh chứng", "Sai biểu mẫu"])
+            updated_at = approved_at or submitted_at or created_at
+
+            topic = rng.choice(REPORT_TOPICS)
+            paragraphs = rng.randint(2, 8)
+            content = "\n".join(
+                f"{p + 1}. Tình hình {topic} trong kỳ {period}: đã triển khai {rng.randint(1, 20)} hoạt động, "
+                f"thu hút {rng.randint(10, 500)} lượt tham gia."
+                for p in range(paragraphs)
+            )
+
+            yield [
+                f"Báo cáo {topic} {period}", report_type, period,
+                parsed.start if parsed else None, parsed.end if parsed else None, content, None, status, author,
+                submitted_by, submitted_at, approved_by, approved_at, rejection_reason,
+                created_at, updated_at
+            ]
+
+    # Tasks
+    def generate_tasks(self, count: int, member_ids: Sequence[int]) -> Iterator[list]:
+        rng = self._rng('tasks')
+        executive_indexes = [i for i in self.executive_indexes if i < len(member_ids)] or [0]
+        start = self.as_of - timedelta(days=2 * 365)
+
+        # Nhóm thành viên theo phòng ban để phần lớn việc được giao trong cùng phòng
+        by_department = {}
+        for member_index, department_index in enumerate(self.member_departments[:len(member_ids)]):
+            by_department.setdefault(department_index, []).append(member_index)
+
+        for index in range(count):
+            created_at = self._random_datetime(rng, start, self.as_of)
+            # Thời hạn 3 - 60 ngày, phần lớn khoảng 2 tuần
+            due_date = created_at + timedelta(days=int(rng.triangular(3, 60, 14)))
+            start_date = created_at + timedelta(days=rng.randint(0, 3))
+            priority = _weighted(rng, [(TaskPriority.LOW, 20), (TaskPriority.MEDIUM, 45),
+                                       (TaskPriority.HIGH, 27), (TaskPriority.URGENT, 8)])
+            estimated_hours = round(min(rng.lognormvariate(2.3, 0.7), 200), 1)
+
+            roll = rng.random()
+            completed_date = None
+            actual_hours = 0.0
+            if due_date < self.as_of:
+                # Việc đã hết hạn: phần lớn hoàn thành, số còn lại chưa xong
+                if roll < 0.78:
+                    status = TaskStatus.COMPLETED
+                elif roll < 0.84:
+                    status = TaskStatus.CANCELLED
+                elif roll < 0.88:
+                    status = TaskStatus.ON_HOLD
+                else:
+                    status = TaskStatus.IN_PROGRESS
+            else:
+                status = (TaskStatus.NOT_STARTED if roll < 0.35 else TaskStatus.IN_PROGRESS if roll < 0.8 else
+                          TaskStatus.COMPLETED if roll < 0.93 else TaskStatus.ON_HOLD)
+
+            if status == TaskStatus.COMPLETED:
+                completed_date = min(self._random_datetime(rng, start_date, due_date + timedelta(days=7)), self.as_of)
+                start_date = min(start_date, completed_date)
+                actual_hours = round(estimated_hours * rng.lognormvariate(0.1, 0.35), 1)
+                progress = 100
+            elif status == TaskStatus.NOT_STARTED:
+                progress = 0
+            else:
+                progress = rng.randrange(5, 100, 5)
+                actual_hours = round(estimated_hours * progress / 100 * rng.uniform(0.7, 1.5), 1)
+
+            assigned_to = assigned_by = None
+            if member_ids:
+                assigner_index = (rng.choice(executive_indexes) if rng.random() < 0.7
+                                  else rng.randrange(len(member_ids)))
+                colleagues = (by_department.get(self.member_departments[assigner_index])
+                              if assigner_index < len(self.member_departments) else None)
+                assignee_index = (rng.choice(colleagues) if colleagues and rng.random() < 0.8
+                                  else rng.randrange(len(member_ids)))
+                assigned_by = member_ids[assigner_index]
+                assigned_to = member_ids[assignee_index]
+            updated_at = completed_date or self._random_datetime(rng, created_at, self.as_of)
+
+            title = f"{rng.choice(TASK_VERBS)} {rng.choice(TASK_OBJECTS)}"
+            yield [
+                title, f"{title} - đợt {index % 12 + 1}", priority, status, assigned_to, assigned_by,
+                start_date, due_date, completed_date, estimated_hours, actual_hours, progress, None,
+                created_at, updated_at
+            ]
+
+
+class CsvRowStream(io.TextIOBase):
+    """File-like object sinh CSV theo yêu cầu - COPY đọc dần mà không cần giữ toàn bộ dữ liệu trong bộ nhớ"""
+
+    def __init__(self, rows: Iterable[list], batch_size: int = 1000):
+        self._rows = iter(rows)
+        self._batch_size = batch_size
+        self._pending = ''
+        self._exhausted = False
+        self.row_count = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def _fill(self):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        for _ in range(self._batch_size):
+            try:
+                row = next(self._rows)
+            except StopIteration:
+                self._exhausted = True
+                break
+            writer.writerow([_fmt(value) for value in row])
+            self.row_count += 1
+        self._pending += buffer.getvalue()
+
+    def read(self, size: int = -1) -> str:
+        while not self._exhausted and (size is None or size < 0 or len(self._pending) < size):
+            self._fill()
+        if size is None or size < 0:
+            chunk, self._pending = self._pending, ''
+        else:
+            chunk, self._pending = self._pending[:size], self._pending[size:]
+        return chunk
+
+    def readline(self, size: int = -1) -> str:
+        while not self._exhausted and '\n' not in self._pending:
+            self._fill()
+        end = self._pending.find('\n') + 1 or len(self._pending)
+        line, self._pending = self._pending[:end], self._pending[end:]
+        return line
+
+
+def copy_rows(cursor, table: str, columns: List[str], rows: Iterable[list]) -> int:
+    """Nạp rows vào bảng bằng COPY FROM STDIN (CSV)"""
+    stream = CsvRowStream(rows)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", stream)
+    return stream.row_count
+
+
+def write_csv(path: str, columns: List[str], rows: Iterable[list]) -> int:
+    """Ghi rows ra file CSV (có header) thay vì nạp vào database"""
+    stream = CsvRowStream(rows)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(','.join(columns) + '\n')
+        while True:
+            chunk = stream.read(1 << 16)
+            if not chunk:
+                break
+            f.write(chunk)
+    return stream.row_count
+
+
+def resolve_counts(rows: Optional[int], members: Optional[int], reports: Optional[int],
+                   tasks: Optional[int]) -> dict:
+    """Tính số dòng mỗi bảng từ --rows hoặc các tham số riêng lẻ"""
+    counts = {}
+    for table, explicit in (('members', members), ('reports', reports), ('tasks', tasks)):
+        if explicit is not None:
+            counts[table] = explicit
+        elif rows is not None:
+            counts[table] = int(rows * ROW_SPLIT[table])
+        else:
+            counts[table] = int(MIN_ROWS * ROW_SPLIT[table])
+
+    total = sum(counts.values())
+    if not (MIN_ROWS <= total <= MAX_ROWS):
+        print(f"⚠️ Total rows {total:,} is outside the recommended range {MIN_ROWS:,} - {MAX_ROWS:,}")
+    if counts['members'] <= 0 and (counts['reports'] or counts['tasks']):
+        raise ValueError("Cần ít nhất một thành viên để sinh báo cáo/công việc")
+    return counts
+
+
+def generate_to_csv(generator: SyntheticDataGenerator, counts: dict, csv_dir: str) -> dict:
+    """Sinh dữ liệu ra thư mục CSV; member ID giả định bắt đầu từ 1"""
+    os.makedirs(csv_dir, exist_ok=True)
+    member_ids = range(1, counts['members'] + 1)
+    written = {
+        'members': write_csv(os.path.join(csv_dir, 'members.csv'), MEMBER_COLUMNS,
+                             generator.generate_members(counts['members']))
+    }
+    written['reports'] = write_csv(os.path.join(csv_dir, 'reports.csv'), REPORT_COLUMNS,
+                                   generator.generate_reports(counts['reports'], member_ids))
+    written['tasks'] = write_csv(os.path.join(csv_dir, 'tasks.csv'), TASK_COLUMNS,
+                                 generator.generate_tasks(counts['tasks'], member_ids))
+    return written
+
+
+def generate_to_database(generator: SyntheticDataGenerator, counts: dict, truncate: bool = False) -> dict:
+    """Sinh dữ liệu và nạp thẳng vào PostgreSQL bằng COPY trong một transaction"""
+    from infrastructure.database.change_listener import OP_RELOAD
+    from infrastructure.database.connection import db_manager
+    from infrastructure.database.schema import CHANGE_CHANNEL
+
+    raw_connection = db_manager.get_engine().raw_connection()
+    try:
+        cursor = raw_connection.cursor()
+        if truncate:
+            print("⚠️ Truncating members, reports, tasks, attachments, report_revisions, deleted_records...")
+            # Đính kèm và lịch sử phiên bản trỏ theo report_id - ID bắt đầu lại từ 1 nên phải xóa cùng
+            # (nội dung đính kèm trong kho được collect_attachment_garbage dọn sau)
+            cursor.execute("TRUNCATE members, reports, tasks, attachments, report_revisions RESTART IDENTITY")
+            # Tombstone của dòng cũ không còn nghĩa; giữ sequence để cursor deleted_since của client vẫn đúng
+            cursor.execute("TRUNCATE deleted_records")
+
+        written = {'members': copy_rows(cursor, 'members', MEMBER_COLUMNS,
+                                        generator.generate_members(counts['members']))}
+
+        # COPY trong một session lấy id liên tiếp từ sequence
+        cursor.execute(
+            "SELECT MIN(id), MAX(id), COUNT(*) FROM members WHERE member_code LIKE %s",
+            (f"{generator.code_prefix}%",)
+        )
+        min_id, max_id, generated = cursor.fetchone()
+        if generated and max_id - min_id + 1 != generated:
+            raise RuntimeError("Member IDs are not contiguous - rerun with --truncate or a new --code-prefix")
+        member_ids = range(min_id, max_id + 1) if generated else range(0)
+
+        written['reports'] = copy_rows(cursor, 'reports', REPORT_COLUMNS,
+                                       generator.generate_reports(counts['reports'], member_ids))
+        written['tasks'] = copy_rows(cursor, 'tasks', TASK_COLUMNS,
+                                     generator.generate_tasks(counts['tasks'], member_ids))
+
+        cursor.execute("ANALYZE members")
+        cursor.execute("ANALYZE reports")
+        cursor.execute("ANALYZE tasks")
+        # Dòng sinh ra có updated_at trong quá khứ nên sync theo watermark không thấy: báo client tải lại cả bảng
+        # (gửi khi commit, cùng lúc với sự kiện của trigger)
+        for table in ('members', 'reports', 'tasks'):
+            cursor.execute("SELECT pg_notify(%s, json_build_object('table', %s, 'id', NULL, 'op', %s)::text)",
+                           (CHANGE_CHANNEL, table, OP_RELOAD))
+        raw_connection.commit()
+        return written
+    except Exception:
+        raw_connection.rollback()
+        raise
+    finally:
+        raw_connection.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Sinh dữ liệu giả lập quy mô lớn cho load/scaling test")
+    parser.add_argument("--rows", type=int, help="Tổng số dòng (chia 40%% members, 10%% reports, 50%% tasks)")
+    parser.add_argument("--members", type=int, help="Số thành viên")
+    parser.add_argument("--reports", type=int, help="Số báo cáo")
+    parser.add_argument("--tasks", type=int, help="Số công việc")
+    parser.add_argument("--seed", type=int, default=42, help="Seed để tái lập dữ liệu (mặc định 42)")
+    parser.add_argument("--as-of", help="Mốc thời gian 'hiện tại' YYYY-MM-DD (mặc định hôm nay)")
+    parser.add_argument("--code-prefix", default="SD", help="Tiền tố mã thành viên (mặc định SD)")
+    parser.add_argument("--truncate", action="store_true", help="Xóa dữ liệu cũ trước khi nạp")
+    parser.add_argument("--csv-dir", help="Chỉ ghi file CSV vào thư mục này, không nạp database")
+    args = parser.parse_args(argv)
+
+    as_of = datetime.strptime(args.as_of, "%Y-%m-%d") if args.as_of else None
+    counts = resolve_counts(args.rows, args.members, args.reports, args.tasks)
+    generator = SyntheticDataGenerator(seed=args.seed, as_of=as_of, code_prefix=args.code_prefix)
+
+    print(f"📊 Generating {counts['members']:,} members, {counts['reports']:,} reports, "
+          f"{counts['tasks']:,} tasks (seed={args.seed}, as-of={generator.as_of:%Y-%m-%d})")
+    started = time.perf_counter()
+
+    if args.csv_dir:
+        written = generate_to_csv(generator, counts, args.csv_dir)
+    else:
+        # Load environment variables
+        from dotenv import load_dotenv
+        load_dotenv()
+        written = generate_to_database(generator, counts, truncate=args.truncate)
+
+    elapsed = time.perf_counter() - started
+    total = sum(written.values())
+    print(f"✅ Wrote {total:,} rows in {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f} rows/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
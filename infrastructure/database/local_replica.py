@@ -0,0 +1,307 @@
+"""
+Local read replica
+Bản sao SQLite (sqlite3 của stdlib) của members/reports/tasks để duyệt danh sách không phải chờ PostgreSQL
+"""
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Type
+
+from sqlalchemy import (
+    Column, DateTime, Integer, MetaData, String, Table, and_, create_engine, delete, event, func, inspect, or_, select
+)
+from sqlalchemy.orm import sessionmaker
+
+from config.settings import config
+from infrastructure.database.change_listener import OP_RELOAD
+from infrastructure.database.connection import db_manager
+from infrastructure.database.models import DeletedRecordModel, MemberModel, ReportModel, TaskModel
+
+REPLICATED_MODELS = (MemberModel, ReportModel, TaskModel)
+
+# Bảng watermark chỉ tồn tại trong SQLite, không thuộc Base.metadata của PostgreSQL
+_sync_metadata = MetaData()
+sync_state_table = Table(
+    "replica_sync_state", _sync_metadata,
+    Column("table_name", String(50), primary_key=True),
+    Column("last_updated_at", DateTime),
+    Column("last_id", Integer, nullable=False, default=0),
+    Column("synced_at", DateTime),
+)
+
+
+class LocalReplica:
+    """
+    SQLite replica dùng cùng SQLAlchemy models với PostgreSQL.
+
+    ``sync()`` kéo các dòng có ``(updated_at, id)`` lớn hơn watermark đã lưu
+    theo từng lô và upsert vào SQLite. ``updated_at`` do client ghi nên mỗi lần
+    sync đọc lùi lại ``overlap`` để không bỏ sót dòng của client lệch đồng hồ
+    hoặc transaction commit muộn; upsert là idempotent nên đọc trùng không sao.
+
+    Đối tượng có ``get_session()`` như ``db_manager`` để các repository hiện có
+    đọc thẳng từ replica.
+    """
+
+    def __init__(self, path: str, batch_size: int = 5000, overlap_seconds: int = 60, max_refresh_ids: int = 1000):
+        self.path = path
+        self.batch_size = batch_size
+        self.max_refresh_ids = max_refresh_ids
+        self.overlap = timedelta(seconds=overlap_seconds)
+        self._sync_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.engine = create_engine(
+            f"sqlite:///{path}",
+            connect_args={"check_same_thread": False, "timeout": 30},
+        )
+        event.listen(self.engine, "connect", self._on_connect)
+        self._session_factory = sessionmaker(bind=self.engine)
+
+        sync_state_table.create(self.engine, checkfirst=True)
+        self._drop_outdated_tables()
+        for model in REPLICATED_MODELS + (DeletedRecordModel,):
+            model.__table__.create(self.engine, checkfirst=True)
+
+        # Replica từ phiên trước đã có đủ watermark thì phục vụ đọc ngay, sync chạy sau
+        if self._synced_tables() >= {model.__tablename__ for model in REPLICATED_MODELS + (DeletedRecordModel,)}:
+            self._ready.set()
+
+    def _drop_outdated_tables(self):
+        """Bảng replica thiếu cột mới của model (schema PostgreSQL đã nâng cấp) được tạo lại và sync toàn bộ"""
+        inspector = inspect(self.engine)
+        existing = set(inspector.get_table_names())
+        for model in REPLICATED_MODELS + (DeletedRecordModel,):
+            table = model.__table__
+            if table.name not in existing:
+                continue
+            columns = {column['name'] for column in inspector.get_columns(table.name)}
+            if {column.name for column in table.columns} <= columns:
+                continue
+            print(f"🔄 Local replica: {table.name} schema changed, resyncing")
+            table.drop(self.engine)
+            with self.engine.begin() as conn:
+                conn.execute(delete(sync_state_table).where(sync_state_table.c.table_name == table.name))
+
+    @staticmethod
+    def _on_connect(dbapi_connection, connection_record):
+        # WAL cho phép GUI đọc trong khi luồng sync đang ghi
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+    # Giao diện giống db_manager
+    def get_session(self):
+        """Tạo session tới SQLite replica"""
+        return self._session_factory()
+
+    @property
+    def is_ready(self) -> bool:
+        """Replica đã sync đầy đủ ít nhất một lần (trước đó repository đọc từ PostgreSQL)"""
+        return self._ready.is_set()
+
+    # Đồng bộ
+    def sync(self) -> Dict[str, int]:
+        """Kéo thay đổi từ PostgreSQL cho tất cả bảng, trả về số dòng đã áp dụng mỗi bảng"""
+        with self._sync_lock:
+            applied = {DeletedRecordModel.__tablename__: self._sync_deletions()}
+            applied.update({model.__tablename__: self._sync_table(model.__table__) for model in REPLICATED_MODELS})
+        self._ready.set()
+        return applied
+
+    def _synced_tables(self) -> set:
+        with self.engine.connect() as conn:
+            return set(conn.execute(select(sync_state_table.c.table_name)).scalars())
+
+    def _get_watermark(self, table_name: str):
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                select(sync_state_table.c.last_updated_at, sync_state_table.c.last_id)
+                .where(sync_state_table.c.table_name == table_name)
+            ).first()
+        return (row.last_updated_at, row.last_id) if row else None
+
+    def _set_watermark(self, conn, table_name: str, updated_at: datetime, last_id: int):
+        conn.execute(sync_state_table.insert().prefix_with("OR REPLACE").values(
+            table_name=table_name, last_updated_at=updated_at, last_id=last_id, synced_at=datetime.now()
+        ))
+
+    def _sync_table(self, table: Table) -> int:
+        watermark = self._get_watermark(table.name)
+        last_updated_at, last_id = watermark or (None, 0)
+        if last_updated_at is not None:
+            # Đọc lùi một khoảng overlap, bắt đầu lại từ id 0 trong khoảng đó
+            last_updated_at, last_id = last_updated_at - self.overlap, 0
+
+        applied = 0
+        with db_manager.get_engine().connect() as source:
+            while True:
+                query = select(table).order_by(table.c.updated_at, table.c.id).limit(self.batch_size)
+                if last_updated_at is not None:
+                    query = query.where(or_(
+                        table.c.updated_at > last_updated_at,
+                        and_(table.c.updated_at == last_updated_at, table.c.id > last_id),
+                    ))
+                rows = [dict(row._mapping) for row in source.execute(query)]
+                if not rows:
+                    break
+
+                last_updated_at, last_id = rows[-1]['updated_at'], rows[-1]['id']
+                with self.engine.begin() as conn:
+                    conn.execute(table.insert().prefix_with("OR REPLACE"), rows)
+                    self._set_watermark(conn, table.name, last_updated_at, last_id)
+                applied += len(rows)
+
+                if len(rows) < self.batch_size:
+                    break
+
+        if watermark is None and not applied:
+            # Bảng rỗng vẫn được đánh dấu đã sync
+            with self.engine.begin() as conn:
+                self._set_watermark(conn, table.name, None, 0)
+        return applied
+
+    def sync_deletions(self) -> int:
+        """Chỉ đồng bộ tombstone (gọi ngay sau khi xóa để feed deleted_since local có bản ghi đó)"""
+        with self._sync_lock:
+            return self._sync_deletions()
+
+    def _sync_deletions(self) -> int:
+        tombstones = DeletedRecordModel.__table__
+        watermark = self._get_watermark(tombstones.name)
+        with db_manager.get_engine().connect() as source:
+            if watermark is None:
+                # Lần đầu: chỉ đặt cursor, bảng dữ liệu sắp được tải đầy đủ nên lịch sử xóa không cần
+                latest = source.execute(select(func.max(tombstones.c.id))).scalar() or 0
+                with self.engine.begin() as conn:
+                    self._set_watermark(conn, tombstones.name, None, latest)
+                return 0
+
+            last_id, applied = watermark[1], 0
+            while True:
+                rows = [dict(row._mapping) for row in source.execute(
+                    select(tombstones).where(tombstones.c.id > last_id)
+                    .order_by(tombstones.c.id).limit(self.batch_size)
+                )]
+                if not rows:
+                    break
+
+                by_table = {}
+                for row in rows:
+                    by_table.setdefault(row['table_name'], []).append(row['record_id'])
+                last_id = rows[-1]['id']
+                with self.engine.begin() as conn:
+                    conn.execute(tombstones.insert().prefix_with("OR REPLACE"), rows)
+                    for model in REPLICATED_MODELS:
+                        record_ids = by_table.get(model.__tablename__)
+                        if record_ids:
+                            conn.execute(delete(model.__table__).where(model.__table__.c.id.in_(record_ids)))
+                    self._set_watermark(conn, tombstones.name, None, last_id)
+                applied += len(rows)
+
+                if len(rows) < self.batch_size:
+                    break
+        return applied
+
+    # Áp dụng ngay các ghi đã được PostgreSQL xác nhận (đảm bảo đọc-sau-ghi)
+    def apply(self, model: Type, values: dict):
+        """Upsert một dòng đã commit trên PostgreSQL vào replica"""
+        table = model.__table__
+        row = {column.name: values.get(column.name) for column in table.columns}
+        with self.engine.begin() as conn:
+            conn.execute(table.insert().prefix_with("OR REPLACE"), [row])
+
+    def remove(self, model: Type, record_id: int):
+        """Xóa một dòng đã bị xóa trên PostgreSQL khỏi replica"""
+        table = model.__table__
+        with self.engine.begin() as conn:
+            conn.execute(delete(table).where(table.c.id == record_id))
+
+    def refresh(self, model: Type, record_ids: Iterable[int]):
+        """Đọc lại các dòng từ PostgreSQL (sau khi cập nhật hàng loạt) và upsert vào replica"""
+        record_ids = list(record_ids)
+        if not record_ids:
+            return
+        table = model.__table__
+        with db_manager.get_engine().connect() as source:
+            rows = [dict(row._mapping) for row in source.execute(select(table).where(table.c.id.in_(record_ids)))]
+        if rows:
+            with self.engine.begin() as conn:
+                conn.execute(table.insert().prefix_with("OR REPLACE"), rows)
+
+    def apply_change_events(self, events):
+        """
+        Subscriber của change feed: đọc lại dòng được thêm/sửa, xóa dòng bị xóa.
+        Sự kiện không có id (kết nối lại, câu lệnh đổi nhiều dòng) hoặc lô quá ``max_refresh_ids``
+        dòng quay về ``sync()`` theo watermark thay vì một danh sách IN không giới hạn.
+        """
+        models = {model.__tablename__: model for model in REPLICATED_MODELS}
+        reloaded = {event.table for event in events if event.op == OP_RELOAD and event.table in models}
+        if reloaded:
+            self._clear_tables(models[table_name].__table__ for table_name in reloaded)
+        changed_ids = {(event.table, event.id) for event in events if event.table in models}
+        if reloaded or any(record_id is None for _, record_id in changed_ids) \
+                or len(changed_ids) > self.max_refresh_ids:
+            self.sync()
+            return
+        for table_name, model in models.items():
+            upserted = {event.id for event in events if event.table == table_name and event.op != 'D'}
+            removed = {event.id for event in events if event.table == table_name and event.op == 'D'}
+            self.refresh(model, upserted - removed)
+            for record_id in removed:
+                self.remove(model, record_id)
+        if any(event.op == 'D' for event in events):
+            self.sync_deletions()
+
+    def _clear_tables(self, tables: Iterable[Table]):
+        """Bảng bị TRUNCATE/nạp lại trên PostgreSQL: xóa bản sao và watermark để lần sync sau tải lại toàn bộ"""
+        with self._sync_lock, self.engine.begin() as conn:
+            for table in tables:
+                conn.execute(delete(table))
+                conn.execute(delete(sync_state_table).where(sync_state_table.c.table_name == table.name))
+
+    # Luồng sync nền
+    def start_background_sync(self, interval_seconds: float):
+        """Sync ngay rồi lặp lại mỗi ``interval_seconds`` trên một daemon thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval_seconds,),
+                                        name="replica-sync", daemon=True)
+        self._thread.start()
+
+    def stop_background_sync(self):
+        self._stop.set()
+
+    def _run(self, interval_seconds: float):
+        while not self._stop.is_set():
+            try:
+                self.sync()
+            except Exception as e:
+                print(f"⚠️ Local replica sync failed: {e}")
+            self._stop.wait(interval_seconds)
+
+
+_replica: Optional[LocalReplica] = None
+_replica_lock = threading.Lock()
+
+
+def get_local_replica() -> Optional[LocalReplica]:
+    """Replica dùng chung của ứng dụng, hoặc None khi LOCAL_REPLICA_ENABLED tắt"""
+    global _replica
+    if not config.LOCAL_REPLICA_ENABLED:
+        return None
+    with _replica_lock:
+        if _replica is None:
+            _replica = LocalReplica(
+                config.LOCAL_REPLICA_PATH,
+                batch_size=config.LOCAL_REPLICA_BATCH_SIZE,
+                overlap_seconds=config.LOCAL_REPLICA_OVERLAP_SECONDS,
+            )
+            _replica.start_background_sync(config.LOCAL_REPLICA_SYNC_INTERVAL_S)
+        return _replica
@@ -2,10 +2,14 @@
 SQLAlchemy models cho Union Management System
 Chỉ hỗ trợ PostgreSQL database
 """
-from sqlalchemy import Column, Integer, String, DateTime, Text, Enum as SQLEnum, Float
+from sqlalchemy import (
+    Column, BigInteger, Boolean, Integer, String, Date, DateTime, Text, Enum as SQLEnum, Float, Index, UniqueConstraint
+)
+from sqlalchemy.orm import validates
 from sqlalchemy.sql import func
 from infrastructure.database.connection import Base
 from domain.entities.member import MemberType, MemberStatus
+from domain.entities.period import parse_period
 from domain.entities.report import ReportType, ReportStatus
 from domain.entities.task import TaskPriority, TaskStatus
 
@@ -29,7 +33,7 @@ class MemberModel(Base):
     join_date = Column(DateTime)
     notes = Column(Text)
     created_at = Column(DateTime, default=func.now(), nullable=False)
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False, index=True)
 
 
 class ReportModel(Base):
@@ -40,6 +44,8 @@ class ReportModel(Base):
     title = Column(String(200), nullable=False, index=True)
     report_type = Column(SQLEnum(ReportType), nullable=False, default=ReportType.MONTHLY)
     period = Column(String(20), nullable=False, index=True)
+    period_start = Column(Date)  # Ngày đầu kỳ, NULL nếu chuỗi kỳ không nhận ra được
+    period_end = Column(Date)  # Ngày cuối kỳ (bao gồm)
     content = Column(Text)
     attachments = Column(Text)  # JSON string
     status = Column(SQLEnum(ReportStatus), nullable=False, default=ReportStatus.DRAFT)
@@ -50,7 +56,54 @@ class ReportModel(Base):
     approved_at = Column(DateTime)
     rejection_reason = Column(Text)
     created_at = Column(DateTime, default=func.now(), nullable=False)
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False, index=True)
+    
+    __table_args__ = (
+        # Báo cáo chứa một ngày / giao với một khoảng: quét theo period_start rồi lọc period_end trên index
+        Index('ix_reports_period_start_end', 'period_start', 'period_end'),
+    )
+    
+    @validates('period')
+    def _normalize_period(self, key, period):
+        """Mỗi lần gán period thì tính lại period_start/period_end"""
+        parsed = parse_period(period)
+        self.period_start = parsed.start if parsed else None
+        self.period_end = parsed.end if parsed else None
+        return period
+
+
+class AttachmentModel(Base):
+    """SQLAlchemy model cho file đính kèm - chỉ metadata, nội dung lưu trong kho theo SHA-256"""
+    __tablename__ = 'attachments'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    report_id = Column(Integer, nullable=False, index=True)  # Foreign key sẽ được thêm sau
+    file_name = Column(String(255), nullable=False)
+    content_type = Column(String(100))
+    size = Column(BigInteger, nullable=False)
+    sha256 = Column(String(64), nullable=False, index=True)
+    uploaded_by = Column(Integer)
+    created_at = Column(DateTime, default=func.now(), nullable=False)
+
+
+class ReportRevisionModel(Base):
+    """SQLAlchemy model cho phiên bản nội dung báo cáo - toàn văn (snapshot) hoặc delta so với phiên bản trước"""
+    __tablename__ = 'report_revisions'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    report_id = Column(Integer, nullable=False)  # Foreign key sẽ được thêm sau
+    revision = Column(Integer, nullable=False)
+    is_snapshot = Column(Boolean, nullable=False, default=False)
+    data = Column(Text, nullable=False)
+    content_length = Column(Integer, nullable=False, default=0)
+    content_sha256 = Column(String(64), nullable=False)
+    created_by = Column(Integer)
+    created_at = Column(DateTime, default=func.now(), nullable=False)
+    
+    __table_args__ = (
+        # Dựng lại một phiên bản = một range scan (report_id, revision) từ snapshot gần nhất
+        UniqueConstraint('report_id', 'revision', name='uq_report_revisions_report_revision'),
+    )
 
 
 class TaskModel(Base):
@@ -62,6 +115,7 @@ class TaskModel(Base):
     description = Column(Text)
     priority = Column(SQLEnum(TaskPriority), nullable=False, default=TaskPriority.MEDIUM)
     status = Column(SQLEnum(TaskStatus), nullable=False, default=TaskStatus.NOT_STARTED)
+    status_before_overdue = Column(SQLEnum(TaskStatus))  # Job quá hạn khôi phục khi công việc được dời hạn
     assigned_to = Column(Integer)  # Foreign key sẽ được thêm sau
     assigned_by = Column(Integer)  # Foreign key sẽ được thêm sau
     start_date = Column(DateTime)
@@ -72,4 +126,31 @@ class TaskModel(Base):
     progress_percentage = Column(Integer, default=0)
     notes = Column(Text)
     created_at = Column(DateTime, default=func.now(), nullable=False)
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
\ No newline at end of file
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False, index=True)
+    
+    __table_args__ = (
+        # Workload theo thành viên: lọc assigned_to, nhóm theo status/due_date trên cùng index
+        Index('ix_tasks_assigned_to_status_due_date', 'assigned_to', 'status', 'due_date'),
+        Index('ix_tasks_assigned_by', 'assigned_by'),
+    )
+
+class SchemaVersionModel(Base):
+    """Phiên bản schema đã áp dụng - dùng để bỏ qua bootstrap khi database đã cập nhật"""
+    __tablename__ = 'schema_version'
+    
+    version = Column(Integer, primary_key=True)
+    applied_at = Column(DateTime, default=func.now(), nullable=False)
+
+
+class DeletedRecordModel(Base):
+    """Tombstone của bản ghi đã xóa - client đọc theo id tăng dần để đồng bộ phần bị xóa"""
+    __tablename__ = 'deleted_records'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    table_name = Column(String(50), nullable=False)
+    record_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, default=func.now(), nullable=False)
+    
+    __table_args__ = (
+        Index('ix_deleted_records_table_name_id', 'table_name', 'id'),
+    )
@@ -0,0 +1,157 @@
+"""
+Overdue job
+Đánh dấu công việc quá hạn trên server bằng UPDATE theo tập (dùng index một phần ix_tasks_open_due_date),
+chạy định kỳ trên thread nền của ứng dụng hoặc từ cron:
+
+    python -m infrastructure.database.overdue_job
+"""
+import sys
+import threading
+from datetime import datetime
+from typing import Optional
+
+if __name__ == '__main__':
+    # Chạy từ cron: nạp .env trước khi config.settings đọc biến môi trường
+    from dotenv import load_dotenv
+    load_dotenv()
+
+from sqlalchemy import case, cast, func, literal, select, text, update
+
+from config.logging_config import get_logger
+from config.settings import config
+from domain.entities.task import OPEN_STATUSES, TaskStatus
+from infrastructure.database.connection import db_manager
+from infrastructure.database.models import TaskModel
+
+logger = get_logger('maintenance')
+
+# Khóa advisory theo transaction: client không lấy được khóa (client khác đang chạy) bỏ qua lượt này
+ADVISORY_LOCK_KEY = 0x0DE_7A5C
+
+
+class OverdueJob:
+    """
+    Mỗi lượt chạy các lô UPDATE (mỗi lô một transaction) cho tới khi hết công việc
+    đang mở có due_date < now. Điều kiện tự loại các dòng đã đánh dấu nên chạy lại
+    an toàn, và lượt bị ngắt giữa chừng chỉ để lại các lô đã commit - lượt sau làm tiếp.
+    Trạng thái trước khi quá hạn được giữ ở ``status_before_overdue``; công việc OVERDUE được
+    dời hạn về tương lai trở lại trạng thái đó (dòng đánh dấu trước schema v10 không có: IN_PROGRESS
+    nếu đã có tiến độ, ngược lại NOT_STARTED).
+    """
+
+    def __init__(self, batch_size: int = 5000):
+        self.batch_size = batch_size
+        self.last_run: Optional[datetime] = None
+        self.last_marked = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _mark_statement(self, now: datetime):
+        due = select(TaskModel.id).where(
+            TaskModel.status.in_(OPEN_STATUSES),
+            TaskModel.due_date < now,
+        ).order_by(TaskModel.due_date).limit(self.batch_size).with_for_update(skip_locked=True)
+        return update(TaskModel).where(TaskModel.id.in_(due.scalar_subquery())).values(
+            status=TaskStatus.OVERDUE, status_before_overdue=TaskModel.status, updated_at=func.now()
+        ).execution_options(synchronize_session=False)
+
+    @staticmethod
+    def _reopen_statement(now: datetime):
+        return update(TaskModel).where(
+            TaskModel.status == TaskStatus.OVERDUE,
+            TaskModel.due_date >= now,
+        ).values(
+            # CASE của hai tham số có kiểu text trên PostgreSQL - ép về kiểu enum của cột
+            status=func.coalesce(TaskModel.status_before_overdue, cast(case(
+                (TaskModel.progress_percentage > 0, literal(TaskStatus.IN_PROGRESS, TaskModel.status.type)),
+                else_=literal(TaskStatus.NOT_STARTED, TaskModel.status.type),
+            ), TaskModel.status.type)),
+            status_before_overdue=None,
+            updated_at=func.now(),
+        ).execution_options(synchronize_session=False)
+
+    @staticmethod
+    def _acquire(conn) -> bool:
+        if conn.dialect.name != 'postgresql':
+            return True
+        return bool(conn.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {'key': ADVISORY_LOCK_KEY}).scalar())
+
+    @staticmethod
+    def _database_now(conn) -> datetime:
+        """Mốc so sánh theo đồng hồ database - mọi client cùng một mốc, không lật trạng thái qua lại"""
+        if conn.dialect.name != 'postgresql':
+            return datetime.now()
+        return conn.execute(select(func.localtimestamp())).scalar()
+
+    def run_once(self, now: Optional[datetime] = None) -> int:
+        """
+        Một lượt đánh dấu, trả về số công việc mới bị quá hạn (0 khi client khác đang chạy).
+        ``now`` chỉ dùng để ghi đè khi kiểm thử; mặc định đọc ``localtimestamp`` của database một lần mỗi lượt.
+        """
+        engine = db_manager.get_engine()
+        marked = 0
+        with engine.begin() as conn:
+            if not self._acquire(conn):
+                return 0
+            now = now or self._database_now(conn)
+            reopened = conn.execute(self._reopen_statement(now)).rowcount
+        while True:
+            with engine.begin() as conn:
+                if not self._acquire(conn):
+                    break
+                count = conn.execute(self._mark_statement(now)).rowcount
+            marked += count
+            if count < self.batch_size:
+                break
+
+        self.last_run, self.last_marked = now, marked
+        if marked or reopened:
+            logger.info(f"Overdue job: {marked} newly overdue, {reopened} reopened")
+        return marked
+
+    # Luồng nền
+    def start(self, interval_seconds: float):
+        """Chạy ngay rồi lặp lại mỗi ``interval_seconds`` trên một daemon thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval_seconds,),
+                                        name="overdue-job", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self, interval_seconds: float):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"⚠️ Overdue job failed: {e}")
+            self._stop.wait(interval_seconds)
+
+
+_job: Optional[OverdueJob] = None
+_job_lock = threading.Lock()
+
+
+def get_overdue_job() -> Optional[OverdueJob]:
+    """Job dùng chung của ứng dụng (đã start), hoặc None khi OVERDUE_JOB_ENABLED tắt"""
+    global _job
+    if not config.OVERDUE_JOB_ENABLED:
+        return None
+    with _job_lock:
+        if _job is None:
+            _job = OverdueJob(batch_size=config.OVERDUE_JOB_BATCH_SIZE)
+            _job.start(config.OVERDUE_JOB_INTERVAL_S)
+        return _job
+
+
+def main() -> int:
+    marked = OverdueJob(batch_size=config.OVERDUE_JOB_BATCH_SIZE).run_once()
+    print(f"✅ {marked} task(s) newly overdue")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
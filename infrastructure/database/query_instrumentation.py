@@ -0,0 +1,209 @@
+"""
+Query instrumentation
+Đo từng câu SQL qua engine events: fingerprint, thời gian, số dòng, repository method gọi tới;
+ghi slow-query log và cảnh báo N+1 trong một thao tác người dùng
+"""
+import atexit
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import sqlalchemy
+from sqlalchemy import event
+
+from config.logging_config import get_logger
+
+logger = get_logger('sql')
+
+_REPOSITORY_DIR = os.path.join('infrastructure', 'repositories') + os.sep
+_SKIPPED_PATHS = (os.path.dirname(os.path.abspath(sqlalchemy.__file__)) + os.sep, os.path.abspath(__file__))
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_BIND_PARAM = re.compile(r"%\(\w+\)s|%s|(?<![:\w]):\w+|\?|__\[POSTCOMPILE_\w+\]")
+_PARAM_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """Chuẩn hóa câu SQL: bỏ literal/tham số và gộp danh sách IN để các lần gọi cùng dạng trùng nhau"""
+    text = _STRING_LITERAL.sub('?', statement)
+    text = _BIND_PARAM.sub('?', text)
+    text = _NUMBER_LITERAL.sub('?', text)
+    text = _PARAM_LIST.sub('(...)', text)
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def _find_caller() -> str:
+    """Repository method gần nhất trên stack (hoặc frame ngoài SQLAlchemy đầu tiên)"""
+    frame = sys._getframe(2)
+    fallback = None
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if _REPOSITORY_DIR in filename:
+            owner = frame.f_locals.get('self')
+            name = frame.f_code.co_name
+            return f"{type(owner).__name__}.{name}" if owner is not None else name
+        if fallback is None and not filename.startswith(_SKIPPED_PATHS):
+            fallback = f"{os.path.basename(filename)}:{frame.f_code.co_name}"
+        frame = frame.f_back
+    return fallback or '?'
+
+
+@dataclass
+class QueryStat:
+    """Thống kê gộp theo (caller, fingerprint)"""
+    caller: str
+    fingerprint: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    rows: int = 0
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+
+@dataclass
+class ActionScope:
+    """Một thao tác người dùng: đếm số lần chạy mỗi fingerprint để phát hiện N+1"""
+    name: str
+    counts: Dict[str, int] = field(default_factory=dict)
+    callers: Dict[str, str] = field(default_factory=dict)
+    warned: set = field(default_factory=set)
+
+
+_current_action: ContextVar[Optional[ActionScope]] = ContextVar('current_action', default=None)
+
+
+@contextmanager
+def user_action(name: str):
+    """
+    Đánh dấu một thao tác người dùng (dùng với ``with`` hoặc làm decorator).
+    Câu SQL cùng fingerprint chạy quá ``repeat_threshold`` lần trong thao tác bị cảnh báo N+1.
+    """
+    scope = ActionScope(name)
+    token = _current_action.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_action.reset(token)
+        if scope.warned and _instrumentation is not None:
+            _instrumentation.log_action_summary(scope)
+
+
+class QueryInstrumentation:
+    """Lắng nghe before/after_cursor_execute của một hoặc nhiều engine"""
+
+    def __init__(self, slow_query_ms: float = 200.0, repeat_threshold: int = 10,
+                 slow_log_path: Optional[str] = None):
+        self.slow_query_ms = slow_query_ms
+        self.repeat_threshold = repeat_threshold
+        self.stats: Dict[Tuple[str, str], QueryStat] = {}
+        self.n_plus_one: List[Tuple[str, str, str, int]] = []  # (action, caller, fingerprint, count)
+        self._lock = threading.Lock()
+        self.slow_logger = logging.getLogger('union_management.sql.slow')
+        if slow_log_path:
+            directory = os.path.dirname(slow_log_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            handler = logging.FileHandler(slow_log_path, encoding='utf-8')
+            handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
+            self.slow_logger.addHandler(handler)
+
+    def install(self, engine):
+        event.listen(engine, 'before_cursor_execute', self._before_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_execute)
+
+    def uninstall(self, engine):
+        event.remove(engine, 'before_cursor_execute', self._before_execute)
+        event.remove(engine, 'after_cursor_execute', self._after_execute)
+
+    def reset(self):
+        with self._lock:
+            self.stats.clear()
+            self.n_plus_one.clear()
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info['query_start'].pop()) * 1000
+        rows = cursor.rowcount if cursor.rowcount is not None and cursor.rowcount >= 0 else 0
+        caller = _find_caller()
+        key = fingerprint(statement)
+
+        with self._lock:
+            stat = self.stats.get((caller, key))
+            if stat is None:
+                stat = self.stats[(caller, key)] = QueryStat(caller, key)
+            stat.count += 1
+            stat.total_ms += elapsed_ms
+            stat.max_ms = max(stat.max_ms, elapsed_ms)
+            stat.rows += rows
+
+        if elapsed_ms >= self.slow_query_ms:
+            self.slow_logger.warning(f"{elapsed_ms:.1f} ms | rows={rows} | {caller} | {key}")
+
+        scope = _current_action.get()
+        if scope is not None:
+            count = scope.counts.get(key, 0) + 1
+            scope.counts[key] = count
+            scope.callers.setdefault(key, caller)
+            if count > self.repeat_threshold and key not in scope.warned:
+                scope.warned.add(key)
+                logger.warning(f"Possible N+1 in '{scope.name}': {caller} ran the same query "
+                               f"more than {self.repeat_threshold} times: {key}")
+
+    def log_action_summary(self, scope: ActionScope):
+        """Ghi số lần lặp cuối cùng của các fingerprint đã bị cảnh báo khi thao tác kết thúc"""
+        with self._lock:
+            for key in scope.warned:
+                self.n_plus_one.append((scope.name, scope.callers[key], key, scope.counts[key]))
+                logger.warning(f"N+1 summary '{scope.name}': {scope.counts[key]}x {scope.callers[key]}: {key}")
+
+    def top(self, limit: int = 20, by: str = 'total_ms') -> List[QueryStat]:
+        """Các nhóm truy vấn tốn nhất"""
+        with self._lock:
+            stats = list(self.stats.values())
+        return sorted(stats, key=lambda stat: getattr(stat, by), reverse=True)[:limit]
+
+    def report(self, limit: int = 20) -> str:
+        """Bảng tóm tắt dạng text"""
+        lines = [f"{'count':>7} {'total ms':>10} {'avg ms':>8} {'max ms':>8} {'rows':>8}  caller / fingerprint"]
+        for stat in self.top(limit):
+            lines.append(f"{stat.count:>7} {stat.total_ms:>10.1f} {stat.avg_ms:>8.2f} {stat.max_ms:>8.1f} "
+                         f"{stat.rows:>8}  {stat.caller}: {stat.fingerprint[:120]}")
+        return "\n".join(lines)
+
+
+_instrumentation: Optional[QueryInstrumentation] = None
+
+
+def get_instrumentation() -> Optional[QueryInstrumentation]:
+    """Instrumentation đang gắn vào engine chính, None khi SQL_INSTRUMENTATION_ENABLED tắt"""
+    return _instrumentation
+
+
+def install_instrumentation(engine) -> QueryInstrumentation:
+    """Gắn instrumentation dùng chung (theo cấu hình) vào engine"""
+    global _instrumentation
+    from config.settings import config
+    if _instrumentation is None:
+        _instrumentation = QueryInstrumentation(
+            slow_query_ms=config.SLOW_QUERY_MS,
+            repeat_threshold=config.N_PLUS_ONE_THRESHOLD,
+            slow_log_path=config.SLOW_QUERY_LOG,
+        )
+        # Tóm tắt các nhóm truy vấn tốn nhất khi thoát ứng dụng
+        atexit.register(lambda: logger.info("SQL summary\n" + _instrumentation.report()))
+    _instrumentation.install(engine)
+    return _instrumentation
@@ -0,0 +1,253 @@
+"""
+Schema version check cho Union Management System
+Kiểm tra nhanh phiên bản schema khi khởi động, chỉ chạy bootstrap đầy đủ khi cần
+"""
+from typing import Optional
+from sqlalchemy import text
+from infrastructure.database.connection import db_manager
+
+
+# Tăng số này mỗi khi thay đổi models/migration để buộc chạy lại bootstrap
+SCHEMA_VERSION = 10
+
+# Kênh LISTEN/NOTIFY cho sự kiện thay đổi dữ liệu
+CHANGE_CHANNEL = 'union_changes'
+# Câu lệnh đổi nhiều dòng hơn số này (COPY, UPDATE hàng loạt) chỉ gửi một sự kiện đồng bộ lại cả bảng
+CHANGE_NOTIFY_MAX_ROWS = 100
+
+
+def get_schema_version() -> Optional[int]:
+    """Lấy phiên bản schema hiện tại (một round trip), None nếu chưa có database/bảng"""
+    try:
+        engine = db_manager.get_engine()
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT MAX(version) FROM schema_version")).scalar()
+    except Exception:
+        return None
+
+
+def is_schema_current(version: int = SCHEMA_VERSION) -> bool:
+    """Kiểm tra schema có đang ở phiên bản yêu cầu không"""
+    return get_schema_version() == version
+
+
+def set_schema_version(version: int = SCHEMA_VERSION) -> bool:
+    """Ghi nhận phiên bản schema sau khi bootstrap thành công"""
+    from infrastructure.database.models import SchemaVersionModel
+    
+    session = db_manager.get_session()
+    try:
+        if session.get(SchemaVersionModel, version) is None:
+            session.add(SchemaVersionModel(version=version))
+            session.commit()
+        return True
+    except Exception as e:
+        session.rollback()
+        print(f"❌ Error recording schema version: {e}")
+        return False
+    finally:
+        session.close()
+
+
+def _migrate_to_v2(conn):
+    """Index updated_at cho đồng bộ tăng dần và bảng tombstone deleted_records"""
+    from infrastructure.database.models import DeletedRecordModel
+    
+    for table in ('members', 'reports', 'tasks'):
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{table}_updated_at ON {table} (updated_at)"))
+    DeletedRecordModel.__table__.create(conn, checkfirst=True)
+
+
+def _migrate_to_v3(conn):
+    """Trigger pg_notify gửi sự kiện gọn (table, id, op) mỗi khi members/reports/tasks thay đổi"""
+    conn.execute(text(f"""
+        CREATE OR REPLACE FUNCTION notify_row_change() RETURNS trigger AS $$
+        DECLARE
+            row_id integer;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                row_id := OLD.id;
+            ELSE
+                row_id := NEW.id;
+            END IF;
+            PERFORM pg_notify('{CHANGE_CHANNEL}', json_build_object(
+                'table', TG_TABLE_NAME, 'id', row_id, 'op', left(TG_OP, 1))::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """))
+    for table in ('members', 'reports', 'tasks'):
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {table}_notify_change ON {table}"))
+        conn.execute(text(
+            f"CREATE TRIGGER {table}_notify_change AFTER INSERT OR UPDATE OR DELETE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION notify_row_change()"
+        ))
+
+
+def _migrate_to_v4(conn):
+    """Index một phần trên due_date của công việc đang mở cho job đánh dấu quá hạn"""
+    from domain.entities.task import OPEN_STATUSES
+    
+    statuses = ", ".join(f"'{status.name}'" for status in OPEN_STATUSES)
+    conn.execute(text(
+        f"CREATE INDEX IF NOT EXISTS ix_tasks_open_due_date ON tasks (due_date) WHERE status IN ({statuses})"
+    ))
+
+
+def _migrate_to_v5(conn):
+    """Index (assigned_to, status, due_date) và assigned_by cho truy vấn workload theo thành viên"""
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_tasks_assigned_to_status_due_date ON tasks (assigned_to, status, due_date)"
+    ))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_tasks_assigned_by ON tasks (assigned_by)"))
+
+
+def _migrate_to_v6(conn):
+    """Cột period_start/period_end chuẩn hóa từ chuỗi period, điền cho báo cáo đã có, và index khoảng kỳ"""
+    from domain.entities.period import parse_period
+    
+    conn.execute(text("ALTER TABLE reports ADD COLUMN IF NOT EXISTS period_start DATE"))
+    conn.execute(text("ALTER TABLE reports ADD COLUMN IF NOT EXISTS period_end DATE"))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_reports_period_start_end ON reports (period_start, period_end)"
+    ))
+    # Số chuỗi kỳ khác nhau nhỏ: parse trong Python rồi cập nhật theo từng giá trị period
+    periods = conn.execute(text("SELECT DISTINCT period FROM reports WHERE period_start IS NULL")).scalars()
+    rows = []
+    for period in periods:
+        parsed = parse_period(period)
+        if parsed is not None:
+            rows.append({'period': period, 'start': parsed.start, 'end': parsed.end})
+    if rows:
+        conn.execute(text(
+            "UPDATE reports SET period_start = :start, period_end = :end "
+            "WHERE period = :period AND period_start IS NULL"
+        ), rows)
+
+
+def _migrate_to_v7(conn):
+    """Bảng attachments (metadata file đính kèm, index theo report_id và sha256)"""
+    from infrastructure.database.models import AttachmentModel
+    
+    AttachmentModel.__table__.create(conn, checkfirst=True)
+
+
+def _migrate_to_v8(conn):
+    """Bảng report_revisions (lịch sử nội dung báo cáo dạng delta, unique theo report_id + revision)"""
+    from infrastructure.database.models import ReportRevisionModel
+    
+    ReportRevisionModel.__table__.create(conn, checkfirst=True)
+
+
+def _migrate_to_v9(conn):
+    """
+    Thay trigger theo dòng của v3 bằng trigger theo câu lệnh dùng transition table: câu lệnh đổi tối đa
+    CHANGE_NOTIFY_MAX_ROWS dòng gửi sự kiện theo từng dòng, lớn hơn thì một sự kiện 'R' (id null) cho cả bảng;
+    TRUNCATE gửi sự kiện 'T' để client bỏ dữ liệu đã giữ của bảng
+    """
+    conn.execute(text(f"""
+        CREATE OR REPLACE FUNCTION notify_statement_change() RETURNS trigger AS $$
+        DECLARE
+            row_count integer;
+            row_id integer;
+        BEGIN
+            IF TG_OP = 'TRUNCATE' THEN
+                PERFORM pg_notify('{CHANGE_CHANNEL}', json_build_object(
+                    'table', TG_TABLE_NAME, 'id', NULL, 'op', 'T')::text);
+                RETURN NULL;
+            END IF;
+            SELECT count(*) INTO row_count FROM changed_rows;
+            IF row_count > {CHANGE_NOTIFY_MAX_ROWS} THEN
+                PERFORM pg_notify('{CHANGE_CHANNEL}', json_build_object(
+                    'table', TG_TABLE_NAME, 'id', NULL, 'op', 'R')::text);
+            ELSE
+                FOR row_id IN SELECT id FROM changed_rows LOOP
+                    PERFORM pg_notify('{CHANGE_CHANNEL}', json_build_object(
+                        'table', TG_TABLE_NAME, 'id', row_id, 'op', left(TG_OP, 1))::text);
+                END LOOP;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """))
+    # Transition table chỉ dùng được với trigger một sự kiện nên mỗi thao tác một trigger
+    transitions = {'INSERT': 'NEW', 'UPDATE': 'NEW', 'DELETE': 'OLD'}
+    for table in ('members', 'reports', 'tasks'):
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {table}_notify_change ON {table}"))
+        for operation, transition in transitions.items():
+            name = f"{table}_notify_{operation.lower()}"
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {name} ON {table}"))
+            conn.execute(text(
+                f"CREATE TRIGGER {name} AFTER {operation} ON {table} "
+                f"REFERENCING {transition} TABLE AS changed_rows "
+                f"FOR EACH STATEMENT EXECUTE FUNCTION notify_statement_change()"
+            ))
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {table}_notify_truncate ON {table}"))
+        conn.execute(text(
+            f"CREATE TRIGGER {table}_notify_truncate AFTER TRUNCATE ON {table} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION notify_statement_change()"
+        ))
+    conn.execute(text("DROP FUNCTION IF EXISTS notify_row_change()"))
+
+
+def _migrate_to_v10(conn):
+    """Cột status_before_overdue để job quá hạn mở lại công việc về đúng trạng thái cũ (vd. ON_HOLD)"""
+    conn.execute(text("ALTER TABLE tasks ADD COLUMN IF NOT EXISTS status_before_overdue taskstatus"))
+
+
+# Migration cho database đã có: version đích -> hàm nhận connection (chạy trong một transaction)
+MIGRATIONS = {
+    2: _migrate_to_v2,
+    3: _migrate_to_v3,
+    4: _migrate_to_v4,
+    5: _migrate_to_v5,
+    6: _migrate_to_v6,
+    7: _migrate_to_v7,
+    8: _migrate_to_v8,
+    9: _migrate_to_v9,
+    10: _migrate_to_v10,
+}
+
+
+def migrate_schema(current: int) -> bool:
+    """
+    Chạy lần lượt các migration từ ``current`` lên SCHEMA_VERSION.
+    
+    Các migration đều idempotent nên setup cũng gọi từ phiên bản 1 để cài
+    index/trigger không khai báo được trong models.
+    """
+    try:
+        engine = db_manager.get_engine()
+        for version in range(current + 1, SCHEMA_VERSION + 1):
+            migration = MIGRATIONS.get(version)
+            if migration is None:
+                return False
+            print(f"🔧 Migrating schema to version {version}...")
+            with engine.begin() as conn:
+                migration(conn)
+            set_schema_version(version)
+        return True
+    except Exception as e:
+        print(f"❌ Error migrating schema: {e}")
+        return False
+
+
+def ensure_database() -> bool:
+    """
+    Đảm bảo database sẵn sàng khi khởi động ứng dụng.
+    
+    Fast path: nếu schema đã ở SCHEMA_VERSION thì trả về ngay sau một truy vấn.
+    Database phiên bản cũ hơn được nâng cấp bằng MIGRATIONS.
+    Ngược lại mới import setup.py và chạy init_database() (tạo database, bảng, dữ liệu mẫu).
+    """
+    current = get_schema_version()
+    if current == SCHEMA_VERSION:
+        print(f"✅ Database schema is current (version {current})")
+        return True
+    
+    if current is not None and current < SCHEMA_VERSION and migrate_schema(current):
+        return True
+    
+    print(f"🔧 Database schema version {current} != {SCHEMA_VERSION}, running full setup...")
+    from infrastructure.database.setup import init_database
+    return init_database()
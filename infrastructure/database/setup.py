@@ -17,6 +17,7 @@ from sqlalchemy.orm import sessionmaker
 from datetime import datetime, timedelta
 from infrastructure.database.connection import Base, db_manager
 from infrastructure.database.models import MemberModel, ReportModel, TaskModel
+from infrastructure.database.schema import SCHEMA_VERSION, migrate_schema, set_schema_version
 from domain.entities.member import MemberType, MemberStatus
 from domain.entities.report import ReportType, ReportStatus
 from domain.entities.task import TaskPriority, TaskStatus
@@ -1335,6 +1336,10 @@ def init_database():
     if create_tables():
         print("✅ PostgreSQL database tables created successfully!")
         
+        # Cài trigger/DDL ngoài models rồi ghi nhận phiên bản schema để lần khởi động sau bỏ qua bootstrap
+        migrate_schema(1)
+        set_schema_version(SCHEMA_VERSION)
+        
         # Thêm dữ liệu mẫu
         if insert_sample_data():
             print("🎉 PostgreSQL database initialization with sample data completed!")
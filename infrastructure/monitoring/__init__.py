@@ -0,0 +1 @@
+# Monitoring - metrics, tracing, profiling
\ No newline at end of file
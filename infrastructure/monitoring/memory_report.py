@@ -0,0 +1,225 @@
+"""
+Memory report
+Đo bộ nhớ theo từng dataset, cache và bảng Tk đã đăng ký; chụp/so sánh snapshot tracemalloc
+và cảnh báo khi vượt ngân sách
+"""
+import gc
+import sys
+import threading
+import tracemalloc
+import types
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Tuple
+
+from config.logging_config import get_logger
+
+logger = get_logger('memory')
+
+# Không đi sâu vào các đối tượng dùng chung của cả tiến trình
+_SHARED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+                 types.MethodType, types.CodeType, types.FrameType)
+# Tcl giữ nội dung Treeview ngoài heap Python - ước lượng theo độ dài text mỗi dòng cộng phần cố định
+TK_ROW_OVERHEAD_BYTES = 200
+
+
+def deep_sizeof(obj: Any, seen: Optional[set] = None) -> int:
+    """Kích thước (byte) của ``obj`` và mọi thứ nó tham chiếu mà chưa được đếm trong ``seen``"""
+    seen = set() if seen is None else seen
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, _SHARED_TYPES) or current is None:
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current, 0)
+        if isinstance(current, (str, bytes, bytearray, int, float, bool)):
+            continue
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        else:
+            if hasattr(current, '__dict__'):
+                stack.append(vars(current))
+            for slot in getattr(type(current), '__slots__', ()):
+                if hasattr(current, slot):
+                    stack.append(getattr(current, slot))
+    return total
+
+
+def tk_table_size(tree) -> Tuple[int, int]:
+    """(số dòng, byte ước lượng) của một ttk.Treeview"""
+    rows = tree.get_children()
+    text_bytes = sum(len(str(value)) for item in rows for value in tree.item(item, 'values'))
+    return len(rows), text_bytes + TK_ROW_OVERHEAD_BYTES * len(rows)
+
+
+@dataclass
+class MemoryEntry:
+    """Một dòng của báo cáo bộ nhớ"""
+    category: str
+    name: str
+    items: int
+    size_bytes: int
+
+
+class MemoryReporter:
+    """
+    Danh mục các vùng nhớ lớn của ứng dụng (danh sách entity, cache, bảng Tk,
+    dialog còn sống) cùng snapshot tracemalloc để so sánh trước/sau một thao tác.
+    """
+
+    SAMPLE_SIZE = 1000
+
+    def __init__(self, budget_mb: float = 500.0, tracemalloc_frames: int = 1):
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self.tracemalloc_frames = tracemalloc_frames
+        self._sources: List[Tuple[str, str, Callable[[], Any]]] = []
+        self._tables: List[Tuple[str, Callable[[], Any]]] = []
+        self.snapshots: List[Tuple[str, tracemalloc.Snapshot]] = []
+        self._lock = threading.Lock()
+        self.over_budget = False
+
+    # Đăng ký
+    def register(self, category: str, name: str, getter: Callable[[], Any]):
+        """Nguồn dữ liệu Python: ``getter()`` trả về đối tượng cần đo (None nếu chưa tải)"""
+        self._sources.append((category, name, getter))
+
+    def register_tk_table(self, name: str, getter: Callable[[], Any]):
+        """Bảng Treeview: ``getter()`` trả về widget (None nếu tab chưa mở)"""
+        self._tables.append((name, getter))
+
+    # Đo
+    def measure(self, include_dialogs: bool = True) -> List[MemoryEntry]:
+        """Đo tất cả nguồn - gọi trên luồng Tk vì đọc widget"""
+        entries = []
+        seen: set = set()  # Đối tượng dùng chung giữa các dataset chỉ tính cho nguồn đầu tiên
+        for category, name, getter in self._sources:
+            try:
+                value = getter()
+            except Exception:
+                value = None
+            if value is None:
+                continue
+            items = len(value) if hasattr(value, '__len__') else 1
+            entries.append(MemoryEntry(category, name, items, self._estimate_size(value, seen)))
+
+        for name, getter in self._tables:
+            try:
+                tree = getter()
+                if tree is None or not tree.winfo_exists():
+                    continue
+                rows, size = tk_table_size(tree)
+            except Exception:
+                continue
+            entries.append(MemoryEntry('Bảng Tk (ước lượng)', name, rows, size))
+
+        dialogs = live_toplevels() if include_dialogs else 0
+        if dialogs:
+            entries.append(MemoryEntry('Dialog', 'Toplevel còn giữ trong bộ nhớ', dialogs, 0))
+        return entries
+
+    def _estimate_size(self, value: Any, seen: set) -> int:
+        # Danh sách lớn: đo mẫu rải đều rồi nhân lên để lần kiểm tra định kỳ không chặn luồng Tk
+        if isinstance(value, list) and len(value) > self.SAMPLE_SIZE:
+            sample = value[::len(value) // self.SAMPLE_SIZE][:self.SAMPLE_SIZE]
+            return sys.getsizeof(value) + deep_sizeof(sample, seen) * len(value) // len(sample)
+        return deep_sizeof(value, seen)
+
+    def traced_memory(self) -> Optional[Tuple[int, int]]:
+        """(hiện tại, đỉnh) byte theo tracemalloc, None khi chưa bật"""
+        return tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else None
+
+    # Snapshot / diff
+    def take_snapshot(self, label: Optional[str] = None) -> str:
+        """Chụp snapshot tracemalloc (bật tracemalloc nếu chưa chạy), trả về nhãn"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.tracemalloc_frames)
+        gc.collect()
+        label = label or datetime.now().strftime("%H:%M:%S")
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        with self._lock:
+            self.snapshots.append((label, snapshot))
+        return label
+
+    def diff(self, top: int = 20, group_by: str = 'lineno') -> str:
+        """So sánh hai snapshot gần nhất: các dòng code cấp phát thêm/bớt nhiều nhất"""
+        with self._lock:
+            if len(self.snapshots) < 2:
+                return "Cần ít nhất hai snapshot để so sánh"
+            (old_label, old), (new_label, new) = self.snapshots[-2], self.snapshots[-1]
+        stats = new.compare_to(old, group_by)
+        total = sum(stat.size_diff for stat in stats)
+        lines = [f"Snapshot {old_label} → {new_label}: {_format_bytes(total, signed=True)}"]
+        for stat in stats[:top]:
+            frame = stat.traceback[0]
+            lines.append(f"  {_format_bytes(stat.size_diff, signed=True):>12} {stat.count_diff:+8d} blocks  "
+                         f"{frame.filename}:{frame.lineno}")
+        return "\n".join(lines)
+
+    # Báo cáo
+    def report(self) -> str:
+        entries = self.measure()
+        lines = [f"Báo cáo bộ nhớ {datetime.now():%Y-%m-%d %H:%M:%S}"]
+        traced = self.traced_memory()
+        if traced:
+            lines.append(f"tracemalloc: hiện tại {_format_bytes(traced[0])}, đỉnh {_format_bytes(traced[1])}")
+        lines.append(f"Ngân sách: {_format_bytes(self.budget_bytes)}")
+        lines.append("")
+        lines.append(f"{'Nhóm':<22} {'Tên':<34} {'Số phần tử':>10} {'Kích thước':>12}")
+        for entry in sorted(entries, key=lambda e: e.size_bytes, reverse=True):
+            lines.append(f"{entry.category:<22} {entry.name:<34} {entry.items:>10} "
+                         f"{_format_bytes(entry.size_bytes):>12}")
+        lines.append(f"{'Tổng':<57} {_format_bytes(sum(e.size_bytes for e in entries)):>23}")
+        return "\n".join(lines)
+
+    def check_budget(self) -> bool:
+        """Cảnh báo (một lần mỗi khi vượt) nếu bộ nhớ vượt ngân sách, trả về True khi đang vượt"""
+        # tracemalloc chỉ thấy phần cấp phát sau khi bật nên lấy giá trị lớn hơn của hai cách đo
+        traced = self.traced_memory()
+        used = max(traced[0] if traced else 0, sum(entry.size_bytes for entry in self.measure(include_dialogs=False)))
+        over = used > self.budget_bytes
+        if over and not self.over_budget:
+            logger.warning(f"Memory budget exceeded: {_format_bytes(used)} > {_format_bytes(self.budget_bytes)}\n"
+                           + self.report())
+        self.over_budget = over
+        return over
+
+
+def live_toplevels() -> int:
+    """Số đối tượng tkinter.Toplevel còn sống trong heap (dialog đã đóng mà còn bị giữ là rò rỉ)"""
+    tkinter = sys.modules.get('tkinter')
+    if tkinter is None:
+        return 0
+    return sum(1 for obj in gc.get_objects() if isinstance(obj, tkinter.Toplevel))
+
+
+def _format_bytes(size: int, signed: bool = False) -> str:
+    sign = ('+' if size >= 0 else '-') if signed else ''
+    size = abs(size)
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{sign}{size:.0f} {unit}" if unit == 'B' else f"{sign}{size:.1f} {unit}"
+        size /= 1024
+    return f"{sign}{size:.1f} GB"
+
+
+_reporter: Optional[MemoryReporter] = None
+
+
+def get_memory_reporter() -> MemoryReporter:
+    """Reporter dùng chung; tracemalloc bật từ đầu khi MEMORY_TRACEMALLOC_ENABLED"""
+    global _reporter
+    if _reporter is None:
+        from config.settings import config
+        _reporter = MemoryReporter(budget_mb=config.MEMORY_BUDGET_MB,
+                                   tracemalloc_frames=config.MEMORY_TRACEMALLOC_FRAMES)
+        if config.MEMORY_TRACEMALLOC_ENABLED and not tracemalloc.is_tracing():
+            tracemalloc.start(config.MEMORY_TRACEMALLOC_FRAMES)
+    return _reporter
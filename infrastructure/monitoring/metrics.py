@@ -0,0 +1,286 @@
+"""
+Metrics
+Counter và histogram độ trễ cho use case, repository và connection pool;
+ghi định kỳ ra file Prometheus text format và snapshot JSON cuộn
+"""
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from config.settings import config
+
+# Biên bucket (giây) theo mặc định của client Prometheus
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(**labels) -> Labels:
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(labels: Labels, extra: str = '') -> str:
+    parts = [f'{key}="{value}"' for key, value in labels]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+class Counter:
+    """Counter tăng dần theo bộ nhãn"""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self.values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = _labels(**labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+
+class Gauge:
+    """Giá trị tức thời, đọc bằng hàm lấy mẫu lúc xuất"""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self.values: Dict[Labels, float] = {}
+
+    def set(self, value: float, **labels):
+        self.values[_labels(**labels)] = value
+
+
+class Histogram:
+    """Histogram bucket cố định (đếm tích lũy khi xuất như Prometheus)"""
+
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = buckets
+        self.series: Dict[Labels, List] = {}  # nhãn -> [counts theo bucket (+Inf cuối), sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = _labels(**labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def quantile(self, q: float, **labels) -> Optional[float]:
+        """Ước lượng phân vị bằng biên trên của bucket chứa nó"""
+        series = self.series.get(_labels(**labels))
+        if not series or not series[2]:
+            return None
+        target, seen = q * series[2], 0
+        for bound, count in zip(self.buckets + (float('inf'),), series[0]):
+            seen += count
+            if seen >= target:
+                return bound
+        return float('inf')
+
+
+class MetricsRegistry:
+    """Tập metrics của ứng dụng và bộ xuất định kỳ"""
+
+    def __init__(self, prometheus_path: str, snapshot_path: str, snapshot_history: int = 60):
+        self.prometheus_path = prometheus_path
+        self.snapshot_path = snapshot_path
+        self.snapshot_history = snapshot_history
+        self.calls = Counter('union_calls_total', 'Số lần gọi theo tầng và method')
+        self.errors = Counter('union_errors_total', 'Số lần gọi ném exception')
+        self.latency = Histogram('union_call_duration_seconds', 'Độ trễ theo tầng và method')
+        self.pool_wait = Histogram('union_pool_wait_seconds', 'Thời gian chờ lấy connection từ pool')
+        self.pool_state = Gauge('union_pool_connections', 'Trạng thái connection pool')
+        self._engines = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # Ghi nhận
+    def record_call(self, layer: str, method: str, seconds: float, failed: bool = False):
+        self.calls.inc(layer=layer, method=method)
+        self.latency.observe(seconds, layer=layer, method=method)
+        if failed:
+            self.errors.inc(layer=layer, method=method)
+
+    def watch_pool(self, engine):
+        """Đo thời gian chờ checkout và lấy mẫu checked out/overflow của pool khi xuất"""
+        pool = engine.pool
+        connect = pool.connect
+
+        @functools.wraps(connect)
+        def timed_connect(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return connect(*args, **kwargs)
+            finally:
+                self.pool_wait.observe(time.perf_counter() - start)
+
+        pool.connect = timed_connect
+        self._engines.append(engine)
+
+    def _sample_pools(self):
+        for engine in self._engines:
+            pool = engine.pool
+            for state in ('checkedout', 'overflow', 'size', 'checkedin'):
+                reader = getattr(pool, state, None)
+                if reader is not None:
+                    # overflow() của QueuePool âm khi pool chưa đầy - chỉ quan tâm phần vượt pool_size
+                    self.pool_state.set(max(reader(), 0), state=state.replace('checked', 'checked_'))
+
+    # Xuất
+    def to_prometheus(self) -> str:
+        """Nội dung text exposition format"""
+        self._sample_pools()
+        lines = []
+        for metric in (self.calls, self.errors):
+            lines += [f"# HELP {metric.name} {metric.help}", f"# TYPE {metric.name} counter"]
+            lines += [f"{metric.name}{_format_labels(key)} {value}" for key, value in sorted(metric.values.items())]
+        gauge = self.pool_state
+        lines += [f"# HELP {gauge.name} {gauge.help}", f"# TYPE {gauge.name} gauge"]
+        lines += [f"{gauge.name}{_format_labels(key)} {value}" for key, value in sorted(gauge.values.items())]
+        for histogram in (self.latency, self.pool_wait):
+            lines += [f"# HELP {histogram.name} {histogram.help}", f"# TYPE {histogram.name} histogram"]
+            for key, (counts, total, count) in sorted(histogram.series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(histogram.buckets + (float('inf'),), counts):
+                    cumulative += bucket_count
+                    le = 'le="+Inf"' if bound == float('inf') else f'le="{bound}"'
+                    lines.append(f"{histogram.name}_bucket{_format_labels(key, le)} {cumulative}")
+                lines.append(f"{histogram.name}_sum{_format_labels(key)} {total}")
+                lines.append(f"{histogram.name}_count{_format_labels(key)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> dict:
+        """Snapshot gọn: số lần gọi, lỗi, p50/p95 và trạng thái pool"""
+        self._sample_pools()
+        calls = {}
+        for key, count in sorted(self.calls.values.items()):
+            labels = dict(key)
+            name = f"{labels['layer']}.{labels['method']}"
+            series = self.latency.series.get(key)
+            calls[name] = {
+                'count': int(count),
+                'errors': int(self.errors.values.get(key, 0)),
+                'avg_ms': round(series[1] / series[2] * 1000, 3) if series and series[2] else None,
+                'p50_le_s': self.latency.quantile(0.5, **labels),
+                'p95_le_s': self.latency.quantile(0.95, **labels),
+            }
+        wait = self.pool_wait.series.get(())
+        return {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'calls': calls,
+            'pool': {dict(key)['state']: value for key, value in self.pool_state.values.items()},
+            'pool_wait': {
+                'count': wait[2] if wait else 0,
+                'p95_le_s': self.pool_wait.quantile(0.95),
+            },
+        }
+
+    def export(self):
+        """Ghi file Prometheus và nối snapshot vào file JSON (giữ snapshot_history bản gần nhất)"""
+        _atomic_write(self.prometheus_path, self.to_prometheus())
+
+        history = []
+        if os.path.exists(self.snapshot_path):
+            try:
+                with open(self.snapshot_path, encoding='utf-8') as f:
+                    history = json.load(f)
+            except (OSError, ValueError):
+                history = []
+        history = (history + [self.snapshot()])[-self.snapshot_history:]
+        _atomic_write(self.snapshot_path, json.dumps(history, ensure_ascii=False, indent=1))
+
+    def start_exporter(self, interval_seconds: float):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval_seconds,),
+                                        name="metrics-exporter", daemon=True)
+        self._thread.start()
+
+    def stop_exporter(self):
+        self._stop.set()
+
+    def _run(self, interval_seconds: float):
+        while not self._stop.wait(interval_seconds):
+            try:
+                self.export()
+            except Exception as e:
+                print(f"⚠️ Metrics export failed: {e}")
+
+
+def _atomic_write(path: str, content: str):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(temp_path, path)
+
+
+def _timed(registry: MetricsRegistry, layer: str, method_name: str, method):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        failed = False
+        try:
+            return method(*args, **kwargs)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            registry.record_call(layer, method_name, time.perf_counter() - start, failed)
+    return wrapper
+
+
+def instrument_methods(instance, layer: str):
+    """
+    Bọc các method public của ``instance`` bằng bộ đếm thời gian (gán lên chính instance).
+    Khi METRICS_ENABLED tắt không làm gì - không có wrapper nên không tốn chi phí.
+    """
+    registry = get_metrics()
+    if registry is None:
+        return instance
+    for name in dir(type(instance)):
+        if name.startswith('_'):
+            continue
+        method = getattr(instance, name, None)
+        if callable(method) and not isinstance(method, type):
+            setattr(instance, name, _timed(registry, layer, f"{type(instance).__name__}.{name}", method))
+    return instance
+
+
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_metrics() -> Optional[MetricsRegistry]:
+    """Registry dùng chung (bộ xuất chạy nền), hoặc None khi METRICS_ENABLED tắt"""
+    global _registry
+    if not config.METRICS_ENABLED:
+        return None
+    with _registry_lock:
+        if _registry is None:
+            _registry = MetricsRegistry(
+                config.METRICS_PROMETHEUS_FILE,
+                config.METRICS_SNAPSHOT_FILE,
+                snapshot_history=config.METRICS_SNAPSHOT_HISTORY,
+            )
+            from infrastructure.database.connection import db_manager
+            _registry.watch_pool(db_manager.get_engine())
+            _registry.start_exporter(config.METRICS_INTERVAL_S)
+        return _registry
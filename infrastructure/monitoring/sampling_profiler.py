@@ -0,0 +1,143 @@
+"""
+Sampling profiler
+Lấy mẫu stack của mọi thread bằng sys._current_frames() trên một thread nền,
+ghi định dạng collapsed stack cho flamegraph.pl / speedscope / inferno
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Optional
+
+# Frame lá của thread đang chờ (event loop Tk, lock, socket) - bỏ qua để flame graph chỉ còn phần tốn CPU
+IDLE_LEAVES = frozenset({'wait', 'select', 'poll', 'mainloop', '_wait_for_tstate_lock', 'accept'})
+
+
+class SamplingProfiler:
+    """
+    Mỗi ``1/rate_hz`` giây chụp stack của tất cả thread (trừ chính nó) và
+    đếm theo chuỗi frame. Chi phí tỉ lệ với tần số lấy mẫu và độ sâu stack;
+    ``overhead`` là tỉ lệ thời gian thread lấy mẫu đã dùng trên tổng thời gian chạy.
+    """
+
+    def __init__(self, rate_hz: float = 20.0, output_path: Optional[str] = None,
+                 include_idle: bool = False, flush_interval_s: float = 60.0):
+        self.interval = 1.0 / rate_hz
+        self.output_path = output_path or os.path.join(
+            'logs', f"profile-{datetime.now():%Y%m%d-%H%M%S}.collapsed")
+        self.include_idle = include_idle
+        self.flush_interval = flush_interval_s
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self._sampling_seconds = 0.0
+        self._started_at = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def overhead(self) -> float:
+        elapsed = time.perf_counter() - self._started_at if self._started_at else 0.0
+        return self._sampling_seconds / elapsed if elapsed else 0.0
+
+    def start(self):
+        if self.is_running:
+            return
+        self._stop.clear()
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> str:
+        """Dừng lấy mẫu, ghi file và trả về đường dẫn"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        self.write()
+        print(f"✅ Profile: {self.sample_count} samples, overhead {self.overhead:.2%} -> {self.output_path}")
+        return self.output_path
+
+    def _run(self):
+        own_id = threading.get_ident()
+        next_flush = time.monotonic() + self.flush_interval
+        while not self._stop.wait(self.interval):
+            start = time.perf_counter()
+            self._sample(own_id)
+            self._sampling_seconds += time.perf_counter() - start
+            if time.monotonic() >= next_flush:
+                # Ghi định kỳ để không mất dữ liệu khi ứng dụng bị tắt đột ngột
+                self.write()
+                next_flush = time.monotonic() + self.flush_interval
+
+    def _sample(self, own_id: int):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        stacks = []
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            if not self.include_idle and frame.f_code.co_name in IDLE_LEAVES:
+                continue
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_name}@{os.path.basename(code.co_filename)}:{code.co_firstlineno}")
+                frame = frame.f_back
+            frames.append(names.get(thread_id, str(thread_id)).replace(' ', '_'))
+            stacks.append(';'.join(reversed(frames)))
+        with self._lock:
+            self.samples.update(stacks)
+            self.sample_count += 1
+
+    def collapsed(self) -> str:
+        """Mỗi dòng ``thread;frame;...;frame count`` (gốc trước, lá sau)"""
+        with self._lock:
+            items = sorted(self.samples.items())
+        return "".join(f"{stack} {count}\n" for stack, count in items)
+
+    def write(self):
+        directory = os.path.dirname(self.output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.output_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.collapsed())
+        os.replace(temp_path, self.output_path)
+
+
+_profiler: Optional[SamplingProfiler] = None
+
+
+def get_profiler() -> Optional[SamplingProfiler]:
+    """Profiler đang chạy, hoặc None"""
+    return _profiler if _profiler is not None and _profiler.is_running else None
+
+
+def start_profiler() -> SamplingProfiler:
+    """Bắt đầu một phiên lấy mẫu mới (file output mới) với cấu hình PROFILER_*"""
+    global _profiler
+    from config.settings import config
+    if _profiler is None or not _profiler.is_running:
+        _profiler = SamplingProfiler(rate_hz=config.PROFILER_SAMPLE_HZ,
+                                     flush_interval_s=config.PROFILER_FLUSH_S)
+        _profiler.start()
+    return _profiler
+
+
+def stop_profiler() -> Optional[str]:
+    """Dừng phiên đang chạy, trả về đường dẫn file collapsed"""
+    profiler = get_profiler()
+    return profiler.stop() if profiler is not None else None
+
+
+def toggle_profiler() -> Optional[str]:
+    """Bật nếu đang tắt (trả về None), dừng nếu đang chạy (trả về đường dẫn file)"""
+    if get_profiler() is not None:
+        return stop_profiler()
+    start_profiler()
+    return None
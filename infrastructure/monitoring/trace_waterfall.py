@@ -0,0 +1,104 @@
+"""
+Trace waterfall
+In biểu đồ thác nước của từng thao tác từ file JSON lines do tracing ghi ra
+
+    python -m infrastructure.monitoring.trace_waterfall logs/traces.jsonl --last 5
+    python -m infrastructure.monitoring.trace_waterfall logs/traces.jsonl --action "Duyệt báo cáo"
+    python -m infrastructure.monitoring.trace_waterfall logs/traces.jsonl --trace 3f2a9c0d1e4b5a6f
+"""
+import argparse
+import json
+import sys
+from collections import OrderedDict
+from typing import Dict, List
+
+
+def load_traces(path: str) -> "OrderedDict[str, List[dict]]":
+    """Đọc span và nhóm theo trace_id, giữ thứ tự xuất hiện của trace"""
+    traces: "OrderedDict[str, List[dict]]" = OrderedDict()
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            traces.setdefault(record['trace_id'], []).append(record)
+    return traces
+
+
+def _root(spans: List[dict]) -> dict:
+    ids = {s['span_id'] for s in spans}
+    roots = [s for s in spans if s['parent_id'] is None or s['parent_id'] not in ids]
+    return min(roots, key=lambda s: s['start'])
+
+
+def render_waterfall(spans: List[dict], width: int = 40) -> str:
+    """Cây span theo thứ tự bắt đầu, mỗi dòng có offset, thanh thời gian và tổng ms"""
+    root = _root(spans)
+    origin = root['start']
+    total_ms = max(max((s['start'] - origin) * 1000 + s['duration_ms'] for s in spans), 0.001)
+
+    children: Dict[str, List[dict]] = {}
+    for s in spans:
+        children.setdefault(s['parent_id'], []).append(s)
+    for items in children.values():
+        items.sort(key=lambda s: s['start'])
+
+    sql_count = sum(1 for s in spans if s['kind'] == 'sql')
+    lines = [f"Trace {root['trace_id']}  {root['name']}  {root['duration_ms']:.1f} ms  "
+             f"({len(spans)} spans, {sql_count} SQL)"]
+
+    def walk(node: dict, depth: int):
+        offset_ms = (node['start'] - origin) * 1000
+        begin = int(offset_ms / total_ms * width)
+        length = max(1, int(node['duration_ms'] / total_ms * width))
+        bar = ' ' * begin + '█' * min(length, width - begin)
+        label = node['name']
+        if node['kind'] == 'sql':
+            label = node.get('attrs', {}).get('statement', 'sql')[:60]
+        error = '  ❌ ' + node['error'] if node.get('error') else ''
+        lines.append(f"  {offset_ms:8.1f} ms |{bar:<{width}}| {node['duration_ms']:8.1f} ms  "
+                     f"{'  ' * depth}{node['kind']}: {label}{error}")
+        for child in children.get(node['span_id'], []):
+            walk(child, depth + 1)
+
+    walk(root, 0)
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Waterfall của các trace đã ghi")
+    parser.add_argument('path', nargs='?', default='logs/traces.jsonl')
+    parser.add_argument('--trace', help='Chỉ in trace có correlation ID này')
+    parser.add_argument('--action', help='Chỉ in trace có span gốc mang tên này')
+    parser.add_argument('--last', type=int, default=10, help='Số trace gần nhất (mặc định 10)')
+    parser.add_argument('--min-ms', type=float, default=0.0, help='Bỏ qua trace ngắn hơn')
+    parser.add_argument('--width', type=int, default=40)
+    args = parser.parse_args(argv)
+
+    traces = load_traces(args.path)
+    selected = []
+    for trace_id, spans in traces.items():
+        if args.trace and trace_id != args.trace:
+            continue
+        root = _root(spans)
+        if args.action and root['name'] != args.action:
+            continue
+        if root['duration_ms'] < args.min_ms:
+            continue
+        selected.append(spans)
+
+    if not selected:
+        print("Không có trace phù hợp")
+        return 1
+    for spans in selected[-args.last:]:
+        print(render_waterfall(spans, args.width))
+        print()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
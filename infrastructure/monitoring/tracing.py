@@ -0,0 +1,183 @@
+"""
+Tracing
+Span lồng nhau từ thao tác trên GUI tới câu SQL, lan truyền qua contextvars (cả sang thread nền),
+ghi dạng JSON lines theo correlation ID (trace_id)
+"""
+import contextvars
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+from config.settings import config
+
+_current_span: contextvars.ContextVar[Optional['Span']] = contextvars.ContextVar('current_span', default=None)
+_span_ids = itertools.count(1)
+
+
+class Span:
+    """Một đoạn thời gian có tên trong một trace"""
+
+    __slots__ = ('trace_id', 'span_id', 'parent_id', 'name', 'kind', 'start', 'start_perf',
+                 'duration_ms', 'attrs', 'error')
+
+    def __init__(self, name: str, kind: str, parent: Optional['Span'], attrs: Dict[str, Any]):
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex[:16]
+        self.span_id = f"{os.getpid():x}-{next(_span_ids):x}"
+        self.parent_id = parent.span_id if parent else None
+        self.name = name
+        self.kind = kind
+        self.start = time.time()
+        self.start_perf = time.perf_counter()
+        self.duration_ms = 0.0
+        self.attrs = attrs
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            'trace_id': self.trace_id, 'span_id': self.span_id, 'parent_id': self.parent_id,
+            'name': self.name, 'kind': self.kind, 'start': round(self.start, 6),
+            'duration_ms': round(self.duration_ms, 3), 'thread': threading.current_thread().name,
+            'attrs': self.attrs, 'error': self.error,
+        }
+
+
+class TraceWriter:
+    """Ghi span đã kết thúc ra file JSON lines (mỗi span một dòng)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+
+    def write(self, span: Span):
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            if self._file is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._file = open(self.path, 'a', encoding='utf-8', buffering=1)
+            self._file.write(line + "\n")
+
+
+_writer: Optional[TraceWriter] = None
+
+
+def _get_writer() -> TraceWriter:
+    global _writer
+    if _writer is None:
+        _writer = TraceWriter(config.TRACE_FILE)
+    return _writer
+
+
+def current_trace_id() -> Optional[str]:
+    """Correlation ID của thao tác đang chạy (để ghi kèm log/thông báo lỗi)"""
+    span = _current_span.get()
+    return span.trace_id if span else None
+
+
+@contextmanager
+def span(name: str, kind: str = 'internal', root: bool = True, **attrs):
+    """
+    Mở một span con của span hiện tại. ``root=False`` bỏ qua khi chưa có trace
+    (dùng cho SQL để không tạo trace lẻ cho mỗi câu truy vấn nền).
+    """
+    parent = _current_span.get()
+    if not config.TRACING_ENABLED or (parent is None and not root):
+        yield None
+        return
+
+    current = Span(name, kind, parent, attrs)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except Exception as e:
+        message = str(e).splitlines()[0] if str(e) else ''
+        current.error = f"{type(e).__name__}: {message[:200]}"
+        raise
+    finally:
+        current.duration_ms = (time.perf_counter() - current.start_perf) * 1000
+        _current_span.reset(token)
+        _get_writer().write(current)
+
+
+def action(name: str):
+    """
+    Decorator cho callback của controller/GUI: mở trace mới với span gốc kind='action'
+    (hoặc span con khi callback được gọi từ một thao tác khác).
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not config.TRACING_ENABLED:
+                return func(*args, **kwargs)
+            with span(name, 'action'):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def propagate(func: Callable) -> Callable:
+    """Gói hàm để chạy trong context hiện tại - dùng cho target của thread nền và root.after()"""
+    if not config.TRACING_ENABLED:
+        return func
+    context = contextvars.copy_context()
+    return functools.wraps(func)(lambda *args, **kwargs: context.run(func, *args, **kwargs))
+
+
+def _traced(kind: str, name: str, method):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        with span(name, kind):
+            return method(*args, **kwargs)
+    return wrapper
+
+
+def trace_methods(instance, kind: str):
+    """Bọc các method public của ``instance`` bằng span (gán lên chính instance); không làm gì khi tắt"""
+    if not config.TRACING_ENABLED:
+        return instance
+    for name in dir(type(instance)):
+        if name.startswith('_'):
+            continue
+        method = getattr(instance, name, None)
+        if callable(method) and not isinstance(method, type):
+            setattr(instance, name, _traced(kind, f"{type(instance).__name__}.{name}", method))
+    return instance
+
+
+def install_sql_tracing(engine):
+    """Mỗi câu SQL chạy trong một trace thành span kind='sql'"""
+    from sqlalchemy import event
+    from infrastructure.database.query_instrumentation import fingerprint
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        manager = span('sql', 'sql', root=False)
+        current = manager.__enter__()
+        if current is not None:
+            current.attrs['statement'] = fingerprint(statement)[:500]
+        conn.info.setdefault('trace_spans', []).append(manager)
+
+    def after_execute(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get('trace_spans')
+        if spans:
+            manager = spans.pop()
+            if cursor.rowcount is not None and cursor.rowcount >= 0 and _current_span.get() is not None:
+                _current_span.get().attrs['rows'] = cursor.rowcount
+            manager.__exit__(None, None, None)
+
+    def handle_error(exception_context):
+        spans = exception_context.connection.info.get('trace_spans') if exception_context.connection else None
+        if spans:
+            error = exception_context.original_exception
+            spans.pop().__exit__(type(error), error, None)
+
+    event.listen(engine, 'before_cursor_execute', before_execute)
+    event.listen(engine, 'after_cursor_execute', after_execute)
+    event.listen(engine, 'handle_error', handle_error)
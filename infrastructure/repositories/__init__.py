@@ -1,9 +1,34 @@
 from .member_repository_impl import MemberRepository
 from .report_repository_impl import ReportRepository
 from .task_repository_impl import TaskRepository
+from .attachment_repository_impl import AttachmentRepository
+from .report_revision_repository_impl import ReportRevisionRepository
+
+
+def create_repositories() -> tuple:
+    """Tạo (member, report, task) repositories - đọc qua local replica khi LOCAL_REPLICA_ENABLED bật"""
+    from infrastructure.database.local_replica import get_local_replica
+    from infrastructure.monitoring import tracing
+    from infrastructure.monitoring.metrics import instrument_methods
+
+    replica = get_local_replica()
+    if replica is None:
+        repositories = (MemberRepository(), ReportRepository(), TaskRepository())
+    else:
+        from .replicated_repositories import (
+            ReplicatedMemberRepository, ReplicatedReportRepository, ReplicatedTaskRepository
+        )
+        repositories = (ReplicatedMemberRepository(replica), ReplicatedReportRepository(replica),
+                        ReplicatedTaskRepository(replica))
+    return tuple(tracing.trace_methods(instrument_methods(repository, 'repository'), 'repository')
+                 for repository in repositories)
+
 
 __all__ = [
     'MemberRepository',
     'ReportRepository', 
-    'TaskRepository'
-]
\ No newline at end of file
+    'TaskRepository',
+    'AttachmentRepository',
+    'ReportRevisionRepository',
+    'create_repositories'
+]
@@ -0,0 +1,107 @@
+from typing import Dict, Iterable, List, Optional, Set
+from sqlalchemy.orm import Session
+from domain.entities.attachment import Attachment
+from domain.repositories.attachment_repository import IAttachmentRepository
+from infrastructure.database.models import AttachmentModel
+from infrastructure.database.connection import db_manager
+from infrastructure.repositories import statements
+
+
+class AttachmentRepository(IAttachmentRepository):
+    """Implementation của Attachment Repository"""
+    
+    def __init__(self):
+        self.db_manager = db_manager
+    
+    def _model_to_entity(self, model: AttachmentModel) -> Attachment:
+        """Chuyển đổi từ SQLAlchemy model sang Domain entity"""
+        return Attachment.hydrate(
+            id=model.id,
+            report_id=model.report_id,
+            file_name=model.file_name,
+            content_type=model.content_type,
+            size=model.size,
+            sha256=model.sha256,
+            uploaded_by=model.uploaded_by,
+            created_at=model.created_at
+        )
+    
+    def create(self, attachment: Attachment) -> Attachment:
+        """Ghi metadata file đính kèm"""
+        session: Session = self.db_manager.get_session()
+        try:
+            model = AttachmentModel(
+                report_id=attachment.report_id,
+                file_name=attachment.file_name,
+                content_type=attachment.content_type,
+                size=attachment.size,
+                sha256=attachment.sha256,
+                uploaded_by=attachment.uploaded_by,
+                created_at=attachment.created_at
+            )
+            session.add(model)
+            session.commit()
+            session.refresh(model)
+            return self._model_to_entity(model)
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+    
+    def get_by_id(self, attachment_id: int) -> Optional[Attachment]:
+        """Lấy file đính kèm theo ID"""
+        session: Session = self.db_manager.get_session()
+        try:
+            model = session.scalars(statements.ATTACHMENT_BY_ID, {'id': attachment_id}).first()
+            return self._model_to_entity(model) if model else None
+        finally:
+            session.close()
+    
+    def get_by_report(self, report_id: int) -> List[Attachment]:
+        """Lấy các file đính kèm của một báo cáo (index report_id)"""
+        session: Session = self.db_manager.get_session()
+        try:
+            models = session.scalars(statements.ATTACHMENT_BY_REPORT, {'report_id': report_id}).all()
+            return [self._model_to_entity(model) for model in models]
+        finally:
+            session.close()
+    
+    def count_by_reports(self, report_ids: Iterable[int]) -> Dict[int, int]:
+        """Đếm file đính kèm theo báo cáo (một truy vấn GROUP BY cho cả trang danh sách)"""
+        report_ids = list(report_ids)
+        if not report_ids:
+            return {}
+        session: Session = self.db_manager.get_session()
+        try:
+            rows = session.execute(statements.ATTACHMENT_COUNT_BY_REPORTS, {'report_ids': report_ids})
+            return {report_id: count for report_id, count in rows}
+        finally:
+            session.close()
+    
+    def get_referenced_sha256(self, hashes: Iterable[str]) -> Set[str]:
+        """Các hash trong ``hashes`` còn metadata trỏ tới (index sha256)"""
+        hashes = list(hashes)
+        if not hashes:
+            return set()
+        session: Session = self.db_manager.get_session()
+        try:
+            return set(session.scalars(statements.ATTACHMENT_REFERENCED_SHA256, {'hashes': hashes}))
+        finally:
+            session.close()
+    
+    def delete(self, attachment_id: int) -> bool:
+        """Xóa metadata file đính kèm"""
+        session: Session = self.db_manager.get_session()
+        try:
+            model = session.get(AttachmentModel, attachment_id)
+            if not model:
+                return False
+            session.delete(model)
+            session.commit()
+            return True
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
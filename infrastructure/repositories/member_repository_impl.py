@@ -1,10 +1,13 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from datetime import datetime
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from domain.entities.member import Member, MemberType, MemberStatus
+from domain.entities.frames import CHUNK_ROWS, MemberFrame
 from domain.repositories.member_repository import IMemberRepository
 from infrastructure.database.models import MemberModel
 from infrastructure.database.connection import db_manager
+from infrastructure.repositories import statements, tombstones
 
 
 class MemberRepository(IMemberRepository):
@@ -15,7 +18,7 @@ class MemberRepository(IMemberRepository):
     
     def _model_to_entity(self, model: MemberModel) -> Member:
         """Chuyển đổi từ SQLAlchemy model sang Domain entity"""
-        return Member(
+        return Member.hydrate(
             id=model.id,
             member_code=model.member_code,
             full_name=model.full_name,
@@ -60,6 +63,7 @@ class MemberRepository(IMemberRepository):
         session: Session = self.db_manager.get_session()
         try:
             model = self._entity_to_model(member)
+            model.updated_at = func.now()  # Đồng hồ server - làm watermark cho đồng bộ tăng dần
             session.add(model)
             session.commit()
             session.refresh(model)
@@ -74,7 +78,7 @@ class MemberRepository(IMemberRepository):
         """Lấy thành viên theo ID"""
         session: Session = self.db_manager.get_session()
         try:
-            model = session.query(MemberModel).filter(MemberModel.id == member_id).first()
+            model = session.scalars(statements.MEMBER_BY_ID, {'id': member_id}).first()
             return self._model_to_entity(model) if model else None
         finally:
             session.close()
@@ -83,7 +87,7 @@ class MemberRepository(IMemberRepository):
         """Lấy thành viên theo mã thành viên"""
         session: Session = self.db_manager.get_session()
         try:
-            model = session.query(MemberModel).filter(MemberModel.member_code == member_code).first()
+            model = session.scalars(statements.MEMBER_BY_CODE, {'member_code': member_code}).first()
             return self._model_to_entity(model) if model else None
         finally:
             session.close()
@@ -92,7 +96,7 @@ class MemberRepository(IMemberRepository):
         """Lấy tất cả thành viên"""
         session: Session = self.db_manager.get_session()
         try:
-            models = session.query(MemberModel).order_by(MemberModel.full_name).all()
+            models = session.scalars(statements.MEMBER_ALL).all()
             return [self._model_to_entity(model) for model in models]
         finally:
             session.close()
@@ -101,9 +105,7 @@ class MemberRepository(IMemberRepository):
         """Lấy thành viên theo loại"""
         session: Session = self.db_manager.get_session()
         try:
-            models = session.query(MemberModel).filter(
-                MemberModel.member_type == member_type
-            ).order_by(MemberModel.full_name).all()
+            models = session.scalars(statements.MEMBER_BY_TYPE, {'member_type': member_type}).all()
             return [self._model_to_entity(model) for model in models]
         finally:
             session.close()
@@ -112,9 +114,7 @@ class MemberRepository(IMemberRepository):
         """Lấy thành viên theo trạng thái"""
         session: Session = self.db_manager.get_session()
         try:
-            models = session.query(MemberModel).filter(
-                MemberModel.status == status
-            ).order_by(MemberModel.full_name).all()
+            models = session.scalars(statements.MEMBER_BY_STATUS, {'status': status}).all()
             return [self._model_to_entity(model) for model in models]
         finally:
             session.close()
@@ -152,7 +152,7 @@ class MemberRepository(IMemberRepository):
             model.status = member.status
             model.join_date = member.join_date
             model.notes = member.notes
-            model.updated_at = member.updated_at
+            model.updated_at = func.now()
             
             session.commit()
             session.refresh(model)
@@ -172,6 +172,7 @@ class MemberRepository(IMemberRepository):
                 return False
             
             session.delete(model)
+            tombstones.record_deletion(session, MemberModel.__tablename__, member_id)
             session.commit()
             return True
         except Exception as e:
@@ -285,4 +286,33 @@ class MemberRepository(IMemberRepository):
             session.rollback()
             raise e
         finally:
-            session.close()
\ No newline at end of file
+            session.close()
+    
+    def changed_since(self, watermark: Optional[datetime]) -> List[Member]:
+        """Lấy thành viên được tạo/cập nhật sau watermark (dùng index updated_at)"""
+        session: Session = self.db_manager.get_session()
+        try:
+            if watermark is None:
+                models = session.scalars(statements.MEMBER_CHANGED_ALL).all()
+            else:
+                models = session.scalars(statements.MEMBER_CHANGED_SINCE, {'watermark': watermark}).all()
+            return [self._model_to_entity(model) for model in models]
+        finally:
+            session.close()
+    
+    def load_frame(self) -> MemberFrame:
+        """Nạp toàn bộ thành viên dạng cột NumPy cho thống kê (đọc theo khối, không dựng entity)"""
+        session: Session = self.db_manager.get_session()
+        try:
+            result = session.execute(statements.MEMBER_FRAME, execution_options={'yield_per': CHUNK_ROWS})
+            return MemberFrame.from_chunks(result.partitions())
+        finally:
+            session.close()
+    
+    def deleted_since(self, cursor: Optional[int]) -> Tuple[List[int], int]:
+        """Lấy ID thành viên đã xóa sau cursor của bảng tombstone"""
+        session: Session = self.db_manager.get_session()
+        try:
+            return tombstones.deleted_since(session, MemberModel.__tablename__, cursor)
+        finally:
+            session.close()
@@ -0,0 +1,138 @@
+"""
+Replicated repositories
+Đọc từ SQLite replica local, ghi lên PostgreSQL rồi áp dụng ngay bản ghi đã xác nhận vào replica
+"""
+from typing import List
+
+from domain.entities.member import MemberStatus
+from domain.repositories.member_repository import IMemberRepository
+from domain.repositories.report_repository import IReportRepository
+from domain.repositories.task_repository import ITaskRepository
+from infrastructure.database.local_replica import LocalReplica
+from infrastructure.database.models import MemberModel, ReportModel, TaskModel
+from .member_repository_impl import MemberRepository
+from .report_repository_impl import ReportRepository
+from .task_repository_impl import TaskRepository
+
+
+def _local_read(name: str):
+    """Phương thức đọc: dùng replica khi đã sync, ngược lại đọc thẳng PostgreSQL"""
+    def method(self, *args, **kwargs):
+        repository = self._local if self.replica.is_ready else self._primary
+        return getattr(repository, name)(*args, **kwargs)
+
+    method.__name__ = name
+    method.__doc__ = f"{name} - đọc từ local replica"
+    return method
+
+
+class _ReplicatedRepository:
+    """Ghép một repository PostgreSQL với một bản cùng loại trỏ vào replica"""
+
+    repository_class = None
+    model_class = None
+
+    def __init__(self, replica: LocalReplica):
+        self.replica = replica
+        self._primary = self.repository_class()
+        self._local = self.repository_class()
+        self._local.db_manager = replica
+
+    def _apply(self, entity):
+        model = self._primary._entity_to_model(entity)
+        self.replica.apply(self.model_class, {
+            column.name: getattr(model, column.name) for column in self.model_class.__table__.columns
+        })
+        return entity
+
+    def create(self, entity):
+        return self._apply(self._primary.create(entity))
+
+    def update(self, entity):
+        return self._apply(self._primary.update(entity))
+
+    def delete(self, record_id: int) -> bool:
+        deleted = self._primary.delete(record_id)
+        self.replica.remove(self.model_class, record_id)
+        if deleted:
+            # Kéo tombstone vừa ghi để deleted_since() local thấy ngay lần xóa này
+            self.replica.sync_deletions()
+        return deleted
+
+
+class ReplicatedMemberRepository(_ReplicatedRepository, IMemberRepository):
+    """Member repository đọc local"""
+
+    repository_class = MemberRepository
+    model_class = MemberModel
+
+    get_by_id = _local_read('get_by_id')
+    get_by_member_code = _local_read('get_by_member_code')
+    get_all = _local_read('get_all')
+    get_by_type = _local_read('get_by_type')
+    get_by_status = _local_read('get_by_status')
+    search_by_name = _local_read('search_by_name')
+    count_by_type = _local_read('count_by_type')
+    get_members_by_department = _local_read('get_members_by_department')
+    get_paginated_members = _local_read('get_paginated_members')
+    search_members = _local_read('search_members')
+    get_members_count_by_status = _local_read('get_members_count_by_status')
+    load_frame = _local_read('load_frame')
+    changed_since = _local_read('changed_since')
+    deleted_since = _local_read('deleted_since')
+
+    def bulk_update_status(self, member_ids: List[int], new_status: MemberStatus) -> int:
+        """Cập nhật hàng loạt trên PostgreSQL rồi đọc lại các dòng đó vào replica"""
+        updated_count = self._primary.bulk_update_status(member_ids, new_status)
+        self.replica.refresh(MemberModel, member_ids)
+        return updated_count
+
+
+class ReplicatedReportRepository(_ReplicatedRepository, IReportRepository):
+    """Report repository đọc local"""
+
+    repository_class = ReportRepository
+    model_class = ReportModel
+
+    get_by_id = _local_read('get_by_id')
+    get_all = _local_read('get_all')
+    get_by_type = _local_read('get_by_type')
+    get_by_status = _local_read('get_by_status')
+    get_by_period = _local_read('get_by_period')
+    get_covering = _local_read('get_covering')
+    get_by_period_range = _local_read('get_by_period_range')
+    get_by_submitter = _local_read('get_by_submitter')
+    get_by_date_range = _local_read('get_by_date_range')
+    search_by_title = _local_read('search_by_title')
+    count_by_status = _local_read('count_by_status')
+    load_frame = _local_read('load_frame')
+    changed_since = _local_read('changed_since')
+    deleted_since = _local_read('deleted_since')
+
+
+class ReplicatedTaskRepository(_ReplicatedRepository, ITaskRepository):
+    """Task repository đọc local"""
+
+    repository_class = TaskRepository
+    model_class = TaskModel
+
+    get_by_id = _local_read('get_by_id')
+    get_all = _local_read('get_all')
+    get_by_assignee = _local_read('get_by_assignee')
+    get_by_assigner = _local_read('get_by_assigner')
+    get_by_status = _local_read('get_by_status')
+    get_by_priority = _local_read('get_by_priority')
+    get_by_due_date_range = _local_read('get_by_due_date_range')
+    get_overdue_tasks = _local_read('get_overdue_tasks')
+    get_open_deadlines = _local_read('get_open_deadlines')
+    get_workload = _local_read('get_workload')
+    search_by_title = _local_read('search_by_title')
+    count_by_status = _local_read('count_by_status')
+    get_task_statistics = _local_read('get_task_statistics')
+    load_frame = _local_read('load_frame')
+    changed_since = _local_read('changed_since')
+    deleted_since = _local_read('deleted_since')
+
+    def get_hours_analytics(self, *args, **kwargs):
+        """GROUPING SETS/percentile_cont không có trên SQLite - luôn đọc PostgreSQL"""
+        return self._primary.get_hours_analytics(*args, **kwargs)
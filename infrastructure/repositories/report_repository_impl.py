@@ -1,11 +1,14 @@
-from typing import List, Optional
-from datetime import datetime
+from typing import List, Optional, Tuple
+from datetime import date, datetime, timedelta
 from sqlalchemy.orm import Session
 from sqlalchemy import func
+from domain.entities.period import MAX_PERIOD_DAYS
 from domain.entities.report import Report, ReportType, ReportStatus
+from domain.entities.frames import CHUNK_ROWS, ReportFrame
 from domain.repositories.report_repository import IReportRepository
 from infrastructure.database.models import ReportModel
 from infrastructure.database.connection import db_manager
+from infrastructure.repositories import statements, tombstones
 
 
 class ReportRepository(IReportRepository):
@@ -16,7 +19,7 @@ class ReportRepository(IReportRepository):
     
     def _model_to_entity(self, model: ReportModel) -> Report:
         """Chuyển đổi từ SQLAlchemy model sang Domain entity"""
-        return Report(
+        return Report.hydrate(
             id=model.id,
             title=model.title,
             report_type=model.report_type,
@@ -59,6 +62,7 @@ class ReportRepository(IReportRepository):
         session: Session = self.db_manager.get_session()
         try:
             model = self._entity_to_model(report)
+            model.updated_at = func.now()  # Đồng hồ server - làm watermark cho đồng bộ tăng dần
             session.add(model)
             session.commit()
             session.refresh(model)
@@ -73,7 +77,7 @@ class ReportRepository(IReportRepository):
         """Lấy báo cáo theo ID"""
         session: Session = self.db_manager.get_session()
         try:
-            model = session.query(ReportModel).filter(ReportModel.id == report_id).first()
+            model = session.scalars(statements.REPORT_BY_ID, {'id': report_id}).first()
             return self._model_to_entity(model) if model else None
         finally:
             session.close()
@@ -82,7 +86,7 @@ class ReportRepository(IReportRepository):
         """Lấy tất cả báo cáo"""
         session: Session = self.db_manager.get_session()
         try:
-            models = session.query(ReportModel).order_by(ReportModel.created_at.desc()).all()
+            models = session.scalars(statements.REPORT_ALL).all()
             return [self._model_to_entity(model) for model in models]
         finally:
             session.close()
@@ -91,9 +95,7 @@ class ReportRepository(IReportRepository):
         """Lấy báo cáo theo loại"""
         session: Session = self.db_manager.get_session()
         try:
-            models = session.query(ReportModel).filter(
-                ReportModel.report_type == report_type
-            ).order_by(ReportModel.created_at.desc()).all()
+            models = session.scalars(statements.REPORT_BY_TYPE, {'report_type': report_type}).all()
             return [self._model_to_entity(model) for model in models]
         finally:
             session.close()
@@ -102,9 +104,7 @@ class ReportRepository(IReportRepository):
         """Lấy báo cáo theo trạng thái"""
         session: Session = self.db_manager.get_session()
         try:
-            models = session.query(ReportModel).filter(
-                ReportModel.status == status
-            ).order_by(ReportModel.created_at.desc()).all()
+            models = session.scalars(statements.REPORT_BY_STATUS, {'status': status}).all()
             return [self._model_to_entity(model) for model in models]
         finally:
             session.close()
@@ -113,9 +113,32 @@ class ReportRepository(IReportRepository):
         """Lấy báo cáo theo kỳ"""
         session: Session = self.db_manager.get_session()
         try:
-            models = session.query(ReportModel).filter(
-                ReportModel.period == period
-            ).order_by(ReportModel.created_at.desc()).all()
+            models = session.scalars(statements.REPORT_BY_PERIOD, {'period': period}).all()
+            return [self._model_to_entity(model) for model in models]
+        finally:
+            session.close()
+    
+    def get_covering(self, day: date) -> List[Report]:
+        """Lấy báo cáo có kỳ chứa ngày ``day`` (tháng, quý, năm... cùng lúc)"""
+        session: Session = self.db_manager.get_session()
+        try:
+            models = session.scalars(statements.REPORT_COVERING, {
+                'day': day, 'earliest': day - timedelta(days=MAX_PERIOD_DAYS)
+            }).all()
+            return [self._model_to_entity(model) for model in models]
+        finally:
+            session.close()
+    
+    def get_by_period_range(self, start: date, end: date, contained: bool = False) -> List[Report]:
+        """Lấy báo cáo có kỳ giao với [start, end] (``contained``: kỳ nằm trọn trong khoảng)"""
+        session: Session = self.db_manager.get_session()
+        try:
+            if contained:
+                models = session.scalars(statements.REPORT_WITHIN, {'start': start, 'end': end}).all()
+            else:
+                models = session.scalars(statements.REPORT_OVERLAPPING, {
+                    'start': start, 'end': end, 'earliest': start - timedelta(days=MAX_PERIOD_DAYS)
+                }).all()
             return [self._model_to_entity(model) for model in models]
         finally:
             session.close()
@@ -174,7 +197,7 @@ class ReportRepository(IReportRepository):
             model.approved_by = report.approved_by
             model.approved_at = report.approved_at
             model.rejection_reason = report.rejection_reason
-            model.updated_at = report.updated_at
+            model.updated_at = func.now()
             
             session.commit()
             session.refresh(model)
@@ -194,6 +217,7 @@ class ReportRepository(IReportRepository):
                 return False
             
             session.delete(model)
+            tombstones.record_deletion(session, ReportModel.__tablename__, report_id)
             session.commit()
             return True
         except Exception as e:
@@ -206,9 +230,36 @@ class ReportRepository(IReportRepository):
         """Đếm số báo cáo theo trạng thái"""
         session: Session = self.db_manager.get_session()
         try:
-            count = session.query(func.count(ReportModel.id)).filter(
-                ReportModel.status == status
-            ).scalar()
+            count = session.scalar(statements.REPORT_COUNT_BY_STATUS, {'status': status})
             return count or 0
         finally:
-            session.close()
\ No newline at end of file
+            session.close()
+    
+    def changed_since(self, watermark: Optional[datetime]) -> List[Report]:
+        """Lấy báo cáo được tạo/cập nhật sau watermark (dùng index updated_at)"""
+        session: Session = self.db_manager.get_session()
+        try:
+            if watermark is None:
+                models = session.scalars(statements.REPORT_CHANGED_ALL).all()
+            else:
+                models = session.scalars(statements.REPORT_CHANGED_SINCE, {'watermark': watermark}).all()
+            return [self._model_to_entity(model) for model in models]
+        finally:
+            session.close()
+    
+    def load_frame(self) -> ReportFrame:
+        """Nạp toàn bộ báo cáo dạng cột NumPy cho thống kê (đọc theo khối, không dựng entity)"""
+        session: Session = self.db_manager.get_session()
+        try:
+            result = session.execute(statements.REPORT_FRAME, execution_options={'yield_per': CHUNK_ROWS})
+            return ReportFrame.from_chunks(result.partitions())
+        finally:
+            session.close()
+    
+    def deleted_since(self, cursor: Optional[int]) -> Tuple[List[int], int]:
+        """Lấy ID báo cáo đã xóa sau cursor của bảng tombstone"""
+        session: Session = self.db_manager.get_session()
+        try:
+            return tombstones.deleted_since(session, ReportModel.__tablename__, cursor)
+        finally:
+            session.close()
@@ -0,0 +1,93 @@
+from typing import List, Optional
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+from domain.entities.report_revision import ReportRevision
+from domain.repositories.report_revision_repository import IReportRevisionRepository
+from infrastructure.database.models import ReportRevisionModel
+from infrastructure.database.connection import db_manager
+from infrastructure.repositories import statements
+
+
+class ReportRevisionRepository(IReportRevisionRepository):
+    """Implementation của Report Revision Repository"""
+    
+    def __init__(self):
+        self.db_manager = db_manager
+    
+    def _model_to_entity(self, model, data: Optional[str] = None) -> ReportRevision:
+        """Chuyển đổi từ SQLAlchemy model (hoặc dòng metadata) sang Domain entity"""
+        return ReportRevision.hydrate(
+            id=model.id,
+            report_id=model.report_id,
+            revision=model.revision,
+            is_snapshot=model.is_snapshot,
+            data=data,
+            content_length=model.content_length,
+            content_sha256=model.content_sha256,
+            created_by=model.created_by,
+            created_at=model.created_at
+        )
+    
+    def create(self, revision: ReportRevision) -> ReportRevision:
+        """Ghi một phiên bản mới (trùng report_id + revision thì lỗi - client khác vừa ghi)"""
+        session: Session = self.db_manager.get_session()
+        try:
+            model = ReportRevisionModel(
+                report_id=revision.report_id,
+                revision=revision.revision,
+                is_snapshot=revision.is_snapshot,
+                data=revision.data,
+                content_length=revision.content_length,
+                content_sha256=revision.content_sha256,
+                created_by=revision.created_by,
+                created_at=revision.created_at
+            )
+            session.add(model)
+            session.commit()
+            session.refresh(model)
+            return self._model_to_entity(model, model.data)
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+    
+    def get_latest(self, report_id: int) -> Optional[ReportRevision]:
+        """Metadata phiên bản mới nhất (không kèm data)"""
+        session: Session = self.db_manager.get_session()
+        try:
+            row = session.execute(statements.REVISION_LATEST, {'report_id': report_id}).first()
+            return self._model_to_entity(row) if row else None
+        finally:
+            session.close()
+    
+    def get_chain(self, report_id: int, revision: int) -> List[ReportRevision]:
+        """Snapshot gần nhất không sau ``revision`` và các delta tới ``revision`` (một range scan)"""
+        session: Session = self.db_manager.get_session()
+        try:
+            models = session.scalars(statements.REVISION_CHAIN, {'report_id': report_id, 'revision': revision}).all()
+            return [self._model_to_entity(model, model.data) for model in models]
+        finally:
+            session.close()
+    
+    def get_by_report(self, report_id: int) -> List[ReportRevision]:
+        """Metadata các phiên bản của báo cáo, mới nhất trước"""
+        session: Session = self.db_manager.get_session()
+        try:
+            rows = session.execute(statements.REVISION_BY_REPORT, {'report_id': report_id}).all()
+            return [self._model_to_entity(row) for row in rows]
+        finally:
+            session.close()
+    
+    def delete_by_report(self, report_id: int) -> int:
+        """Xóa lịch sử phiên bản của báo cáo"""
+        session: Session = self.db_manager.get_session()
+        try:
+            result = session.execute(delete(ReportRevisionModel).where(ReportRevisionModel.report_id == report_id))
+            session.commit()
+            return result.rowcount
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
@@ -0,0 +1,182 @@
+"""
+Statement registry
+Các câu SELECT nóng của repository dựng sẵn một lần ở cấp module với bindparam:
+mỗi lần gọi chỉ truyền tham số, không dựng lại Query, và SQLAlchemy dùng lại bản compile
+trong compiled cache của engine (cache key của statement cố định được tính rất rẻ)
+"""
+from sqlalchemy import and_, bindparam, func, or_, select, tuple_
+
+from domain.entities.frames import MemberFrame, ReportFrame, TaskFrame
+from domain.entities.task import OPEN_STATUSES, TaskStatus
+from infrastructure.database.models import AttachmentModel, MemberModel, ReportModel, ReportRevisionModel, TaskModel
+
+
+def _frame_columns(model, frame_class):
+    """SELECT đúng các cột của frame theo thứ tự khai báo"""
+    return select(*(getattr(model, name) for name, _ in frame_class.COLUMNS)).order_by(model.id)
+
+
+# Members
+MEMBER_BY_ID = select(MemberModel).where(MemberModel.id == bindparam('id'))
+MEMBER_BY_CODE = select(MemberModel).where(MemberModel.member_code == bindparam('member_code'))
+MEMBER_ALL = select(MemberModel).order_by(MemberModel.full_name)
+MEMBER_BY_TYPE = select(MemberModel).where(
+    MemberModel.member_type == bindparam('member_type')
+).order_by(MemberModel.full_name)
+MEMBER_BY_STATUS = select(MemberModel).where(
+    MemberModel.status == bindparam('status')
+).order_by(MemberModel.full_name)
+MEMBER_CHANGED_ALL = select(MemberModel).order_by(MemberModel.updated_at, MemberModel.id)
+MEMBER_CHANGED_SINCE = select(MemberModel).where(
+    MemberModel.updated_at > bindparam('watermark')
+).order_by(MemberModel.updated_at, MemberModel.id)
+MEMBER_FRAME = _frame_columns(MemberModel, MemberFrame)
+
+# Reports
+REPORT_BY_ID = select(ReportModel).where(ReportModel.id == bindparam('id'))
+REPORT_ALL = select(ReportModel).order_by(ReportModel.created_at.desc())
+REPORT_BY_TYPE = select(ReportModel).where(
+    ReportModel.report_type == bindparam('report_type')
+).order_by(ReportModel.created_at.desc())
+REPORT_BY_STATUS = select(ReportModel).where(
+    ReportModel.status == bindparam('status')
+).order_by(ReportModel.created_at.desc())
+REPORT_BY_PERIOD = select(ReportModel).where(
+    ReportModel.period == bindparam('period')
+).order_by(ReportModel.created_at.desc())
+# Khoảng kỳ: period_start bị chặn cả hai đầu (kỳ dài nhất MAX_PERIOD_DAYS) nên là một range scan
+# trên ix_reports_period_start_end, period_end lọc ngay trong index
+REPORT_COVERING = select(ReportModel).where(
+    ReportModel.period_start >= bindparam('earliest'),
+    ReportModel.period_start <= bindparam('day'),
+    ReportModel.period_end >= bindparam('day'),
+).order_by(ReportModel.period_start, ReportModel.period_end.desc(), ReportModel.created_at.desc())
+REPORT_OVERLAPPING = select(ReportModel).where(
+    ReportModel.period_start >= bindparam('earliest'),
+    ReportModel.period_start <= bindparam('end'),
+    ReportModel.period_end >= bindparam('start'),
+).order_by(ReportModel.period_start, ReportModel.period_end.desc(), ReportModel.created_at.desc())
+REPORT_WITHIN = select(ReportModel).where(
+    ReportModel.period_start >= bindparam('start'),
+    ReportModel.period_start <= bindparam('end'),
+    ReportModel.period_end <= bindparam('end'),
+).order_by(ReportModel.period_start, ReportModel.period_end.desc(), ReportModel.created_at.desc())
+REPORT_COUNT_BY_STATUS = select(func.count(ReportModel.id)).where(ReportModel.status == bindparam('status'))
+REPORT_CHANGED_ALL = select(ReportModel).order_by(ReportModel.updated_at, ReportModel.id)
+REPORT_CHANGED_SINCE = select(ReportModel).where(
+    ReportModel.updated_at > bindparam('watermark')
+).order_by(ReportModel.updated_at, ReportModel.id)
+REPORT_FRAME = _frame_columns(ReportModel, ReportFrame)
+
+# Attachments - chỉ metadata, nội dung file không nằm trong database
+ATTACHMENT_BY_ID = select(AttachmentModel).where(AttachmentModel.id == bindparam('id'))
+ATTACHMENT_BY_REPORT = select(AttachmentModel).where(
+    AttachmentModel.report_id == bindparam('report_id')
+).order_by(AttachmentModel.created_at, AttachmentModel.id)
+ATTACHMENT_COUNT_BY_REPORTS = select(AttachmentModel.report_id, func.count(AttachmentModel.id)).where(
+    AttachmentModel.report_id.in_(bindparam('report_ids', expanding=True))
+).group_by(AttachmentModel.report_id)
+ATTACHMENT_REFERENCED_SHA256 = select(AttachmentModel.sha256).where(
+    AttachmentModel.sha256.in_(bindparam('hashes', expanding=True))
+).distinct()
+
+# Report revisions - danh sách chỉ đọc metadata, dựng lại nội dung đọc snapshot gần nhất + các delta sau nó
+REVISION_META_COLUMNS = (
+    ReportRevisionModel.id, ReportRevisionModel.report_id, ReportRevisionModel.revision,
+    ReportRevisionModel.is_snapshot, ReportRevisionModel.content_length, ReportRevisionModel.content_sha256,
+    ReportRevisionModel.created_by, ReportRevisionModel.created_at,
+)
+REVISION_BY_REPORT = select(*REVISION_META_COLUMNS).where(
+    ReportRevisionModel.report_id == bindparam('report_id')
+).order_by(ReportRevisionModel.revision.desc())
+REVISION_LATEST = REVISION_BY_REPORT.limit(1)
+_chain_start = select(func.max(ReportRevisionModel.revision)).where(
+    ReportRevisionModel.report_id == bindparam('report_id'),
+    ReportRevisionModel.is_snapshot.is_(True),
+    ReportRevisionModel.revision <= bindparam('revision'),
+).scalar_subquery()
+REVISION_CHAIN = select(ReportRevisionModel).where(
+    ReportRevisionModel.report_id == bindparam('report_id'),
+    ReportRevisionModel.revision >= _chain_start,
+    ReportRevisionModel.revision <= bindparam('revision'),
+).order_by(ReportRevisionModel.revision)
+
+# Tasks
+TASK_BY_ID = select(TaskModel).where(TaskModel.id == bindparam('id'))
+TASK_ALL = select(TaskModel).order_by(TaskModel.created_at.desc())
+TASK_BY_ASSIGNEE = select(TaskModel).where(
+    TaskModel.assigned_to == bindparam('assigned_to')
+).order_by(TaskModel.due_date.asc())
+TASK_BY_STATUS = select(TaskModel).where(
+    TaskModel.status == bindparam('status')
+).order_by(TaskModel.due_date.asc())
+TASK_OPEN_DEADLINES = select(TaskModel.id, TaskModel.title, TaskModel.assigned_to, TaskModel.due_date).where(
+    TaskModel.status.in_(OPEN_STATUSES),
+    TaskModel.due_date > bindparam('since'),
+).order_by(TaskModel.due_date)
+TASK_COUNT_BY_STATUS = select(func.count(TaskModel.id)).where(TaskModel.status == bindparam('status'))
+TASK_CHANGED_ALL = select(TaskModel).order_by(TaskModel.updated_at, TaskModel.id)
+TASK_CHANGED_SINCE = select(TaskModel).where(
+    TaskModel.updated_at > bindparam('watermark')
+).order_by(TaskModel.updated_at, TaskModel.id)
+TASK_FRAME = _frame_columns(TaskModel, TaskFrame)
+
+# Workload một thành viên (index ix_tasks_assigned_to_status_due_date): nhóm tính trên server
+_WORKLOAD_OVERDUE = TaskModel.status == TaskStatus.OVERDUE
+_WORKLOAD_IN_PROGRESS = TaskModel.status == TaskStatus.IN_PROGRESS
+_WORKLOAD_UPCOMING = and_(
+    TaskModel.status.in_(OPEN_STATUSES),
+    TaskModel.due_date >= bindparam('start'),
+    TaskModel.due_date < bindparam('until'),
+)
+WORKLOAD_COUNTS = select(
+    func.count(TaskModel.id).label('assigned_to_me'),
+    select(func.count(TaskModel.id)).where(
+        TaskModel.assigned_by == bindparam('member_id')
+    ).correlate(None).scalar_subquery().label('created_by_me'),
+    func.count(TaskModel.id).filter(_WORKLOAD_OVERDUE).label('overdue'),
+    func.count(TaskModel.id).filter(_WORKLOAD_UPCOMING).label('upcoming'),
+    func.count(TaskModel.id).filter(_WORKLOAD_IN_PROGRESS).label('in_progress'),
+).where(TaskModel.assigned_to == bindparam('member_id'))
+# Dòng đếm LEFT JOIN công việc thuộc ít nhất một nhóm: luôn có ít nhất một dòng, một round trip
+_workload_counts = WORKLOAD_COUNTS.subquery('workload_counts')
+WORKLOAD_TASKS = select(
+    _workload_counts, TaskModel,
+    _WORKLOAD_OVERDUE.label('is_overdue'),
+    _WORKLOAD_UPCOMING.label('is_upcoming'),
+    _WORKLOAD_IN_PROGRESS.label('is_in_progress'),
+).select_from(_workload_counts).outerjoin(TaskModel, and_(
+    TaskModel.assigned_to == bindparam('member_id'),
+    or_(_WORKLOAD_OVERDUE, _WORKLOAD_IN_PROGRESS, _WORKLOAD_UPCOMING),
+)).order_by(TaskModel.due_date)
+
+# Giờ ước tính / thực tế của công việc hoàn thành trong [start, end) - chỉ PostgreSQL
+# (GROUPING SETS + percentile_cont): một câu trả về dòng thành viên, dòng đơn vị và dòng tổng
+_HOURS_RATIO = TaskModel.actual_hours / func.nullif(TaskModel.estimated_hours, 0)
+_HOURS_LEVEL = func.grouping(TaskModel.assigned_to, MemberModel.department)  # 0 thành viên, 2 đơn vị, 3 tổng
+_HOURS_ACTUAL = func.coalesce(func.sum(TaskModel.actual_hours), 0)
+HOURS_ANALYTICS = select(
+    _HOURS_LEVEL.label('level'),
+    MemberModel.department,
+    TaskModel.assigned_to,
+    func.min(MemberModel.full_name).label('full_name'),
+    func.count(TaskModel.id).label('tasks'),
+    func.count(func.distinct(TaskModel.assigned_to)).label('members'),
+    func.coalesce(func.sum(TaskModel.estimated_hours), 0).label('estimated_hours'),
+    _HOURS_ACTUAL.label('actual_hours'),
+    (func.sum(TaskModel.actual_hours) / func.nullif(func.sum(TaskModel.estimated_hours), 0)).label('estimate_ratio'),
+    func.percentile_cont(0.5).within_group(_HOURS_RATIO).label('median_ratio'),
+    (_HOURS_ACTUAL / (bindparam('capacity_hours') * func.count(func.distinct(TaskModel.assigned_to))))
+    .label('utilization'),
+    func.percentile_cont(0.5).within_group(TaskModel.actual_hours).label('p50_hours'),
+    func.percentile_cont(0.75).within_group(TaskModel.actual_hours).label('p75_hours'),
+    func.percentile_cont(0.9).within_group(TaskModel.actual_hours).label('p90_hours'),
+    func.rank().over(partition_by=(_HOURS_LEVEL, MemberModel.department),
+                     order_by=_HOURS_ACTUAL.desc()).label('rank_in_department'),
+).select_from(TaskModel).join(MemberModel, MemberModel.id == TaskModel.assigned_to).where(
+    TaskModel.status == TaskStatus.COMPLETED,
+    TaskModel.completed_date >= bindparam('start'),
+    TaskModel.completed_date < bindparam('end'),
+).group_by(func.grouping_sets(
+    tuple_(MemberModel.department, TaskModel.assigned_to), tuple_(MemberModel.department), tuple_(),
+)).order_by(MemberModel.department, _HOURS_ACTUAL.desc())
@@ -1,11 +1,14 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
+from decimal import Decimal
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_
-from domain.entities.task import Task, TaskPriority, TaskStatus
+from domain.entities.task import Task, TaskPriority, TaskStatus, Workload
+from domain.entities.frames import CHUNK_ROWS, TaskFrame
 from domain.repositories.task_repository import ITaskRepository
 from infrastructure.database.models import TaskModel
 from infrastructure.database.connection import db_manager
+from infrastructure.repositories import statements, tombstones
 
 
 class TaskRepository(ITaskRepository):
@@ -16,7 +19,7 @@ class TaskRepository(ITaskRepository):
     
     def _model_to_entity(self, model: TaskModel) -> Task:
         """Chuyển đổi từ SQLAlchemy model sang Domain entity"""
-        return Task(
+        return Task.hydrate(
             id=model.id,
             title=model.title,
             description=model.description,
@@ -61,6 +64,7 @@ class TaskRepository(ITaskRepository):
         session: Session = self.db_manager.get_session()
         try:
             model = self._entity_to_model(task)
+            model.updated_at = func.now()  # Đồng hồ server - làm watermark cho đồng bộ tăng dần
             session.add(model)
             session.commit()
             session.refresh(model)
@@ -75,7 +79,7 @@ class TaskRepository(ITaskRepository):
         """Lấy công việc theo ID"""
         session: Session = self.db_manager.get_session()
         try:
-            model = session.query(TaskModel).filter(TaskModel.id == task_id).first()
+            model = session.scalars(statements.TASK_BY_ID, {'id': task_id}).first()
             return self._model_to_entity(model) if model else None
         finally:
             session.close()
@@ -84,7 +88,7 @@ class TaskRepository(ITaskRepository):
         """Lấy tất cả công việc"""
         session: Session = self.db_manager.get_session()
         try:
-            models = session.query(TaskModel).order_by(TaskModel.created_at.desc()).all()
+            models = session.scalars(statements.TASK_ALL).all()
             return [self._model_to_entity(model) for model in models]
         finally:
             session.close()
@@ -93,9 +97,7 @@ class TaskRepository(ITaskRepository):
         """Lấy công việc theo người được giao"""
         session: Session = self.db_manager.get_session()
         try:
-            models = session.query(TaskModel).filter(
-                TaskModel.assigned_to == assignee_id
-            ).order_by(TaskModel.due_date.asc()).all()
+            models = session.scalars(statements.TASK_BY_ASSIGNEE, {'assigned_to': assignee_id}).all()
             return [self._model_to_entity(model) for model in models]
         finally:
             session.close()
@@ -115,9 +117,7 @@ class TaskRepository(ITaskRepository):
         """Lấy công việc theo trạng thái"""
         session: Session = self.db_manager.get_session()
         try:
-            models = session.query(TaskModel).filter(
-                TaskModel.status == status
-            ).order_by(TaskModel.due_date.asc()).all()
+            models = session.scalars(statements.TASK_BY_STATUS, {'status': status}).all()
             return [self._model_to_entity(model) for model in models]
         finally:
             session.close()
@@ -147,17 +147,68 @@ class TaskRepository(ITaskRepository):
         finally:
             session.close()
     
+    def get_open_deadlines(self, since: datetime) -> List[Tuple[int, str, Optional[int], datetime]]:
+        """(id, title, assigned_to, due_date) của công việc đang mở có hạn sau ``since`` (index ix_tasks_open_due_date)"""
+        session: Session = self.db_manager.get_session()
+        try:
+            return [tuple(row) for row in session.execute(statements.TASK_OPEN_DEADLINES, {'since': since})]
+        finally:
+            session.close()
+    
+    def get_workload(self, member_id: int, start: datetime, until: datetime,
+                     counts_only: bool = False) -> Workload:
+        """Workload của thành viên từ một truy vấn; sắp hết hạn là due_date trong [start, until)"""
+        params = {'member_id': member_id, 'start': start, 'until': until}
+        session: Session = self.db_manager.get_session()
+        try:
+            if counts_only:
+                return Workload(**session.execute(statements.WORKLOAD_COUNTS, params).one()._asdict())
+            workload = None
+            for row in session.execute(statements.WORKLOAD_TASKS, params):
+                if workload is None:
+                    workload = Workload(assigned_to_me=row.assigned_to_me, created_by_me=row.created_by_me,
+                                        overdue=row.overdue, upcoming=row.upcoming, in_progress=row.in_progress)
+                if row.TaskModel is None:
+                    continue
+                task = self._model_to_entity(row.TaskModel)
+                if row.is_overdue:
+                    workload.overdue_tasks.append(task)
+                if row.is_upcoming:
+                    workload.upcoming_tasks.append(task)
+                if row.is_in_progress:
+                    workload.in_progress_tasks.append(task)
+            return workload
+        finally:
+            session.close()
+    
+    def get_hours_analytics(self, start: datetime, end: datetime, capacity_hours: float) -> dict:
+        """Giờ ước tính/thực tế của công việc hoàn thành trong [start, end) theo thành viên, đơn vị và tổng"""
+        session: Session = self.db_manager.get_session()
+        try:
+            rows = session.execute(statements.HOURS_ANALYTICS,
+                                   {'start': start, 'end': end, 'capacity_hours': capacity_hours}).mappings()
+            result = {'total': None, 'departments': [], 'members': []}
+            for row in rows:
+                values = {key: float(value) if isinstance(value, Decimal) else value
+                          for key, value in row.items() if key != 'level'}
+                if row['level'] == 0:
+                    result['members'].append(values)
+                    continue
+                # Dòng gộp: tên và hạng trong đơn vị chỉ có nghĩa với dòng thành viên
+                del values['assigned_to'], values['full_name'], values['rank_in_department']
+                if row['level'] == 3:
+                    result['total'] = values
+                else:
+                    result['departments'].append(values)
+            return result
+        finally:
+            session.close()
+    
     def get_overdue_tasks(self) -> List[Task]:
-        """Lấy công việc quá hạn"""
+        """Lấy công việc quá hạn (trạng thái do job quá hạn đánh dấu)"""
         session: Session = self.db_manager.get_session()
         try:
-            now = datetime.now()
-            models = session.query(TaskModel).filter(
-                and_(
-                    TaskModel.due_date < now,
-                    TaskModel.status.notin_([TaskStatus.COMPLETED, TaskStatus.CANCELLED])
-                )
-            ).order_by(TaskModel.due_date.asc()).all()
+            models = session.scalars(statements.TASK_BY_STATUS, {'status': TaskStatus.OVERDUE}).all()
             return [self._model_to_entity(model) for model in models]
         finally:
             session.close()
@@ -195,7 +246,7 @@ class TaskRepository(ITaskRepository):
             model.actual_hours = task.actual_hours
             model.progress_percentage = task.progress_percentage
             model.notes = task.notes
-            model.updated_at = task.updated_at
+            model.updated_at = func.now()
             
             session.commit()
             session.refresh(model)
@@ -215,6 +266,7 @@ class TaskRepository(ITaskRepository):
                 return False
             
             session.delete(model)
+            tombstones.record_deletion(session, TaskModel.__tablename__, task_id)
             session.commit()
             return True
         except Exception as e:
@@ -227,9 +279,7 @@ class TaskRepository(ITaskRepository):
         """Đếm số công việc theo trạng thái"""
         session: Session = self.db_manager.get_session()
         try:
-            count = session.query(func.count(TaskModel.id)).filter(
-                TaskModel.status == status
-            ).scalar()
+            count = session.scalar(statements.TASK_COUNT_BY_STATUS, {'status': status})
             return count or 0
         finally:
             session.close()
@@ -249,10 +299,7 @@ class TaskRepository(ITaskRepository):
                 TaskModel.status == TaskStatus.NOT_STARTED
             ).scalar() or 0
             overdue_tasks = session.query(func.count(TaskModel.id)).filter(
-                and_(
-                    TaskModel.due_date < datetime.now(),
-                    TaskModel.status.notin_([TaskStatus.COMPLETED, TaskStatus.CANCELLED])
-                )
+                TaskModel.status == TaskStatus.OVERDUE
             ).scalar() or 0
             
             return {
@@ -264,4 +311,33 @@ class TaskRepository(ITaskRepository):
                 'completion_rate': (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
             }
         finally:
-            session.close()
\ No newline at end of file
+            session.close()
+    
+    def changed_since(self, watermark: Optional[datetime]) -> List[Task]:
+        """Lấy công việc được tạo/cập nhật sau watermark (dùng index updated_at)"""
+        session: Session = self.db_manager.get_session()
+        try:
+            if watermark is None:
+                models = session.scalars(statements.TASK_CHANGED_ALL).all()
+            else:
+                models = session.scalars(statements.TASK_CHANGED_SINCE, {'watermark': watermark}).all()
+            return [self._model_to_entity(model) for model in models]
+        finally:
+            session.close()
+    
+    def load_frame(self) -> TaskFrame:
+        """Nạp toàn bộ công việc dạng cột NumPy cho thống kê (đọc theo khối, không dựng entity)"""
+        session: Session = self.db_manager.get_session()
+        try:
+            result = session.execute(statements.TASK_FRAME, execution_options={'yield_per': CHUNK_ROWS})
+            return TaskFrame.from_chunks(result.partitions())
+        finally:
+            session.close()
+    
+    def deleted_since(self, cursor: Optional[int]) -> Tuple[List[int], int]:
+        """Lấy ID công việc đã xóa sau cursor của bảng tombstone"""
+        session: Session = self.db_manager.get_session()
+        try:
+            return tombstones.deleted_since(session, TaskModel.__tablename__, cursor)
+        finally:
+            session.close()
@@ -0,0 +1,36 @@
+"""
+Tombstone helpers
+Ghi nhận bản ghi bị xóa vào bảng deleted_records và đọc lại theo cursor (id tăng dần)
+"""
+from typing import List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from infrastructure.database.models import DeletedRecordModel
+
+
+def record_deletion(session: Session, table_name: str, record_id: int):
+    """Thêm tombstone trong cùng transaction với lệnh xóa"""
+    session.add(DeletedRecordModel(table_name=table_name, record_id=record_id))
+
+
+def deleted_since(session: Session, table_name: str, cursor: Optional[int]) -> Tuple[List[int], int]:
+    """
+    Lấy ID đã xóa có tombstone id > cursor.
+
+    Cursor là id của tombstone (sequence của server) nên không phụ thuộc đồng hồ
+    client. Với cursor None chỉ trả về vị trí hiện tại - gọi trước lần tải đầy đủ
+    để không bỏ sót lần xóa nào xảy ra trong lúc tải.
+    """
+    if cursor is None:
+        latest = session.query(func.max(DeletedRecordModel.id)).filter(
+            DeletedRecordModel.table_name == table_name
+        ).scalar()
+        return [], latest or 0
+
+    rows = session.query(DeletedRecordModel.id, DeletedRecordModel.record_id).filter(
+        DeletedRecordModel.table_name == table_name,
+        DeletedRecordModel.id > cursor
+    ).order_by(DeletedRecordModel.id).all()
+    if not rows:
+        return [], cursor
+    return [record_id for _, record_id in rows], rows[-1][0]
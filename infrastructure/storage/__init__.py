@@ -0,0 +1 @@
+# Storage - kho file đính kèm
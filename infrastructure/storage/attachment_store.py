@@ -0,0 +1,227 @@
+"""
+Attachment store
+Kho file đính kèm theo nội dung: ghi theo khối vào file tạm đồng thời băm SHA-256 và chặn kích thước,
+đổi tên nguyên tử về ``objects/ab/cd/<sha256>`` - cùng nội dung chỉ lưu một lần; file lớn đọc qua mmap
+"""
+import hashlib
+import mmap
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import BinaryIO, Callable, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from config.settings import config
+
+# Kích thước khối đọc/ghi khi nhận file
+CHUNK_SIZE = 1024 * 1024
+# File từ ngưỡng này trở lên được map thay vì đọc vào bộ nhớ
+MMAP_THRESHOLD = 1024 * 1024
+# Đối tượng/file tạm mới ghi hoặc vừa được dùng lại trong khoảng này không bị dọn (upload đang chờ ghi metadata)
+GC_GRACE_SECONDS = 3600
+# Số hash hỏi database mỗi lần khi dọn kho
+GC_BATCH_SIZE = 500
+
+_SHA256 = re.compile(r'^[0-9a-f]{64}$')
+
+
+class AttachmentStore:
+    """
+    Lưu nội dung file theo SHA-256 dưới ``root``.
+
+    ``put`` không bao giờ giữ cả file trong bộ nhớ: mỗi khối được băm và ghi
+    vào file tạm cùng thư mục gốc, vượt ``max_size`` thì hủy ngay. File tạm
+    chỉ được đổi tên thành đối tượng khi đã ghi đủ nên người đọc không thấy
+    file dở dang; đối tượng đã tồn tại (trùng nội dung) thì bỏ file tạm.
+
+    Kho không tự xóa khi bỏ metadata: ``collect_garbage`` dọn đối tượng không
+    còn được tham chiếu và cũ hơn ``GC_GRACE_SECONDS``. ``put`` cập nhật mtime
+    của đối tượng trùng nên lần tải lên chưa kịp ghi metadata không bị dọn mất.
+    """
+
+    def __init__(self, root: str, max_size: Optional[int] = None, chunk_size: int = CHUNK_SIZE):
+        self.root = root
+        self.max_size = config.MAX_FILE_SIZE if max_size is None else max_size
+        self.chunk_size = chunk_size
+        self._objects = os.path.join(root, 'objects')
+        self._tmp = os.path.join(root, 'tmp')
+        os.makedirs(self._objects, exist_ok=True)
+        os.makedirs(self._tmp, exist_ok=True)
+
+    def path_for(self, sha256: str) -> str:
+        """Đường dẫn đối tượng (hai cấp thư mục theo 4 ký tự đầu để thư mục không quá lớn)"""
+        if not _SHA256.match(sha256):
+            raise ValueError(f"SHA-256 không hợp lệ: {sha256}")
+        return os.path.join(self._objects, sha256[:2], sha256[2:4], sha256)
+
+    def exists(self, sha256: str) -> bool:
+        return os.path.exists(self.path_for(sha256))
+
+    # Ghi
+    def put(self, source: Union[str, BinaryIO]) -> Tuple[str, int]:
+        """Lưu file (đường dẫn hoặc stream nhị phân có readinto), trả về (sha256, số byte)"""
+        if isinstance(source, (str, os.PathLike)):
+            size = os.path.getsize(source)
+            if size > self.max_size:
+                raise ValueError(self._too_large_message(size))
+            with open(source, 'rb') as stream:
+                return self._put_stream(stream)
+        return self._put_stream(source)
+
+    def _put_stream(self, stream: BinaryIO) -> Tuple[str, int]:
+        digest = hashlib.sha256()
+        buffer = bytearray(self.chunk_size)
+        view = memoryview(buffer)
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self._tmp, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                while True:
+                    read = stream.readinto(buffer)
+                    if not read:
+                        break
+                    size += read
+                    if size > self.max_size:
+                        raise ValueError(self._too_large_message(size))
+                    digest.update(view[:read])
+                    out.write(view[:read])
+                out.flush()
+                os.fsync(out.fileno())
+
+            sha256 = digest.hexdigest()
+            target = self.path_for(sha256)
+            if self._touch(target):
+                os.remove(tmp_path)  # Đã có cùng nội dung - mtime mới giữ nó khỏi lần dọn kho
+            else:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(tmp_path, target)
+            return sha256, size
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @staticmethod
+    def _touch(path: str) -> bool:
+        try:
+            os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _too_large_message(self, size: int) -> str:
+        return f"File vượt quá giới hạn {self.max_size // 1024 // 1024} MB ({size:,} byte)"
+
+    # Đọc
+    @contextmanager
+    def open(self, sha256: str) -> Iterator[Union[bytes, mmap.mmap]]:
+        """
+        Nội dung chỉ đọc: ``bytes`` với file nhỏ, ``mmap`` với file từ MMAP_THRESHOLD -
+        hệ điều hành nạp trang theo nhu cầu nên xem/xuất file lớn không sao chép cả file vào bộ nhớ
+        """
+        with open(self.path_for(sha256), 'rb') as handle:
+            size = os.fstat(handle.fileno()).st_size
+            if size < MMAP_THRESHOLD:
+                yield handle.read()
+                return
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+
+    def iter_chunks(self, sha256: str) -> Iterator[bytes]:
+        """Đọc tuần tự theo khối (gửi qua mạng, ghi ra stream khác)"""
+        with open(self.path_for(sha256), 'rb') as handle:
+            for chunk in iter(lambda: handle.read(self.chunk_size), b''):
+                yield chunk
+
+    def copy_to(self, sha256: str, destination: str):
+        """Xuất ra file (copyfile dùng sendfile/copy_file_range của hệ điều hành khi có)"""
+        shutil.copyfile(self.path_for(sha256), destination)
+
+    def verify(self, sha256: str) -> bool:
+        """Băm lại nội dung để phát hiện file hỏng"""
+        digest = hashlib.sha256()
+        with self.open(sha256) as content:
+            digest.update(content)
+        return digest.hexdigest() == sha256
+
+    # Xóa
+    def delete(self, sha256: str) -> bool:
+        """Xóa đối tượng - chỉ gọi khi không còn metadata nào trỏ tới"""
+        try:
+            os.remove(self.path_for(sha256))
+            return True
+        except FileNotFoundError:
+            return False
+
+
+    def collect_garbage(self, get_referenced: Callable[[Iterable[str]], Set[str]],
+                        grace_seconds: float = GC_GRACE_SECONDS) -> int:
+        """
+        Xóa đối tượng cũ hơn ``grace_seconds`` mà ``get_referenced`` (hash -> hash còn metadata)
+        không trả về, cùng file tạm bị bỏ dở; trả về số đối tượng đã xóa.
+
+        Đối tượng được đổi tên sang thư mục tạm trước rồi mới kiểm tra lại mtime: ``put`` chạy
+        song song hoặc đã cập nhật mtime (khôi phục lại), hoặc không thấy file và tự ghi bản mới.
+        """
+        cutoff = time.time() - grace_seconds
+        for name in os.listdir(self._tmp):
+            self._remove_if_older(os.path.join(self._tmp, name), cutoff)
+
+        candidates: List[str] = []
+        for directory, _, files in os.walk(self._objects):
+            for name in files:
+                if _SHA256.match(name) and self._mtime(os.path.join(directory, name)) < cutoff:
+                    candidates.append(name)
+
+        removed = 0
+        for start in range(0, len(candidates), GC_BATCH_SIZE):
+            batch = candidates[start:start + GC_BATCH_SIZE]
+            referenced = get_referenced(batch)
+            for sha256 in batch:
+                if sha256 not in referenced and self._collect(sha256, cutoff):
+                    removed += 1
+        return removed
+
+    def _collect(self, sha256: str, cutoff: float) -> bool:
+        target = self.path_for(sha256)
+        trash = os.path.join(self._tmp, f"{sha256}.gc")
+        try:
+            os.replace(target, trash)
+        except FileNotFoundError:
+            return False
+        if self._mtime(trash) >= cutoff:
+            # Vừa được put dùng lại - trả về chỗ cũ
+            os.replace(trash, target)
+            return False
+        os.remove(trash)
+        return True
+
+    @staticmethod
+    def _mtime(path: str) -> float:
+        try:
+            return os.path.getmtime(path)
+        except FileNotFoundError:
+            return float('inf')
+
+    def _remove_if_older(self, path: str, cutoff: float):
+        if self._mtime(path) < cutoff:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+_store: Optional[AttachmentStore] = None
+_store_lock = threading.Lock()
+
+
+def get_attachment_store() -> AttachmentStore:
+    """Kho dùng chung của ứng dụng dưới UPLOAD_FOLDER"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = AttachmentStore(os.path.join(config.UPLOAD_FOLDER, 'attachments'))
+        return _store
@@ -10,7 +10,11 @@ import traceback
 
 from domain.entities.member import Member, MemberType, MemberStatus
 from application.use_cases.member_management import MemberManagementUseCase
-from infrastructure.repositories.member_repository_impl import MemberRepository
+from application.services.delta_sync import DeltaSync
+from infrastructure.repositories import create_repositories
+from infrastructure.database.query_instrumentation import user_action
+from infrastructure.monitoring import tracing
+from presentation.gui.ui_watchdog import ui_timed
 from presentation.gui.member_components import (
     MemberTab, MemberForm, MemberActions, 
     MemberFilters, MemberStats
@@ -20,10 +24,17 @@ from presentation.gui.member_components import (
 class MemberController:
     """Controller cho quản lý thành viên với đầy đủ chức năng CRUD"""
     
-    def __init__(self, parent_widget: tk.Widget):
+    def __init__(self, parent_widget: tk.Widget, auto_load: bool = True,
+                 member_use_case: Optional[MemberManagementUseCase] = None,
+                 member_delta: Optional[DeltaSync] = None):
         self.parent = parent_widget
-        self.member_repository = MemberRepository()
-        self.member_use_case = MemberManagementUseCase(self.member_repository)
+        self.member_delta = member_delta
+        if member_use_case:
+            self.member_use_case = member_use_case
+            self.member_repository = member_use_case.member_repository
+        else:
+            self.member_repository = create_repositories()[0]
+            self.member_use_case = MemberManagementUseCase(self.member_repository)
         
         # GUI components
         self.member_frame = None
@@ -37,7 +48,10 @@ class MemberController:
         self.filtered_members = []
         
         self._setup_ui()
-        self._load_initial_data()
+        
+        # auto_load=False: để caller tự gọi refresh_data() khi tab thực sự được mở
+        if auto_load:
+            self._load_initial_data()
     
     def _setup_ui(self):
         """Thiết lập giao diện người dùng"""
@@ -68,13 +82,21 @@ class MemberController:
         except Exception as e:
             self._show_error("Lỗi tải dữ liệu", f"Không thể tải danh sách thành viên: {str(e)}")
     
-    def refresh_data(self):
-        """Làm mới dữ liệu từ database"""
+    @tracing.action('Làm mới thành viên')
+    @ui_timed('MemberController.refresh_data')
+    def refresh_data(self, members: Optional[List[Member]] = None):
+        """Làm mới dữ liệu từ database (hoặc từ danh sách được truyền vào)"""
         try:
             self._update_status("Đang tải dữ liệu...", "info")
             
-            # Lấy danh sách thành viên
-            self.all_members = self.member_use_case.get_all_members()
+            # Lấy danh sách thành viên - qua delta sync chỉ tải phần thay đổi
+            if members is None and self.member_delta is not None:
+                changed = self.member_delta.refresh()
+                if not changed and self.all_members:
+                    self._update_status(f"Đã tải {len(self.all_members)} thành viên", "success")
+                    return
+                members = list(self.member_delta.items)
+            self.all_members = members if members is not None else self.member_use_case.get_all_members()
             self.filtered_members = self.all_members.copy()
             
             # Cập nhật bảng
@@ -90,6 +112,7 @@ class MemberController:
             self._show_error("Lỗi làm mới dữ liệu", str(e))
             self._update_status("Lỗi tải dữ liệu", "error")
     
+    @tracing.action('Thêm thành viên')
     def add_member(self):
         """Thêm thành viên mới"""
         try:
@@ -122,6 +145,7 @@ class MemberController:
         except Exception as e:
             self._show_error("Lỗi thêm thành viên", str(e))
     
+    @tracing.action('Sửa thành viên')
     def edit_member(self):
         """Chỉnh sửa thành viên"""
         try:
@@ -167,6 +191,7 @@ class MemberController:
         except Exception as e:
             self._show_error("Lỗi cập nhật thành viên", str(e))
     
+    @tracing.action('Xóa thành viên')
     def delete_member(self):
         """Xóa thành viên"""
         try:
@@ -251,6 +276,8 @@ class MemberController:
         except Exception as e:
             self._show_error("Lỗi áp dụng bộ lọc", str(e))
     
+    @tracing.action('Thao tác hàng loạt thành viên')
+    @user_action('bulk_action_members')
     def bulk_action(self, action: str):
         """Thực hiện thao tác hàng loạt"""
         try:
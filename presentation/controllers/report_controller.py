@@ -10,7 +10,7 @@ from tkinter import messagebox
 
 from domain.entities.report import Report, ReportType, ReportStatus
 from application.use_cases.report_management import ReportManagementUseCase
-from infrastructure.repositories.report_repository_impl import ReportRepository
+from infrastructure.repositories import create_repositories
 from config.logging_config import setup_logging
 
 # Thiết lập logging
@@ -27,7 +27,7 @@ class ReportController:
             self.report_use_case = report_use_case
         else:
             # Fallback to create use case internally
-            self.report_repository = ReportRepository()
+            self.report_repository = create_repositories()[1]
             self.report_use_case = ReportManagementUseCase(self.report_repository)
         logger.info("ReportController khởi tạo thành công")
     
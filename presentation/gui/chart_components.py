@@ -0,0 +1,283 @@
+"""
+Chart Rendering Components
+Off-thread matplotlib rendering with persistent figures and a PNG cache for the statistics window
+"""
+
+import base64
+import hashlib
+import importlib.util
+import io
+import json
+import math
+import queue
+import threading
+import tkinter as tk
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from presentation.gui.tk_dispatch import get_tk_dispatcher
+
+
+MATPLOTLIB_AVAILABLE = importlib.util.find_spec("matplotlib") is not None
+
+# Nhãn và màu của từng biểu đồ
+MEMBER_LABELS = ['Đoàn viên', 'Hội viên', 'Cán bộ']
+MEMBER_COLORS = ['#3b82f6', '#10b981', '#f59e0b']
+REPORT_CATEGORIES = ['Nháp', 'Chờ duyệt', 'Đã duyệt', 'Từ chối']
+REPORT_COLORS = ['#94a3b8', '#f59e0b', '#10b981', '#ef4444']
+TASK_CATEGORIES = ['Chưa bắt đầu', 'Đang thực hiện', 'Hoàn thành', 'Quá hạn']
+TASK_COLORS = ['#94a3b8', '#3b82f6', '#10b981', '#ef4444']
+
+
+def _load_matplotlib():
+    """Import matplotlib on first use; figures render through Agg directly, without pyplot"""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    return Figure, FigureCanvasAgg
+
+
+def stats_fingerprint(chart_key: str, stats: Dict[str, Any]) -> str:
+    """Hash of the statistics that feed one chart, used as the cache key"""
+    payload = json.dumps(stats, sort_keys=True, default=str)
+    return hashlib.sha1(f"{chart_key}:{payload}".encode("utf-8")).hexdigest()
+
+
+class _ChartState:
+    """Persistent figure plus the artists that get updated in place"""
+
+    def __init__(self, figure, canvas, axes, artists: Dict[str, Any]):
+        self.figure = figure
+        self.canvas = canvas
+        self.axes = axes
+        self.artists = artists
+
+
+class ChartRenderer:
+    """
+    Render statistics charts on a single worker thread.
+
+    Figures are created once per chart and only their artists are updated on
+    later renders. Rendered PNG bytes are cached by a hash of the input
+    statistics, so reopening the window or refreshing unchanged data skips
+    matplotlib entirely.
+    """
+
+    MAX_CACHE_ENTRIES = 32
+
+    def __init__(self):
+        self._states: Dict[str, _ChartState] = {}
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._latest: Dict[str, str] = {}  # chart_key -> fingerprint của lần render gần nhất
+        self._pending: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[str]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._builders = {
+            'members': (self._build_member_chart, self._update_member_chart),
+            'reports': (self._build_report_chart, self._update_report_chart),
+            'tasks': (self._build_task_chart, self._update_task_chart),
+        }
+
+    # Public API
+    def get_cached(self, chart_key: str, stats: Dict[str, Any]) -> Optional[bytes]:
+        """Lấy ảnh PNG đã render cho dữ liệu này nếu có trong cache"""
+        fingerprint = stats_fingerprint(chart_key, stats)
+        with self._lock:
+            png = self._cache.get(fingerprint)
+            if png is not None:
+                self._cache.move_to_end(fingerprint)
+            return png
+
+    def get_last_rendered(self, chart_key: str) -> Optional[bytes]:
+        """Lấy ảnh render gần nhất của biểu đồ (dùng hiển thị ngay khi mở lại cửa sổ)"""
+        with self._lock:
+            fingerprint = self._latest.get(chart_key)
+            return self._cache.get(fingerprint) if fingerprint else None
+
+    def render(self, widget: tk.Widget, chart_key: str, stats: Dict[str, Any],
+               on_ready: Callable[[bytes], None]) -> None:
+        """
+        Request a chart image for the given statistics.
+
+        ``on_ready`` is always invoked on the Tk thread: immediately on a cache
+        hit, otherwise through the Tk dispatcher queue once the worker has
+        rendered it (the worker never calls into Tk).
+        Repeated requests for the same chart before the worker picks them up
+        are coalesced to the most recent one.
+        """
+        if chart_key not in self._builders:
+            raise ValueError(f"Unknown chart: {chart_key}")
+
+        cached = self.get_cached(chart_key, stats)
+        if cached is not None:
+            with self._lock:
+                self._latest[chart_key] = stats_fingerprint(chart_key, stats)
+            on_ready(cached)
+            return
+
+        with self._lock:
+            already_queued = chart_key in self._pending
+            self._pending[chart_key] = (get_tk_dispatcher(widget), dict(stats), on_ready)
+        if not already_queued:
+            self._queue.put(chart_key)
+        self._ensure_worker()
+
+    @staticmethod
+    def to_photo_image(master: tk.Widget, png: bytes) -> tk.PhotoImage:
+        """Chuyển PNG bytes thành PhotoImage (phải gọi trên Tk thread)"""
+        return tk.PhotoImage(master=master, data=base64.b64encode(png))
+
+    def clear_cache(self):
+        """Xóa toàn bộ ảnh đã cache"""
+        with self._lock:
+            self._cache.clear()
+            self._latest.clear()
+
+    # Worker thread
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="chart-renderer", daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            chart_key = self._queue.get()
+            with self._lock:
+                request = self._pending.pop(chart_key, None)
+            if request is None:
+                continue
+
+            dispatcher, stats, on_ready = request
+            try:
+                png = self._render_png(chart_key, stats)
+            except Exception as e:
+                print(f"Error rendering chart '{chart_key}': {e}")
+                continue
+
+            fingerprint = stats_fingerprint(chart_key, stats)
+            with self._lock:
+                self._cache[fingerprint] = png
+                self._cache.move_to_end(fingerprint)
+                while len(self._cache) > self.MAX_CACHE_ENTRIES:
+                    self._cache.popitem(last=False)
+                self._latest[chart_key] = fingerprint
+
+            # Cửa sổ đã đóng trước khi render xong thì dispatcher bỏ qua - ảnh vẫn nằm trong cache
+            dispatcher.call(on_ready, png)
+
+    def _render_png(self, chart_key: str, stats: Dict[str, Any]) -> bytes:
+        build, update = self._builders[chart_key]
+        state = self._states.get(chart_key)
+        if state is None:
+            state = build()
+            self._states[chart_key] = state
+
+        update(state, stats)
+
+        buffer = io.BytesIO()
+        state.canvas.print_png(buffer)
+        return buffer.getvalue()
+
+    # Chart builders (chạy trên worker thread)
+    @staticmethod
+    def _new_figure(figsize):
+        Figure, FigureCanvasAgg = _load_matplotlib()
+        fig = Figure(figsize=figsize, dpi=100, facecolor='white')
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_subplot(111)
+        return fig, canvas, ax
+
+    def _build_member_chart(self) -> _ChartState:
+        fig, canvas, ax = self._new_figure((5, 3))
+        wedges, texts, autotexts = ax.pie([1, 1, 1], labels=MEMBER_LABELS, colors=MEMBER_COLORS,
+                                          autopct='%1.1f%%', startangle=90)
+        ax.set_title('Phân loại thành viên')
+        empty_text = ax.text(0.5, 0.5, 'Chưa có dữ liệu', ha='center', va='center',
+                             transform=ax.transAxes, visible=False)
+        return _ChartState(fig, canvas, ax, {
+            'wedges': wedges, 'texts': texts, 'autotexts': autotexts, 'empty': empty_text
+        })
+
+    @staticmethod
+    def _update_member_chart(state: _ChartState, member_stats: Dict[str, Any]):
+        sizes = [
+            member_stats.get('union_members', 0),
+            member_stats.get('association_members', 0),
+            member_stats.get('executives', 0)
+        ]
+        total = sum(sizes)
+        artists = state.artists
+        artists['empty'].set_visible(total == 0)
+
+        theta = 90.0
+        for wedge, label, pct, size in zip(artists['wedges'], artists['texts'], artists['autotexts'], sizes):
+            visible = total > 0 and size > 0
+            for artist in (wedge, label, pct):
+                artist.set_visible(visible)
+            if not visible:
+                continue
+
+            span = 360.0 * size / total
+            wedge.set_theta1(theta)
+            wedge.set_theta2(theta + span)
+
+            middle = math.radians(theta + span / 2)
+            x, y = math.cos(middle), math.sin(middle)
+            label.set_position((1.1 * x, 1.1 * y))
+            label.set_horizontalalignment('left' if x >= 0 else 'right')
+            pct.set_position((0.6 * x, 0.6 * y))
+            pct.set_text(f"{100.0 * size / total:.1f}%")
+            theta += span
+
+    def _build_report_chart(self) -> _ChartState:
+        fig, canvas, ax = self._new_figure((5, 3))
+        bars = ax.bar(REPORT_CATEGORIES, [0] * len(REPORT_CATEGORIES), color=REPORT_COLORS)
+        ax.set_title('Trạng thái báo cáo')
+        ax.set_ylabel('Số lượng')
+        value_labels = [ax.text(bar.get_x() + bar.get_width() / 2, 0, '', ha='center', va='bottom')
+                        for bar in bars]
+        return _ChartState(fig, canvas, ax, {'bars': bars, 'values': value_labels})
+
+    @staticmethod
+    def _update_report_chart(state: _ChartState, report_stats: Dict[str, Any]):
+        values = [
+            report_stats.get('draft', 0),
+            report_stats.get('submitted', 0),
+            report_stats.get('approved', 0),
+            report_stats.get('rejected', 0)
+        ]
+        for bar, label, value in zip(state.artists['bars'], state.artists['values'], values):
+            bar.set_height(value)
+            label.set_position((bar.get_x() + bar.get_width() / 2, value + 0.1))
+            label.set_text(str(value))
+            label.set_visible(value > 0)
+        state.axes.set_ylim(0, max(max(values) * 1.15, 1))
+
+    def _build_task_chart(self) -> _ChartState:
+        fig, canvas, ax = self._new_figure((10, 3))
+        bars = ax.barh(TASK_CATEGORIES, [0] * len(TASK_CATEGORIES), color=TASK_COLORS)
+        ax.set_title('Trạng thái công việc')
+        ax.set_xlabel('Số lượng')
+        value_labels = [ax.text(0, bar.get_y() + bar.get_height() / 2, '', ha='left', va='center')
+                        for bar in bars]
+        return _ChartState(fig, canvas, ax, {'bars': bars, 'values': value_labels})
+
+    @staticmethod
+    def _update_task_chart(state: _ChartState, task_stats: Dict[str, Any]):
+        values = [
+            task_stats.get('not_started', 0),
+            task_stats.get('in_progress', 0),
+            task_stats.get('completed', 0),
+            task_stats.get('overdue', 0)
+        ]
+        for bar, label, value in zip(state.artists['bars'], state.artists['values'], values):
+            bar.set_width(value)
+            label.set_position((value + 0.1, bar.get_y() + bar.get_height() / 2))
+            label.set_text(str(value))
+            label.set_visible(value > 0)
+        state.axes.set_xlim(0, max(max(values) * 1.1, 1))
+
+
+# Global renderer - figure và cache dùng chung giữa các lần mở cửa sổ thống kê
+chart_renderer = ChartRenderer()
@@ -3,6 +3,9 @@ from tkinter import ttk, messagebox
 from typing import Optional
 import sys
 import os
+import threading
+import atexit
+from datetime import datetime
 
 # Thêm project root vào Python path
 project_root = os.path.join(os.path.dirname(__file__), '..', '..')
@@ -13,20 +16,29 @@ from dotenv import load_dotenv
 load_dotenv(os.path.join(project_root, '.env'))
 
 # Import tuyệt đối
+from config.settings import config
 from application.use_cases.member_management import MemberManagementUseCase
 from application.use_cases.report_management import ReportManagementUseCase  
 from application.use_cases.task_management import TaskManagementUseCase
-from infrastructure.repositories.member_repository_impl import MemberRepository
-from infrastructure.repositories.report_repository_impl import ReportRepository
-from infrastructure.repositories.task_repository_impl import TaskRepository
+from application.services.deadline_scheduler import get_deadline_scheduler
+from application.services.delta_sync import DeltaSync
+from application.services.report_revisions import ReportRevisionService
+from infrastructure.repositories import AttachmentRepository, ReportRevisionRepository, create_repositories
+from infrastructure.database.query_instrumentation import user_action
+from infrastructure.monitoring.metrics import instrument_methods
+from infrastructure.monitoring import tracing
+from infrastructure.monitoring.memory_report import get_memory_reporter
+from infrastructure.monitoring.sampling_profiler import get_profiler, start_profiler, stop_profiler, toggle_profiler
+from infrastructure.storage.attachment_store import get_attachment_store
 
 # Import UI components
 from presentation.gui.theme import ModernTheme, StyleManager
+from presentation.gui.tk_dispatch import get_tk_dispatcher
+from presentation.gui.ui_watchdog import DiagnosticsWindow, start_watchdog, ui_timed
 from presentation.gui.dashboard_components import DashboardTab
 from presentation.gui.member_components import MemberTab, MemberActions, MemberForm
-from presentation.gui.report_components import ReportTab, ReportActions, ReportForm
+from presentation.gui.report_components import ReportTab, ReportActions, ReportForm, ReportHistory
 from presentation.gui.task_components import TaskTab, TaskActions, TaskForm
-from presentation.gui.statistics_components import show_statistics_window
 
 # Import controllers
 from presentation.controllers.report_controller import ReportController
@@ -46,6 +58,13 @@ class MainApplication:
             # Apply modern theme
             StyleManager.apply_theme_to_root(self.root)
             
+            # Watchdog đo độ trễ event loop; Ctrl+Shift+D mở cửa sổ chẩn đoán
+            start_watchdog(self.root)
+            self.root.bind_all("<Control-Shift-D>", lambda e: DiagnosticsWindow.show(self.root))
+            if config.PROFILER_ENABLED:
+                start_profiler()
+                atexit.register(stop_profiler)
+            
             # Tạo status bar đầu tiên để tránh lỗi
             self._create_minimal_status_bar()
             
@@ -85,10 +104,11 @@ class MainApplication:
     def _init_database_on_startup(self) -> bool:
         """Khởi tạo database khi chạy ứng dụng"""
         try:
-            from infrastructure.database.setup import init_database
+            from infrastructure.database.schema import ensure_database
             print("🔧 Checking and initializing database...")
             
-            if init_database():
+            # Chỉ chạy bootstrap đầy đủ khi phiên bản schema không khớp
+            if ensure_database():
                 print("✅ Database ready!")
                 return True
             else:
@@ -107,14 +127,43 @@ class MainApplication:
         """Khởi tạo các use cases"""
         try:
             # Repositories
-            member_repo = MemberRepository()
-            report_repo = ReportRepository()
-            task_repo = TaskRepository()
+            member_repo, report_repo, task_repo = create_repositories()
             
             # Use cases
             self.member_use_case = MemberManagementUseCase(member_repo)
             self.report_use_case = ReportManagementUseCase(report_repo)
             self.task_use_case = TaskManagementUseCase(task_repo)
+            # File đính kèm: metadata trong bảng attachments, nội dung trong kho dưới UPLOAD_FOLDER
+            self.report_use_case.attachment_repository = tracing.trace_methods(
+                instrument_methods(AttachmentRepository(), 'repository'), 'repository')
+            self.report_use_case.attachment_store = get_attachment_store()
+            # Lịch sử nội dung báo cáo: delta giữa các phiên bản, toàn văn định kỳ
+            self.report_use_case.revision_service = ReportRevisionService(tracing.trace_methods(
+                instrument_methods(ReportRevisionRepository(), 'repository'), 'repository'))
+            for use_case in (self.member_use_case, self.report_use_case, self.task_use_case):
+                instrument_methods(use_case, 'use_case')
+                tracing.trace_methods(use_case, 'use_case')
+            
+            # Nhắc hạn: nạp lịch một lần, use case báo mỗi lần tạo/sửa/xóa công việc
+            self.deadline_scheduler = get_deadline_scheduler(self.task_use_case.get_open_deadlines,
+                                                             self.task_use_case.get_task_by_id)
+            self.task_use_case.deadline_scheduler = self.deadline_scheduler
+            
+            # Danh sách giữ phía client, làm mới tăng dần theo updated_at + tombstone
+            overlap = config.DELTA_SYNC_OVERLAP_SECONDS
+            self._deltas = {
+                'members': DeltaSync(self.member_use_case.get_members_changed_since,
+                                     self.member_use_case.get_deleted_member_ids,
+                                     sort_key=lambda m: m.full_name or '', overlap_seconds=overlap),
+                'reports': DeltaSync(self.report_use_case.get_reports_changed_since,
+                                     self.report_use_case.get_deleted_report_ids,
+                                     sort_key=lambda r: r.created_at or datetime.min, reverse=True,
+                                     overlap_seconds=overlap),
+                'tasks': DeltaSync(self.task_use_case.get_tasks_changed_since,
+                                   self.task_use_case.get_deleted_task_ids,
+                                   sort_key=lambda t: t.created_at or datetime.min, reverse=True,
+                                   overlap_seconds=overlap),
+            }
             
         except Exception as e:
             messagebox.showerror("Lỗi", f"Không thể kết nối database: {e}")
@@ -156,6 +205,9 @@ class MainApplication:
                              bg=ModernTheme.WHITE, fg=ModernTheme.PRIMARY)
         logo_label.pack(side=tk.LEFT, padx=(0, 12), anchor=tk.CENTER)
         
+        # Menu ẩn cho công cụ chẩn đoán (chuột phải vào logo)
+        logo_label.bind("<Button-3>", self._show_diagnostics_menu)
+        
         # Title and subtitle
         title_frame = tk.Frame(left_frame, bg=ModernTheme.WHITE)
         title_frame.pack(side=tk.LEFT, fill=tk.Y, anchor=tk.W)
@@ -192,6 +244,52 @@ class MainApplication:
             btn.bind("<Enter>", lambda e, t=tooltip: self.update_status(t, temp=True))
             btn.bind("<Leave>", lambda e: self.update_status(""))
     
+    def _show_diagnostics_menu(self, event):
+        """Menu ẩn: cửa sổ chẩn đoán, sampling profiler và báo cáo bộ nhớ"""
+        menu = tk.Menu(self.root, tearoff=0)
+        menu.add_command(label="🩺 Chẩn đoán giao diện", command=lambda: DiagnosticsWindow.show(self.root))
+        profiler_label = "⏹ Dừng profiler" if get_profiler() else "▶ Bật sampling profiler"
+        menu.add_command(label=profiler_label, command=self._toggle_profiler)
+        menu.add_separator()
+        reporter = get_memory_reporter()
+        menu.add_command(label="🧠 Báo cáo bộ nhớ", command=lambda: DiagnosticsWindow.show_text(
+            self.root, "Báo cáo bộ nhớ", reporter.report()))
+        menu.add_command(label="📸 Chụp snapshot bộ nhớ", command=lambda: self.update_status(
+            f"Đã chụp snapshot bộ nhớ {reporter.take_snapshot()}", temp=True))
+        menu.add_command(label="🔍 So sánh hai snapshot gần nhất", command=lambda: DiagnosticsWindow.show_text(
+            self.root, "So sánh snapshot bộ nhớ", reporter.diff()))
+        menu.tk_popup(event.x_root, event.y_root)
+    
+    def _register_memory_sources(self):
+        """Đăng ký dataset, cache và bảng Tk cho báo cáo bộ nhớ, kiểm tra ngân sách định kỳ"""
+        reporter = get_memory_reporter()
+        for key, name in (('members', 'Thành viên'), ('reports', 'Báo cáo'), ('tasks', 'Công việc')):
+            reporter.register('Dataset', name, lambda key=key: self._deltas[key].items or None)
+        reporter.register('Cache', 'Ảnh biểu đồ (PNG)', lambda: getattr(
+            getattr(sys.modules.get('presentation.gui.chart_components'), 'chart_renderer', None), '_cache', None))
+        reporter.register_tk_table('Bảng thành viên', lambda: getattr(
+            getattr(self, 'member_controller', None), 'member_tree', None))
+        reporter.register_tk_table('Bảng báo cáo', lambda: getattr(self, 'report_tree', None))
+        reporter.register_tk_table('Bảng công việc', lambda: getattr(self, 'task_tree', None))
+        self.root.after(int(config.MEMORY_CHECK_INTERVAL_S * 1000), self._check_memory_budget)
+    
+    def _check_memory_budget(self):
+        """Cảnh báo trên status bar khi bộ nhớ vượt MEMORY_BUDGET_MB"""
+        try:
+            if get_memory_reporter().check_budget():
+                self.update_status(f"⚠️ Bộ nhớ vượt ngân sách {config.MEMORY_BUDGET_MB:.0f} MB - xem log")
+        except Exception as e:
+            print(f"⚠️ Memory check failed: {e}")
+        self.root.after(int(config.MEMORY_CHECK_INTERVAL_S * 1000), self._check_memory_budget)
+    
+    def _toggle_profiler(self):
+        """Bật/tắt sampling profiler, báo đường dẫn file collapsed khi dừng"""
+        output_path = toggle_profiler()
+        if output_path:
+            self.update_status(f"Đã ghi profile: {output_path}")
+        else:
+            self.update_status("Sampling profiler đang chạy...")
+    
     def _create_main_content(self):
         """Tạo nội dung chính"""
         # Main container
@@ -220,20 +318,71 @@ class MainApplication:
         )
         self.notebook.add(dashboard_frame, text="🏠 Dashboard")
         
-        # Member tab - sử dụng controller mới
-        from presentation.controllers.member_controller import MemberController
-        self.member_controller = MemberController(self.notebook)
-        member_frame = self.member_controller.get_main_frame()
-        self.notebook.add(member_frame, text="👥 Thành viên")
+        # Các tab còn lại chỉ là khung rỗng - widgets và dữ liệu được tạo khi tab được chọn lần đầu
+        self._lazy_tabs = {}
+        self._loaded_tabs = set()
+        self._rendered_tabs = set()
+        for key, title, builder in [
+            ('members', "👥 Thành viên", self._build_member_tab),
+            ('reports', "📋 Báo cáo", self._build_report_tab),
+            ('tasks', "✅ Công việc", self._build_task_tab),
+        ]:
+            container = tk.Frame(self.notebook, bg=ModernTheme.GRAY_50)
+            self.notebook.add(container, text=title)
+            self._lazy_tabs[str(container)] = (key, container, builder)
         
-        # Report tab
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        
+        # Tải trước dữ liệu ở nền sau khi cửa sổ đầu tiên đã hiển thị
+        if config.PREFETCH_TABS:
+            self.root.after(config.PREFETCH_DELAY_MS, self._start_prefetch)
+        
+        self._start_change_listener()
+        self._start_overdue_job()
+        self._start_attachment_gc()
+        self._start_deadline_reminders()
+        self._register_memory_sources()
+    
+    def _on_tab_changed(self, event=None):
+        """Tạo widgets và tải dữ liệu của tab khi được chọn lần đầu"""
+        entry = self._lazy_tabs.get(self.notebook.select())
+        if not entry:
+            return
+        
+        key, container, builder = entry
+        if key in self._loaded_tabs:
+            return
+        
+        self._loaded_tabs.add(key)
+        try:
+            self.root.config(cursor="watch")
+            self.root.update_idletasks()
+            builder(container)
+        except Exception as e:
+            self._loaded_tabs.discard(key)
+            messagebox.showerror("Lỗi", f"Không thể tải tab: {e}")
+        finally:
+            self.root.config(cursor="")
+    
+    def _build_member_tab(self, container):
+        """Tạo tab thành viên - sử dụng controller mới"""
+        from presentation.controllers.member_controller import MemberController
+        self.member_controller = MemberController(container, auto_load=False,
+                                                  member_use_case=self.member_use_case,
+                                                  member_delta=self._deltas['members'])
+        self.member_controller.get_main_frame().pack(fill=tk.BOTH, expand=True)
+        self._refresh_members()
+    
+    def _build_report_tab(self, container):
+        """Tạo tab báo cáo"""
         report_frame, self.report_tree, self.report_search_var, self.report_filter_vars = ReportTab.create_report_tab(
-            self.notebook,
+            container,
             callbacks={
                 'add_report': self._add_report,
                 'view_report': self._edit_report,  # Gộp view và edit thành một
                 'delete_report': self._delete_report,
                 'approve_report': self._approve_report,
+                'report_history': self._show_report_history,
                 'search_reports': self._search_reports,
                 'filter_reports': self._filter_reports,
                 'export_reports': self._export_reports,
@@ -241,11 +390,13 @@ class MainApplication:
                 'refresh_data': self._refresh_reports
             }
         )
-        self.notebook.add(report_frame, text="📋 Báo cáo")
-        
-        # Task tab
+        report_frame.pack(fill=tk.BOTH, expand=True)
+        self._refresh_reports()
+    
+    def _build_task_tab(self, container):
+        """Tạo tab công việc"""
         task_frame, self.task_tree, self.task_search_var, self.task_filter_vars = TaskTab.create_task_tab(
-            self.notebook,
+            container,
             callbacks={
                 'add_task': self._add_task,
                 'view_task': self._edit_task,  # Gộp view và edit thành một
@@ -258,11 +409,109 @@ class MainApplication:
                 'refresh_data': self._refresh_tasks
             }
         )
-        self.notebook.add(task_frame, text="✅ Công việc")
+        task_frame.pack(fill=tk.BOTH, expand=True)
+        self._refresh_tasks()
+    
+    def _start_prefetch(self):
+        """Tải trước dữ liệu các tab chưa mở trong thread nền (độ ưu tiên thấp)"""
+        pending = [key for key in self._deltas if key not in self._loaded_tabs]
+        if not pending:
+            return
+        
+        def prefetch():
+            for key in pending:
+                if key in self._loaded_tabs:
+                    continue
+                try:
+                    self._deltas[key].refresh()
+                except Exception as e:
+                    print(f"⚠️ Prefetch {key} failed: {e}")
+        
+        threading.Thread(target=tracing.propagate(prefetch), name="tab-prefetch", daemon=True).start()
+    
+    def _start_change_listener(self):
+        """Nhận thay đổi của client khác qua LISTEN/NOTIFY để cập nhật cache và tab đang mở"""
+        from infrastructure.database.change_listener import get_change_listener
+        from infrastructure.database.local_replica import get_local_replica
+        listener = get_change_listener()
+        if listener is None:
+            return
+        
+        replica = get_local_replica()
+        if replica is not None:
+            # Replica cập nhật trước để lần đọc theo ID phía sau thấy dòng mới
+            listener.subscribe(replica.apply_change_events)
+        # Listener gọi subscriber trên luồng của nó - vẽ lại qua hàng đợi của Tk thread
+        self._tk_dispatcher = get_tk_dispatcher(self.root)
+        listener.subscribe(self._on_remote_changes)
+        if self.deadline_scheduler is not None:
+            listener.subscribe(self.deadline_scheduler.apply_change_events)
+        listener.start()
+    
+    def _start_overdue_job(self):
+        """Đánh dấu công việc quá hạn định kỳ trên server - tab công việc nhận thay đổi qua change feed/delta"""
+        from infrastructure.database.overdue_job import get_overdue_job
+        get_overdue_job()
+    
+    def _start_attachment_gc(self):
+        """Dọn nội dung file đính kèm không còn báo cáo nào dùng (một lần mỗi phiên, thread nền)"""
+        def collect():
+            try:
+                removed = self.report_use_case.collect_attachment_garbage()
+                if removed:
+                    print(f"🧹 Removed {removed} unreferenced attachment object(s)")
+            except Exception as e:
+                print(f"⚠️ Attachment cleanup failed: {e}")
         
-        # Schedule data loading after GUI is ready (only once)
-        self._data_loaded = False
-        self.root.after(100, self._load_initial_data_once)
+        threading.Thread(target=tracing.propagate(collect), name="attachment-gc", daemon=True).start()
+    
+    def _start_deadline_reminders(self):
+        """Nhắc công việc sắp hết hạn trên status bar (log và outbox do scheduler ghi)"""
+        if self.deadline_scheduler is None:
+            return
+        # Scheduler gọi trên luồng của nó - chuyển về Tk thread qua hàng đợi
+        dispatcher = get_tk_dispatcher(self.root)
+        self.deadline_scheduler.subscribe(
+            lambda reminders: dispatcher.call(self._show_deadline_reminders, reminders))
+        self.deadline_scheduler.start()
+    
+    def _show_deadline_reminders(self, reminders):
+        if len(reminders) == 1:
+            self.update_status(f"⏰ {reminders[0].message()}")
+        else:
+            titles = ", ".join(reminder.title for reminder in reminders[:3])
+            more = "..." if len(reminders) > 3 else ""
+            self.update_status(f"⏰ {len(reminders)} công việc sắp hết hạn: {titles}{more}")
+    
+    def _on_remote_changes(self, events):
+        """Chạy trên luồng listener: mỗi dòng thay đổi tốn một lần đọc theo ID, vẽ lại trên luồng Tk"""
+        fetchers = {
+            'members': self.member_use_case.get_member_by_id,
+            'reports': self.report_use_case.get_report_by_id,
+            'tasks': self.task_use_case.get_task_by_id,
+        }
+        for key, fetch in fetchers.items():
+            changes = [(event.op, event.id) for event in events if event.table == key]
+            if changes and self._deltas[key].apply_changes(changes, fetch):
+                self._tk_dispatcher.call(self._render_remote_changes, key)
+    
+    def _render_remote_changes(self, key: str):
+        """Vẽ lại tab đã hiển thị từ danh sách delta (không truy vấn lại danh sách)"""
+        items = self._deltas[key].items
+        if key == 'members':
+            if self.all_members:
+                self.all_members = items
+            if 'members' in self._loaded_tabs and hasattr(self, 'member_controller'):
+                self.member_controller.refresh_data(list(items))
+        elif key not in self._rendered_tabs:
+            return
+        elif key == 'reports':
+            self.all_reports = items
+            ReportActions.populate_report_tree(self.report_tree, self.all_reports)
+        elif key == 'tasks':
+            self.all_tasks = items
+            members_map = TaskActions.create_members_map(self.all_members)
+            TaskActions.populate_task_tree(self.task_tree, self.all_tasks, members_map)
     
     def _create_status_bar(self):
         """Tạo status bar hiện đại"""
@@ -306,22 +555,10 @@ class MainApplication:
                 self.root.after(3000, lambda: self.update_status("Sẵn sàng"))
     
     # Data loading methods
-    def _load_initial_data_once(self):
-        """Load initial data for all tabs (only once)"""
-        if not self._data_loaded:
-            self._data_loaded = True
-            self._load_initial_data()
-    
-    def _load_initial_data(self):
-        """Load initial data for all tabs"""
-        self._refresh_members()
-        self._refresh_reports()
-        self._refresh_tasks()
-    
     def _refresh_members(self):
         """Làm mới danh sách thành viên"""
         try:
-            # Use member controller to refresh data
+            # Use member controller to refresh data (chỉ khi tab đã được mở)
             if hasattr(self, 'member_controller'):
                 self.member_controller.refresh_data()
                 self.all_members = self.member_controller.all_members
@@ -329,36 +566,44 @@ class MainApplication:
         except Exception as e:
             messagebox.showerror("Lỗi", f"Không thể tải danh sách thành viên: {e}")
     
-    def _refresh_reports(self):
-        """Làm mới danh sách báo cáo"""
-        try:
-            print("🔄 Loading reports...")
-            self.all_reports = self.report_controller.get_all_reports()
-            print(f"📊 Found {len(self.all_reports)} reports")
-            ReportActions.populate_report_tree(self.report_tree, self.all_reports)
-            print("✅ Report tree populated")
-            self.update_status(f"Đã tải {len(self.all_reports)} báo cáo", temp=True)
-        except Exception as e:
-            print(f"❌ Error loading reports: {e}")
-            messagebox.showerror("Lỗi", f"Không thể tải danh sách báo cáo: {e}")
-    
+    @tracing.action('Làm mới công việc')
+    @ui_timed('MainApplication._refresh_tasks')
     def _refresh_tasks(self):
         """Làm mới danh sách công việc"""
+        if 'tasks' not in self._loaded_tabs:
+            return
         try:
             print("🔄 Loading tasks...")
-            self.all_tasks = self.task_controller.get_all_tasks()
+            delta = self._deltas['tasks']
+            changed = delta.refresh()
+            self.all_tasks = delta.items
             print(f"📊 Found {len(self.all_tasks)} tasks")
             
-            # Create members map for displaying member names
-            members_map = TaskActions.create_members_map(self.all_members)
-            
-            TaskActions.populate_task_tree(self.task_tree, self.all_tasks, members_map)
-            print("✅ Task tree populated")
+            # Chỉ vẽ lại bảng khi có thay đổi (hoặc lần đầu mở tab)
+            if changed or 'tasks' not in self._rendered_tabs:
+                # Create members map for displaying member names
+                self._ensure_members_data()
+                members_map = TaskActions.create_members_map(self.all_members)
+                
+                TaskActions.populate_task_tree(self.task_tree, self.all_tasks, members_map)
+                self._rendered_tabs.add('tasks')
+                print("✅ Task tree populated")
             self.update_status(f"Đã tải {len(self.all_tasks)} công việc", temp=True)
         except Exception as e:
             print(f"❌ Error loading tasks: {e}")
             messagebox.showerror("Lỗi", f"Không thể tải danh sách công việc: {e}")
     
+    def _ensure_members_data(self):
+        """Đảm bảo có danh sách thành viên (dùng cho tên người được giao) khi tab thành viên chưa mở"""
+        if self.all_members:
+            return
+        try:
+            delta = self._deltas['members']
+            delta.refresh()
+            self.all_members = delta.items
+        except Exception as e:
+            print(f"❌ Error loading members: {e}")
+    
     def _refresh_dashboard(self):
         """Làm mới thống kê dashboard"""
         try:
@@ -406,7 +651,8 @@ class MainApplication:
     def _view_statistics(self):
         """Quick action: Xem thống kê"""
         try:
-            # Mở cửa sổ thống kê chi tiết
+            # Mở cửa sổ thống kê chi tiết (import khi cần để không làm chậm khởi động)
+            from presentation.gui.statistics_components import show_statistics_window
             show_statistics_window(
                 self.root, 
                 member_use_case=self.member_use_case,
@@ -454,6 +700,7 @@ class MainApplication:
             messagebox.showerror("Lỗi", f"Không thể xóa thành viên: {e}")
     
     # Report management methods
+    @tracing.action('Thêm báo cáo')
     def _add_report(self):
         """Tạo báo cáo mới"""
         result = ReportForm.create_report_form_dialog(self.root, "Tạo báo cáo mới")
@@ -466,6 +713,7 @@ class MainApplication:
             except Exception as e:
                 messagebox.showerror("Lỗi", f"Không thể tạo báo cáo: {e}")
     
+    @tracing.action('Sửa báo cáo')
     def _edit_report(self):
         """Sửa báo cáo"""
         report_id = ReportActions.get_selected_report_id(self.report_tree)
@@ -495,6 +743,7 @@ class MainApplication:
         except Exception as e:
             messagebox.showerror("Lỗi", f"Không thể sửa báo cáo: {e}")
     
+    @tracing.action('Duyệt báo cáo')
     def _approve_report(self):
         """Duyệt báo cáo"""
         report_id = ReportActions.get_selected_report_id(self.report_tree)
@@ -513,6 +762,30 @@ class MainApplication:
         except Exception as e:
             messagebox.showerror("Lỗi", f"Không thể duyệt báo cáo: {e}")
 
+    @tracing.action('Lịch sử báo cáo')
+    def _show_report_history(self):
+        """So sánh các phiên bản nội dung báo cáo"""
+        report_id = ReportActions.get_selected_report_id(self.report_tree)
+        if not report_id:
+            messagebox.showwarning("Cảnh báo", "Vui lòng chọn báo cáo cần xem lịch sử!")
+            return
+        
+        try:
+            report = self.report_use_case.get_report_by_id(report_id)
+            if not report:
+                messagebox.showerror("Lỗi", "Không tìm thấy báo cáo!")
+                return
+            revisions = self.report_use_case.get_report_revisions(report_id)
+            if not revisions:
+                messagebox.showinfo("Thông báo", "Báo cáo chưa có lịch sử phiên bản.")
+                return
+            ReportHistory.create_history_dialog(
+                self.root, report.title, revisions,
+                lambda old, new: self.report_use_case.get_report_diff(report_id, old, new))
+        except Exception as e:
+            messagebox.showerror("Lỗi", f"Không thể xem lịch sử báo cáo: {e}")
+
+    @tracing.action('Xóa báo cáo')
     def _delete_report(self):
         """Xóa báo cáo"""
         report_id = ReportActions.get_selected_report_id(self.report_tree)
@@ -554,6 +827,8 @@ class MainApplication:
             messagebox.showerror("Lỗi", f"Không thể xuất báo cáo: {e}")
             print(f"Export reports error: {e}")
 
+    @tracing.action('Thao tác hàng loạt báo cáo')
+    @user_action('bulk_action_reports')
     def _bulk_action_reports(self, action):
         """Thao tác hàng loạt cho báo cáo"""
         try:
@@ -633,14 +908,24 @@ class MainApplication:
             messagebox.showerror("Lỗi", f"Không thể thực hiện thao tác: {e}")
             print(f"Bulk action error: {e}")
 
+    @tracing.action('Làm mới báo cáo')
+    @ui_timed('MainApplication._refresh_reports')
     def _refresh_reports(self):
         """Làm mới danh sách báo cáo"""
+        if 'reports' not in self._loaded_tabs:
+            return
         try:
             print("🔄 Loading reports...")
-            self.all_reports = self.report_controller.get_all_reports()
+            delta = self._deltas['reports']
+            changed = delta.refresh()
+            self.all_reports = delta.items
             print(f"📊 Found {len(self.all_reports)} reports")
-            ReportActions.populate_report_tree(self.report_tree, self.all_reports)
-            print("✅ Report tree populated")
+            
+            # Chỉ vẽ lại bảng khi có thay đổi (hoặc lần đầu mở tab)
+            if changed or 'reports' not in self._rendered_tabs:
+                ReportActions.populate_report_tree(self.report_tree, self.all_reports)
+                self._rendered_tabs.add('reports')
+                print("✅ Report tree populated")
             self.update_status(f"Đã tải {len(self.all_reports)} báo cáo", temp=True)
         except Exception as e:
             print(f"❌ Error loading reports: {e}")
@@ -684,6 +969,7 @@ class MainApplication:
             ReportActions.populate_report_tree(self.report_tree, self.all_reports)
     
     # Task management methods
+    @tracing.action('Thêm công việc')
     def _add_task(self):
         """Tạo công việc mới"""
         result = TaskForm.create_task_form_dialog(self.root, "Tạo công việc mới")
@@ -696,6 +982,7 @@ class MainApplication:
             except Exception as e:
                 messagebox.showerror("Lỗi", f"Không thể tạo công việc: {e}")
     
+    @tracing.action('Sửa công việc')
     def _edit_task(self):
         """Sửa công việc"""
         task_id = TaskActions.get_selected_task_id(self.task_tree)
@@ -725,6 +1012,7 @@ class MainApplication:
         except Exception as e:
             messagebox.showerror("Lỗi", f"Không thể sửa công việc: {e}")
     
+    @tracing.action('Hoàn thành công việc')
     def _complete_task(self):
         """Hoàn thành công việc"""
         task_id = TaskActions.get_selected_task_id(self.task_tree)
@@ -743,6 +1031,7 @@ class MainApplication:
         except Exception as e:
             messagebox.showerror("Lỗi", f"Không thể hoàn thành công việc: {e}")
     
+    @tracing.action('Xóa công việc')
     def _delete_task(self):
         """Xóa công việc"""
         task_id = TaskActions.get_selected_task_id(self.task_tree)
@@ -786,6 +1075,8 @@ class MainApplication:
             messagebox.showerror("Lỗi", f"Không thể xuất công việc: {e}")
             print(f"Export tasks error: {e}")
 
+    @tracing.action('Thao tác hàng loạt công việc')
+    @user_action('bulk_action_tasks')
     def _bulk_action_tasks(self, action):
         """Thao tác hàng loạt cho công việc"""
         try:
@@ -961,8 +1252,14 @@ class MainApplication:
             TaskActions.populate_task_tree(self.task_tree, self.all_tasks, members_map)
     
     # Header action methods
+    @tracing.action('Làm mới tất cả')
+    @user_action('refresh_all_data')
     def _refresh_all_data(self):
         """Làm mới tất cả dữ liệu"""
+        # Các tab chưa mở sẽ lấy phần thay đổi khi được chọn
+        if 'members' not in self._loaded_tabs:
+            self.all_members = []
+        
         self._refresh_members()
         self._refresh_reports()
         self._refresh_tasks()
@@ -9,6 +9,7 @@ from tkinter import ttk, messagebox, filedialog
 from typing import Callable, List, Tuple, Optional, Dict, Any
 import datetime
 from presentation.gui.theme import ModernTheme
+from presentation.gui.ui_watchdog import begin_section, ui_timed
 from presentation.gui.base_components import BaseHeader, BaseTable, BaseSearch
 from application.services.excel_service import ExcelExportService
 
@@ -354,6 +355,7 @@ class MemberForm:
             Dict with form data or None if cancelled
         """
         # Create dialog window
+        construction = begin_section('MemberForm.create_member_form_dialog')
         dialog = tk.Toplevel(parent)
         dialog.title(title)
         dialog.geometry("580x750")
@@ -1044,6 +1046,7 @@ class MemberForm:
         dialog.after(50, lambda: bind_to_mousewheel(scrollable_frame))
         
         # Wait for dialog to close
+        construction.end()
         dialog.wait_window()
         
         return result if result else None
@@ -1053,6 +1056,7 @@ class MemberActions:
     """Enhanced member action handlers and utilities"""
     
     @staticmethod
+    @ui_timed('MemberActions.populate_member_tree')
     def populate_member_tree(tree: ttk.Treeview, members: List[Any], enhanced_mode: bool = False):
         """
         Populate member tree with data
@@ -8,8 +8,10 @@ import tkinter as tk
 from tkinter import ttk
 from typing import Callable, List, Tuple, Optional, Dict, Any
 from presentation.gui.theme import ModernTheme
+from presentation.gui.ui_watchdog import begin_section, ui_timed
 from presentation.gui.base_components import BaseHeader, BaseTable, BaseFilter
 from application.services.excel_service import ExcelExportService
+from domain.entities.period import current_period
 
 
 class ReportTable:
@@ -320,6 +322,7 @@ class ReportTab:
             'view_report': lambda: None,
             'delete_report': lambda: None,
             'approve_report': lambda: None,
+            'report_history': lambda: None,
             'search_reports': lambda e=None: None,
             'filter_reports': lambda: None,
             'export_reports': lambda: None,
@@ -333,6 +336,7 @@ class ReportTab:
         actions = [
             ("� Chi tiết", default_callbacks['view_report']),  # Gộp xem và sửa
             ("✅ Duyệt", default_callbacks['approve_report']),
+            ("🕘 Lịch sử", default_callbacks['report_history']),
             ("🗑️ Xóa", default_callbacks['delete_report']),
             ("📊 Xuất Excel", default_callbacks['export_reports']),
             ("🔄 Làm mới", default_callbacks['refresh_data']),
@@ -403,6 +407,7 @@ class ReportTab:
         context_menu.add_command(label="� Chi tiết", command=default_callbacks['view_report'])  # Gộp xem và sửa
         context_menu.add_separator()
         context_menu.add_command(label="✅ Duyệt", command=default_callbacks['approve_report'])
+        context_menu.add_command(label="🕘 Lịch sử", command=default_callbacks['report_history'])
         context_menu.add_command(label="🗑️ Xóa", command=default_callbacks['delete_report'])
         
         def show_context_menu(event):
@@ -449,6 +454,7 @@ class ReportForm:
             Dict with form data or None if cancelled
         """
         # Create dialog window
+        construction = begin_section('ReportForm.create_report_form_dialog')
         dialog = tk.Toplevel(parent)
         dialog.title(title)
         dialog.geometry("650x750")
@@ -780,16 +786,8 @@ class ReportForm:
                     quick_periods_frame.pack(side=tk.RIGHT)
                     
                     def set_current_period(period_type):
-                        import datetime
-                        now = datetime.datetime.now()
-                        if period_type == "month":
-                            period = f"Tháng {now.month:02d}/{now.year}"
-                        elif period_type == "quarter":
-                            quarter = (now.month - 1) // 3 + 1
-                            period = f"Quý {quarter}/{now.year}"
-                        elif period_type == "year":
-                            period = f"Năm {now.year}"
-                        var.set(period)
+                        # Cùng parser/định dạng với cột period_start/period_end của repository
+                        var.set(current_period(period_type).label)
                     
                     # Quick period buttons
                     period_buttons = [
@@ -959,15 +957,130 @@ class ReportForm:
             dialog.after(100, lambda: dialog.focus_set())
         
         # Wait for dialog to close
+        construction.end()
         dialog.wait_window()
         
         return result if is_saved else None
 
 
+class ReportHistory:
+    """Lịch sử phiên bản nội dung báo cáo và bảng so sánh hai cột cho người duyệt"""
+    
+    # Màu nền theo loại thay đổi của dòng
+    TAG_COLORS = {
+        'replace': '#fef3c7',
+        'delete': '#fee2e2',
+        'insert': '#dcfce7',
+        'filler': ModernTheme.GRAY_100,
+    }
+    
+    @staticmethod
+    def create_history_dialog(parent, title: str, revisions: List[Any],
+                              load_diff: Callable[[int, int], List[Any]]):
+        """
+        Create side-by-side revision diff dialog
+        
+        Args:
+            parent: Parent widget
+            title: Report title
+            revisions: Revision metadata, newest first
+            load_diff: (old_revision, new_revision) -> list of DiffRow
+        """
+        construction = begin_section('ReportHistory.create_history_dialog')
+        dialog = tk.Toplevel(parent)
+        dialog.title(f"Lịch sử phiên bản - {title}")
+        dialog.geometry("1100x680")
+        dialog.transient(parent)
+        dialog.geometry("+%d+%d" % (parent.winfo_rootx() + 40, parent.winfo_rooty() + 40))
+        dialog.configure(bg=ModernTheme.WHITE)
+        
+        labels = [f"v{revision.revision} - {revision.created_at.strftime('%d/%m/%Y %H:%M')}"
+                  if revision.created_at else f"v{revision.revision}" for revision in revisions]
+        numbers = {label: revision.revision for label, revision in zip(labels, revisions)}
+        
+        # Chọn hai phiên bản
+        controls = tk.Frame(dialog, bg=ModernTheme.WHITE)
+        controls.pack(fill=tk.X, padx=15, pady=(12, 6))
+        old_var = tk.StringVar(value=labels[1] if len(labels) > 1 else labels[0])
+        new_var = tk.StringVar(value=labels[0])
+        for text, var in (("Bản cũ:", old_var), ("Bản mới:", new_var)):
+            tk.Label(controls, text=text, font=('Segoe UI', 10),
+                     bg=ModernTheme.WHITE, fg=ModernTheme.GRAY_700).pack(side=tk.LEFT, padx=(0, 5))
+            ttk.Combobox(controls, textvariable=var, values=labels, state='readonly',
+                         width=24).pack(side=tk.LEFT, padx=(0, 15))
+        summary_label = tk.Label(controls, text="", font=('Segoe UI', 9),
+                                 bg=ModernTheme.WHITE, fg=ModernTheme.GRAY_500)
+        summary_label.pack(side=tk.RIGHT)
+        
+        # Hai cột văn bản cuộn cùng nhau
+        body = tk.Frame(dialog, bg=ModernTheme.WHITE)
+        body.pack(fill=tk.BOTH, expand=True, padx=15, pady=(0, 12))
+        scrollbar = ttk.Scrollbar(body, orient=tk.VERTICAL)
+        panes = []
+        for column in range(2):
+            text = tk.Text(body, wrap=tk.NONE, font=('Consolas', 10), relief=tk.FLAT,
+                           bg=ModernTheme.WHITE, fg=ModernTheme.GRAY_800, padx=6)
+            for tag, color in ReportHistory.TAG_COLORS.items():
+                text.tag_configure(tag, background=color)
+            text.tag_configure('number', foreground=ModernTheme.GRAY_400)
+            text.grid(row=0, column=column, sticky='nsew', padx=(0, 4))
+            body.grid_columnconfigure(column, weight=1, uniform='pane')
+            panes.append(text)
+        scrollbar.grid(row=0, column=2, sticky='ns')
+        body.grid_rowconfigure(0, weight=1)
+        
+        def yview(*args):
+            for pane in panes:
+                pane.yview(*args)
+        
+        def follow(source):
+            def on_scroll(first, last):
+                scrollbar.set(first, last)
+                for pane in panes:
+                    if pane is not source:
+                        pane.yview_moveto(first)
+            return on_scroll
+        
+        scrollbar.configure(command=yview)
+        for pane in panes:
+            pane.configure(yscrollcommand=follow(pane))
+        
+        def show_diff(*_):
+            try:
+                rows = load_diff(numbers[old_var.get()], numbers[new_var.get()])
+            except Exception as e:
+                summary_label.configure(text=f"Lỗi: {e}", fg=ModernTheme.DANGER)
+                return
+            left, right = panes
+            for pane in panes:
+                pane.configure(state=tk.NORMAL)
+                pane.delete('1.0', tk.END)
+            counts = {'insert': 0, 'delete': 0, 'replace': 0}
+            for row in rows:
+                if row.tag in counts:
+                    counts[row.tag] += 1
+                for pane, number, line in ((left, row.old_number, row.old_text),
+                                           (right, row.new_number, row.new_text)):
+                    tag = () if row.tag == 'equal' else (row.tag if number is not None else 'filler',)
+                    pane.insert(tk.END, f"{number:>4} " if number is not None else "     ", ('number',) + tag)
+                    pane.insert(tk.END, line + "\n", tag)
+            for pane in panes:
+                pane.configure(state=tk.DISABLED)
+            summary_label.configure(
+                text=f"+{counts['insert']}  -{counts['delete']}  ~{counts['replace']} dòng",
+                fg=ModernTheme.GRAY_500)
+        
+        old_var.trace_add('write', show_diff)
+        new_var.trace_add('write', show_diff)
+        show_diff()
+        construction.end()
+
+
 class ReportActions:
     """Report action handlers and utilities"""
     
     @staticmethod
+    @ui_timed('ReportActions.populate_report_tree')
     def populate_report_tree(tree: ttk.Treeview, reports: List[Any]):
         """
         Populate report tree with data and apply styling based on status
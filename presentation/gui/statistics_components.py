@@ -10,14 +10,18 @@ import threading
 from datetime import datetime, timedelta
 from presentation.gui.theme import ModernTheme
 from presentation.gui.base_components import BaseCard
-try:
-    import matplotlib.pyplot as plt
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-    from matplotlib.figure import Figure
-    import numpy as np
-    MATPLOTLIB_AVAILABLE = True
-except ImportError:
-    MATPLOTLIB_AVAILABLE = False
+from presentation.gui.chart_components import ChartRenderer, chart_renderer, MATPLOTLIB_AVAILABLE
+from presentation.gui.tk_dispatch import get_tk_dispatcher
+
+
+# Kỳ của bảng giờ ước tính/thực tế: nhãn combobox -> loại kỳ
+HOURS_PERIODS = {"Tháng này": 'month', "Quý này": 'quarter', "Năm nay": 'year'}
+HOURS_COLUMNS = (
+    ('tasks', "Số việc", 60), ('estimated_hours', "Ước tính (h)", 85), ('actual_hours', "Thực tế (h)", 85),
+    ('estimate_ratio', "Thực tế/Ước tính", 110), ('median_ratio', "Trung vị tỷ lệ", 95),
+    ('utilization', "Công suất", 75), ('p50_hours', "P50 (h)", 65), ('p75_hours', "P75 (h)", 65),
+    ('p90_hours', "P90 (h)", 65),
+)
 
 
 class StatisticsWindow:
@@ -34,6 +38,8 @@ class StatisticsWindow:
         self.window.title("📊 Biểu đồ thống kê")
         self.window.geometry("1200x800")
         self.window.configure(bg=ModernTheme.GRAY_50)
+        # Luồng tải dữ liệu trả kết quả về Tk thread qua hàng đợi
+        self._dispatcher = get_tk_dispatcher(self.window)
         
         # Center the window
         self._center_window()
@@ -69,6 +75,9 @@ class StatisticsWindow:
         # Main content area - charts only
         self._create_charts_content()
         
+        # Ước tính vs thực tế theo đơn vị/thành viên
+        self._create_hours_panel()
+        
         # Footer with actions
         self._create_footer()
     
@@ -152,6 +161,88 @@ class StatisticsWindow:
         task_chart_frame.pack(fill=tk.BOTH, expand=True)
         self.chart_frames['tasks'] = task_chart_frame
     
+    def _create_hours_panel(self):
+        """Bảng giờ ước tính/thực tế theo đơn vị (dòng cha) và thành viên (dòng con)"""
+        panel = tk.Frame(self.window, bg=ModernTheme.WHITE, relief=tk.RAISED, bd=1)
+        panel.pack(fill=tk.X, padx=30, pady=(0, 10))
+        
+        toolbar = tk.Frame(panel, bg=ModernTheme.WHITE)
+        toolbar.pack(fill=tk.X, padx=10, pady=(8, 4))
+        tk.Label(toolbar, text="⏱️ Giờ ước tính / thực tế (công việc hoàn thành)",
+                 font=("Segoe UI", 12, "bold"),
+                 bg=ModernTheme.WHITE, fg=ModernTheme.GRAY_900).pack(side=tk.LEFT)
+        
+        self.hours_period_var = tk.StringVar(value=next(iter(HOURS_PERIODS)))
+        period_combo = ttk.Combobox(toolbar, textvariable=self.hours_period_var, values=list(HOURS_PERIODS),
+                                    state="readonly", width=12)
+        period_combo.pack(side=tk.RIGHT)
+        period_combo.bind("<<ComboboxSelected>>", lambda event: self._load_hours_async())
+        
+        self.hours_summary_label = tk.Label(toolbar, text="", font=("Segoe UI", 10),
+                                            bg=ModernTheme.WHITE, fg=ModernTheme.GRAY_600)
+        self.hours_summary_label.pack(side=tk.RIGHT, padx=10)
+        
+        self.hours_tree = ttk.Treeview(panel, columns=[key for key, _, _ in HOURS_COLUMNS],
+                                       show="tree headings", height=6)
+        self.hours_tree.heading('#0', text="Đơn vị / Thành viên")
+        self.hours_tree.column('#0', width=220)
+        for key, title, width in HOURS_COLUMNS:
+            self.hours_tree.heading(key, text=title)
+            self.hours_tree.column(key, width=width, anchor=tk.E)
+        self.hours_tree.pack(fill=tk.X, padx=10, pady=(0, 10))
+    
+    @staticmethod
+    def _hours_values(row: Dict[str, Any]) -> Tuple:
+        def hours(value):
+            return "-" if value is None else f"{value:,.1f}"
+        
+        def ratio(value):
+            return "-" if value is None else f"{value:.2f}×"
+        
+        utilization = row['utilization']
+        return (row['tasks'], hours(row['estimated_hours']), hours(row['actual_hours']),
+                ratio(row['estimate_ratio']), ratio(row['median_ratio']),
+                "-" if utilization is None else f"{utilization:.0%}",
+                hours(row['p50_hours']), hours(row['p75_hours']), hours(row['p90_hours']))
+    
+    def _load_hours_async(self, refresh: bool = False):
+        """Tải bảng giờ của kỳ đang chọn ở luồng nền (kỳ đã tải được cache ở use case)"""
+        if not self.task_use_case or not hasattr(self.task_use_case, 'get_hours_analytics'):
+            return
+        kind = HOURS_PERIODS[self.hours_period_var.get()]
+        
+        def load():
+            try:
+                analytics = self.task_use_case.get_hours_analytics(kind, refresh=refresh)
+                self._dispatcher.call(self._update_hours_panel, analytics)
+            except Exception as e:
+                message = f"⚠️ Không tải được: {e}"
+                self._dispatcher.call(lambda: self.hours_summary_label.config(text=message))
+        
+        threading.Thread(target=load, name="hours-analytics", daemon=True).start()
+    
+    def _update_hours_panel(self, analytics: Dict[str, Any]):
+        """Vẽ lại bảng giờ: dòng đơn vị mở sẵn, thành viên xếp theo giờ thực tế"""
+        if not self.hours_tree.winfo_exists():
+            return
+        self.hours_tree.delete(*self.hours_tree.get_children())
+        total = analytics['total']
+        if total is None:
+            self.hours_summary_label.config(text=f"{analytics['period']}: chưa có công việc hoàn thành")
+            return
+        self.hours_summary_label.config(
+            text=f"{analytics['period']}: {total['members']} thành viên, {total['actual_hours']:,.1f} h thực tế")
+        
+        parents = {}
+        for row in analytics['departments']:
+            parents[row['department']] = self.hours_tree.insert(
+                '', tk.END, text=row['department'] or "(Chưa có đơn vị)", values=self._hours_values(row), open=True)
+        for row in analytics['members']:
+            self.hours_tree.insert(parents.get(row['department'], ''), tk.END,
+                                   text=f"{row['rank_in_department']}. {row['full_name']}",
+                                   values=self._hours_values(row))
+        self.hours_tree.insert('', tk.END, text="Tổng", values=self._hours_values(total))
+    
     def _create_footer(self):
         """Create footer with action buttons"""
         footer_frame = tk.Frame(self.window, bg=ModernTheme.WHITE, height=60)
@@ -177,16 +268,18 @@ class StatisticsWindow:
                              command=self.window.destroy)
         close_btn.pack(side=tk.RIGHT, pady=15)
     
-    def _load_statistics_data(self):
+    def _load_statistics_data(self, refresh: bool = False):
         """Load all statistics data"""
         try:
-            # Show loading message
-            self._show_loading_message()
+            # Hiển thị ngay biểu đồ đã render lần trước, chỉ báo đang tải nếu chưa có
+            if not self._show_last_rendered_charts():
+                self._show_loading_message()
             
             # Load data in background thread
             thread = threading.Thread(target=self._load_data_async)
             thread.daemon = True
             thread.start()
+            self._load_hours_async(refresh=refresh)
             
         except Exception as e:
             messagebox.showerror("Lỗi", f"Không thể tải dữ liệu thống kê: {e}")
@@ -219,10 +312,10 @@ class StatisticsWindow:
             self.stats_data = stats_data
             
             # Update UI on main thread
-            self.window.after(0, self._update_ui_with_data)
+            self._dispatcher.call(self._update_ui_with_data)
             
         except Exception as e:
-            self.window.after(0, lambda: messagebox.showerror("Lỗi", f"Lỗi khi tải dữ liệu: {e}"))
+            self._dispatcher.call(messagebox.showerror, "Lỗi", f"Lỗi khi tải dữ liệu: {e}")
     
     def _update_ui_with_data(self):
         """Update UI with loaded data"""
@@ -230,6 +323,7 @@ class StatisticsWindow:
             # Hide loading message
             if hasattr(self, 'loading_label'):
                 self.loading_label.destroy()
+                del self.loading_label
             
             # Update charts only
             if MATPLOTLIB_AVAILABLE:
@@ -261,138 +355,73 @@ class StatisticsWindow:
     
     def _create_member_chart(self):
         """Create member statistics chart"""
-        frame = self.chart_frames['members']
-        
-        # Clear existing content
-        for widget in frame.winfo_children():
-            widget.destroy()
-        
-        # Chart title
-        title_label = tk.Label(frame, text="Thống kê thành viên", 
-                              font=("Segoe UI", 12, "bold"),
-                              bg=ModernTheme.WHITE, fg=ModernTheme.GRAY_900)
-        title_label.pack(pady=(10, 5))
-        
-        # Create figure
-        fig = Figure(figsize=(5, 3), dpi=100, facecolor='white')
-        ax = fig.add_subplot(111)
-        
-        # Data
-        member_stats = self.stats_data['members']
-        labels = ['Đoàn viên', 'Hội viên', 'Cán bộ']
-        sizes = [
-            member_stats.get('union_members', 0),
-            member_stats.get('association_members', 0),
-            member_stats.get('executives', 0)
-        ]
-        colors = ['#3b82f6', '#10b981', '#f59e0b']  # Modern colors
-        
-        # Create pie chart
-        if sum(sizes) > 0:
-            ax.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
-        else:
-            ax.text(0.5, 0.5, 'Chưa có dữ liệu', ha='center', va='center', transform=ax.transAxes)
-        
-        ax.set_title('Phân loại thành viên')
-        
-        # Embed chart
-        canvas = FigureCanvasTkAgg(fig, frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        self._render_chart('members', "Thống kê thành viên")
     
     def _create_report_chart(self):
         """Create report statistics chart"""
-        frame = self.chart_frames['reports']
-        
-        # Clear existing content
-        for widget in frame.winfo_children():
-            widget.destroy()
-        
-        # Chart title
-        title_label = tk.Label(frame, text="Thống kê báo cáo", 
-                              font=("Segoe UI", 12, "bold"),
-                              bg=ModernTheme.WHITE, fg=ModernTheme.GRAY_900)
-        title_label.pack(pady=(10, 5))
-        
-        # Create figure
-        fig = Figure(figsize=(5, 3), dpi=100, facecolor='white')
-        ax = fig.add_subplot(111)
-        
-        # Data
-        report_stats = self.stats_data['reports']
-        categories = ['Nháp', 'Chờ duyệt', 'Đã duyệt', 'Từ chối']
-        values = [
-            report_stats.get('draft', 0),
-            report_stats.get('submitted', 0),
-            report_stats.get('approved', 0),
-            report_stats.get('rejected', 0)
-        ]
-        
-        # Create bar chart
-        bars = ax.bar(categories, values, color=['#94a3b8', '#f59e0b', '#10b981', '#ef4444'])
-        ax.set_title('Trạng thái báo cáo')
-        ax.set_ylabel('Số lượng')
-        
-        # Add value labels on bars
-        for bar, value in zip(bars, values):
-            if value > 0:
-                ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.1, str(value),
-                       ha='center', va='bottom')
-        
-        # Embed chart
-        canvas = FigureCanvasTkAgg(fig, frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        self._render_chart('reports', "Thống kê báo cáo")
     
     def _create_task_chart(self):
         """Create task statistics chart"""
-        frame = self.chart_frames['tasks']
+        self._render_chart('tasks', "Thống kê công việc")
+    
+    def _get_chart_label(self, chart_key: str, title: str) -> tk.Label:
+        """Get (or create once) the title and image labels of a chart frame"""
+        if chart_key in self.charts:
+            return self.charts[chart_key]
         
-        # Clear existing content
-        for widget in frame.winfo_children():
-            widget.destroy()
+        frame = self.chart_frames[chart_key]
         
         # Chart title
-        title_label = tk.Label(frame, text="Thống kê công việc", 
+        title_label = tk.Label(frame, text=title, 
                               font=("Segoe UI", 12, "bold"),
                               bg=ModernTheme.WHITE, fg=ModernTheme.GRAY_900)
         title_label.pack(pady=(10, 5))
         
-        # Create figure
-        fig = Figure(figsize=(10, 3), dpi=100, facecolor='white')
-        ax = fig.add_subplot(111)
-        
-        # Data
-        task_stats = self.stats_data['tasks']
-        
-        # Tính toán các trạng thái chính (loại trừ các trạng thái ít dùng)
-        not_started = task_stats.get('not_started', 0)
-        in_progress = task_stats.get('in_progress', 0) 
-        completed = task_stats.get('completed', 0)
-        overdue = task_stats.get('overdue', 0)
-        
-        categories = ['Chưa bắt đầu', 'Đang thực hiện', 'Hoàn thành', 'Quá hạn']
-        values = [not_started, in_progress, completed, overdue]
-        
-        # Create horizontal bar chart
-        bars = ax.barh(categories, values, color=['#94a3b8', '#3b82f6', '#10b981', '#ef4444'])
-        ax.set_title('Trạng thái công việc')
-        ax.set_xlabel('Số lượng')
-        
-        # Add value labels on bars
-        for bar, value in zip(bars, values):
-            if value > 0:
-                ax.text(bar.get_width() + 0.1, bar.get_y() + bar.get_height()/2, str(value),
-                       ha='left', va='center')
-        
-        # Embed chart
-        canvas = FigureCanvasTkAgg(fig, frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        # Chart image - được cập nhật tại chỗ sau mỗi lần render
+        image_label = tk.Label(frame, bg=ModernTheme.WHITE)
+        image_label.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        
+        self.charts[chart_key] = image_label
+        return image_label
+    
+    def _render_chart(self, chart_key: str, title: str):
+        """Request a chart image from the background renderer"""
+        image_label = self._get_chart_label(chart_key, title)
+        
+        def on_ready(png: bytes):
+            if image_label.winfo_exists():
+                self._show_chart_image(image_label, png)
+        
+        chart_renderer.render(self.window, chart_key, self.stats_data[chart_key], on_ready)
+    
+    def _show_chart_image(self, image_label: tk.Label, png: bytes):
+        """Display rendered PNG bytes in a chart label"""
+        photo = ChartRenderer.to_photo_image(image_label, png)
+        image_label.config(image=photo)
+        image_label.image = photo  # Giữ tham chiếu để tránh bị garbage collect
+    
+    def _show_last_rendered_charts(self) -> bool:
+        """Show the most recently rendered charts while fresh data loads"""
+        if not MATPLOTLIB_AVAILABLE:
+            return False
+        
+        titles = {
+            'members': "Thống kê thành viên",
+            'reports': "Thống kê báo cáo",
+            'tasks': "Thống kê công việc"
+        }
+        shown = False
+        for chart_key, title in titles.items():
+            png = chart_renderer.get_last_rendered(chart_key)
+            if png is not None and chart_key in self.chart_frames:
+                self._show_chart_image(self._get_chart_label(chart_key, title), png)
+                shown = True
+        return shown
     
     def _refresh_data(self):
         """Refresh all statistics data"""
-        self._load_statistics_data()
+        self._load_statistics_data(refresh=True)
 
 
 def show_statistics_window(parent, member_use_case=None, report_use_case=None, task_use_case=None):
@@ -8,6 +8,7 @@ import tkinter as tk
 from tkinter import ttk
 from typing import Callable, List, Tuple, Optional, Dict, Any
 from presentation.gui.theme import ModernTheme
+from presentation.gui.ui_watchdog import begin_section, ui_timed
 from presentation.gui.base_components import BaseHeader, BaseTable, BaseFilter
 from application.services.excel_service import ExcelExportService
 
@@ -469,6 +470,7 @@ class TaskForm:
             Dict with form data or None if cancelled
         """
         # Create dialog window
+        construction = begin_section('TaskForm.create_task_form_dialog')
         dialog = tk.Toplevel(parent)
         dialog.title(title)
         dialog.geometry("650x700")
@@ -1132,6 +1134,7 @@ class TaskForm:
             dialog.after(100, lambda: dialog.focus_set())
         
         # Wait for dialog to close
+        construction.end()
         dialog.wait_window()
         
         return result if is_saved else None
@@ -1161,6 +1164,7 @@ class TaskActions:
         return members_map
     
     @staticmethod
+    @ui_timed('TaskActions.populate_task_tree')
     def populate_task_tree(tree: ttk.Treeview, tasks: List[Any], members_map: dict = None):
         """
         Populate task tree with data and apply styling based on priority and status
@@ -1251,15 +1255,7 @@ class TaskActions:
             elif status_str in ["overdue", "Quá hạn"]:
                 tags.append('overdue')
             else:
-                # Check if overdue (only if not completed/cancelled)
-                if hasattr(task, 'due_date') and task.due_date:
-                    from datetime import datetime
-                    if task.due_date < datetime.now():
-                        tags.append('overdue')
-                    else:
-                        tags.append('normal')
-                else:
-                    tags.append('normal')
+                tags.append('normal')
             
             item_id = tree.insert('', 'end', values=(
                 '☐',  # Select checkbox
@@ -1286,13 +1282,9 @@ class TaskActions:
         elif status in ["cancelled", "Hủy bỏ"]:
             tree.item(item_id, tags=('cancelled',))
             return
-        
-        # Check if overdue
-        if hasattr(task, 'due_date') and task.due_date:
-            from datetime import datetime
-            if task.due_date < datetime.now() and status not in ["completed", "Hoàn thành"]:
-                tree.item(item_id, tags=('overdue',))
-                return
+        elif status in ["overdue", "Quá hạn"]:
+            tree.item(item_id, tags=('overdue',))
+            return
         
         # Priority-based styling (secondary)
         if priority in ["urgent", "Khẩn cấp", "🔴 Khẩn cấp"]:
@@ -1428,51 +1420,20 @@ class TaskActions:
         TaskActions.populate_task_tree(tree, filtered_tasks)
     
     @staticmethod
-    def get_task_statistics(tasks: List[Any]) -> Dict[str, int]:
+    def get_task_statistics(tasks: Any) -> Dict[str, int]:
         """
         Calculate task statistics
         
         Args:
-            tasks: List of task objects
+            tasks: List of task objects, or a TaskFrame
             
         Returns:
             Dict with statistics
         """
-        stats = {
-            'total': len(tasks),
-            'completed': 0,
-            'in_progress': 0,
-            'pending': 0,
-            'overdue': 0,
-            'high_priority': 0
-        }
-        
-        from datetime import datetime
-        now = datetime.now()
-        
-        for task in tasks:
-            status = task.status.value if hasattr(task.status, 'value') else task.status
-            priority = task.priority.value if hasattr(task.priority, 'value') else task.priority
-            
-            # Status counts
-            if status in ["completed", "Hoàn thành"]:
-                stats['completed'] += 1
-            elif status in ["in_progress", "Đang thực hiện"]:
-                stats['in_progress'] += 1
-            elif status in ["not_started", "Chờ thực hiện"]:
-                stats['pending'] += 1
-            
-            # Priority counts
-            if priority in ["high", "urgent", "Cao", "Khẩn cấp"]:
-                stats['high_priority'] += 1
-            
-            # Overdue check - check both explicit overdue status and date-based overdue
-            if (status in ["overdue", "Quá hạn"] or 
-                (hasattr(task, 'due_date') and task.due_date and 
-                task.due_date < now and status not in ["completed", "Hoàn thành"])):
-                stats['overdue'] += 1
+        from domain.entities.frames import TaskFrame
         
-        return stats
+        frame = tasks if isinstance(tasks, TaskFrame) else TaskFrame.from_entities(tasks)
+        return frame.statistics()
     
     @staticmethod
     def export_tasks_to_excel(tasks: List[Any]) -> str:
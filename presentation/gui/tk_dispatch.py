@@ -0,0 +1,58 @@
+"""
+Tk dispatch
+Chuyển lời gọi từ thread nền về Tk thread qua queue.Queue - thread nền không gọi thẳng vào Tk
+(``widget.after`` từ thread khác chỉ chạy được trên một số bản build tkinter)
+"""
+import queue
+import tkinter as tk
+from typing import Any, Callable
+
+
+class TkDispatcher:
+    """
+    Hàng đợi lời gọi của một Tk root.
+
+    Thread nền chỉ ``put`` vào ``queue.Queue``; Tk thread rút hết hàng đợi trong
+    vòng ``after`` mỗi ``interval_ms``. Callback gặp widget đã bị hủy (cửa sổ
+    đóng trước khi kết quả về) được bỏ qua, lỗi khác được in ra và không làm
+    dừng vòng lặp.
+    """
+
+    def __init__(self, root: tk.Misc, interval_ms: int = 50):
+        self.root = root
+        self.interval_ms = interval_ms
+        self._queue: 'queue.Queue[tuple]' = queue.Queue()
+        self.root.after(self.interval_ms, self._poll)
+
+    def call(self, callback: Callable[..., Any], *args):
+        """Gọi ``callback(*args)`` trên Tk thread (an toàn từ mọi thread)"""
+        self._queue.put((callback, args))
+
+    def _poll(self):
+        while True:
+            try:
+                callback, args = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args)
+            except tk.TclError:
+                # Widget đã bị hủy trước khi callback chạy
+                pass
+            except Exception as e:
+                print(f"⚠️ Tk callback failed: {e}")
+        try:
+            self.root.after(self.interval_ms, self._poll)
+        except tk.TclError:
+            # Ứng dụng đã đóng
+            pass
+
+
+def get_tk_dispatcher(widget: tk.Misc) -> TkDispatcher:
+    """Dispatcher dùng chung của Tk root chứa ``widget`` - lần đầu phải gọi trên Tk thread"""
+    root = widget.nametowidget('.')
+    dispatcher = getattr(root, '_tk_dispatcher', None)
+    if dispatcher is None:
+        dispatcher = TkDispatcher(root)
+        root._tk_dispatcher = dispatcher
+    return dispatcher
@@ -0,0 +1,230 @@
+"""
+UI watchdog
+Đo độ trễ event loop của Tk bằng nhịp after() và ghi nhận callback gây treo giao diện
+"""
+import functools
+import threading
+import time
+import tkinter as tk
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from tkinter import ttk
+from typing import Dict, List, Optional, Tuple
+
+from config.logging_config import get_logger
+
+logger = get_logger('ui')
+
+
+@dataclass
+class Section:
+    """Một lần chạy của đoạn code được đo trên luồng Tk"""
+    name: str
+    path: str
+    start: float
+    end: float = 0.0
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end - self.start) * 1000
+
+
+@dataclass
+class Stall:
+    """Một lần event loop bị chặn lâu hơn ngưỡng"""
+    at: datetime
+    lag_ms: float
+    culprit: str
+    sections: List[Tuple[str, float]] = field(default_factory=list)
+
+
+class UiWatchdog:
+    """
+    Đặt nhịp ``after(interval)`` liên tục; nhịp đến muộn hơn dự kiến quá
+    ``stall_ms`` nghĩa là luồng Tk đã bị chặn. Các đoạn được đo bằng
+    ``ui_timed``/``begin_section`` chồng lên khoảng bị chặn cho biết nguyên nhân.
+    """
+
+    def __init__(self, root: tk.Misc, interval_ms: int = 50, stall_ms: float = 100.0, history: int = 200):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.stall_ms = stall_ms
+        self.stalls: deque = deque(maxlen=history)
+        self.totals: Dict[str, List[float]] = {}  # tên -> [số lần, tổng ms, max ms]
+        self._recent: deque = deque(maxlen=256)
+        self._active: List[Section] = []
+        self._expected: Optional[float] = None
+        self._running = False
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._schedule()
+
+    def stop(self):
+        self._running = False
+
+    def _schedule(self):
+        self._expected = time.perf_counter() + self.interval_ms / 1000
+        self.root.after(self.interval_ms, self._beat)
+
+    def _beat(self):
+        if not self._running:
+            return
+        now = time.perf_counter()
+        lag_ms = (now - self._expected) * 1000
+        if lag_ms >= self.stall_ms:
+            self._record_stall(self._expected, now, lag_ms)
+        self._schedule()
+
+    def _record_stall(self, window_start: float, window_end: float, lag_ms: float):
+        # Đoạn nào còn chạy sau thời điểm nhịp lẽ ra đến là đoạn đã chặn event loop
+        overlapping = [s for s in self._recent if s.end >= window_start and s.start <= window_end]
+        overlapping.sort(key=lambda s: s.duration_ms, reverse=True)
+        culprit = 'không xác định (callback chưa được đo)'
+        if overlapping:
+            # Đoạn lồng sâu nhất chiếm gần hết thời gian của đoạn dài nhất chỉ rõ nguyên nhân hơn đoạn ngoài
+            longest = overlapping[0].duration_ms
+            culprit = max((s for s in overlapping if s.duration_ms >= 0.8 * longest),
+                          key=lambda s: s.path.count(' > ')).path
+        stall = Stall(datetime.now(), lag_ms, culprit, [(s.path, s.duration_ms) for s in overlapping[:5]])
+        self.stalls.append(stall)
+        logger.warning(f"UI stall {lag_ms:.0f} ms - {culprit}")
+
+    # Đo các đoạn code
+    def begin(self, name: str) -> Section:
+        path = ' > '.join([s.name for s in self._active] + [name])
+        section = Section(name, path, time.perf_counter())
+        self._active.append(section)
+        return section
+
+    def end(self, section: Section):
+        section.end = time.perf_counter()
+        if section in self._active:
+            self._active.remove(section)
+        self._recent.append(section)
+        totals = self.totals.setdefault(section.name, [0, 0.0, 0.0])
+        totals[0] += 1
+        totals[1] += section.duration_ms
+        totals[2] = max(totals[2], section.duration_ms)
+
+
+_watchdog: Optional[UiWatchdog] = None
+
+
+def get_watchdog() -> Optional[UiWatchdog]:
+    return _watchdog
+
+
+def start_watchdog(root: tk.Misc) -> Optional[UiWatchdog]:
+    """Khởi động watchdog dùng chung theo cấu hình, None khi UI_WATCHDOG_ENABLED tắt"""
+    global _watchdog
+    from config.settings import config
+    if not config.UI_WATCHDOG_ENABLED:
+        return None
+    if _watchdog is None:
+        _watchdog = UiWatchdog(root, interval_ms=config.UI_WATCHDOG_INTERVAL_MS,
+                               stall_ms=config.UI_STALL_THRESHOLD_MS)
+        _watchdog.start()
+    return _watchdog
+
+
+class _NullSection:
+    def end(self):
+        pass
+
+
+class _TimedSection:
+    def __init__(self, watchdog: UiWatchdog, name: str):
+        self._watchdog = watchdog
+        self._section = watchdog.begin(name)
+
+    def end(self):
+        self._watchdog.end(self._section)
+
+
+def begin_section(name: str):
+    """Bắt đầu đo một đoạn trên luồng Tk (gọi ``.end()`` khi xong), ví dụ phần dựng dialog trước wait_window()"""
+    watchdog = _watchdog
+    if watchdog is None or threading.current_thread() is not threading.main_thread():
+        return _NullSection()
+    return _TimedSection(watchdog, name)
+
+
+def ui_timed(name: str):
+    """Decorator đo thời gian chạy của hàm trên luồng Tk"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            section = begin_section(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                section.end()
+        return wrapper
+    return decorator
+
+
+class DiagnosticsWindow:
+    """Cửa sổ chẩn đoán: các lần treo gần đây và thời gian của các đoạn được đo"""
+
+    @staticmethod
+    def show(parent: tk.Misc):
+        watchdog = _watchdog
+        window = tk.Toplevel(parent)
+        window.title("🩺 Chẩn đoán giao diện")
+        window.geometry("900x560")
+        window.transient(parent)
+
+        if watchdog is None:
+            tk.Label(window, text="UI watchdog đang tắt (UI_WATCHDOG_ENABLED=False)").pack(padx=20, pady=20)
+            return window
+
+        tk.Label(window, text=f"Các lần event loop bị chặn > {watchdog.stall_ms:.0f} ms",
+                 font=("Segoe UI", 11, "bold")).pack(anchor=tk.W, padx=10, pady=(10, 4))
+        stall_tree = ttk.Treeview(window, columns=("at", "lag", "culprit"), show="headings", height=10)
+        for column, heading, width in (("at", "Thời điểm", 140), ("lag", "Độ trễ (ms)", 100),
+                                       ("culprit", "Nguyên nhân", 620)):
+            stall_tree.heading(column, text=heading)
+            stall_tree.column(column, width=width, anchor=tk.W)
+        stall_tree.pack(fill=tk.BOTH, expand=True, padx=10)
+
+        tk.Label(window, text="Thời gian các đoạn được đo",
+                 font=("Segoe UI", 11, "bold")).pack(anchor=tk.W, padx=10, pady=(10, 4))
+        section_tree = ttk.Treeview(window, columns=("name", "count", "avg", "max"), show="headings", height=8)
+        for column, heading, width in (("name", "Đoạn", 520), ("count", "Số lần", 80),
+                                       ("avg", "TB (ms)", 100), ("max", "Max (ms)", 100)):
+            section_tree.heading(column, text=heading)
+            section_tree.column(column, width=width, anchor=tk.W)
+        section_tree.pack(fill=tk.BOTH, expand=True, padx=10)
+
+        def refresh():
+            stall_tree.delete(*stall_tree.get_children())
+            for stall in reversed(watchdog.stalls):
+                stall_tree.insert("", tk.END, values=(stall.at.strftime("%H:%M:%S"),
+                                                      f"{stall.lag_ms:.0f}", stall.culprit))
+            section_tree.delete(*section_tree.get_children())
+            for name, (count, total, longest) in sorted(watchdog.totals.items(),
+                                                        key=lambda item: item[1][2], reverse=True):
+                section_tree.insert("", tk.END, values=(name, count, f"{total / count:.1f}", f"{longest:.1f}"))
+
+        ttk.Button(window, text="🔄 Làm mới", command=refresh).pack(anchor=tk.E, padx=10, pady=10)
+        refresh()
+        return window
+
+    @staticmethod
+    def show_text(parent: tk.Misc, title: str, content: str):
+        """Cửa sổ hiển thị báo cáo dạng text (font cố định, có thể copy)"""
+        window = tk.Toplevel(parent)
+        window.title(title)
+        window.geometry("900x560")
+        window.transient(parent)
+        text = tk.Text(window, font=("Consolas", 10), wrap=tk.NONE)
+        scrollbar = ttk.Scrollbar(window, orient="vertical", command=text.yview)
+        text.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        text.pack(fill=tk.BOTH, expand=True)
+        text.insert("1.0", content)
+        return window
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Test bộ nhắc hạn công việc: mốc nhắc trong min-heap, gộp mốc đã qua, không nhắc lại và change feed
+Không chạy luồng nền - gọi trực tiếp các bước lên lịch/lấy mốc đến hạn
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(__file__))
+
+from datetime import datetime, timedelta
+
+from application.services.deadline_scheduler import DeadlineScheduler
+from domain.entities.task import Task, TaskStatus
+from infrastructure.database.change_listener import ChangeEvent
+
+
+def _task(task_id, due_in, status=TaskStatus.IN_PROGRESS):
+    return Task(id=task_id, title=f"Công việc {task_id}", status=status, assigned_to=1,
+                due_date=datetime.now() + due_in)
+
+
+def _due(scheduler, at):
+    with scheduler._condition:
+        return scheduler._pop_due(at)
+
+
+def test_schedules_each_lead_before_due_date():
+    scheduler = DeadlineScheduler(lambda now: [], leads_minutes=(60, 1440))
+    task = _task(1, timedelta(days=3))
+    scheduler.track(task)
+    assert len(scheduler) == 2
+    assert scheduler.next_fire_at == task.due_date - timedelta(minutes=1440)
+
+    assert _due(scheduler, datetime.now()) == []
+    fired = _due(scheduler, task.due_date - timedelta(minutes=30))
+    assert [reminder.lead_minutes for reminder in fired] == [1440, 60]
+    assert len(scheduler) == 0
+
+
+def test_passed_leads_collapse_into_one_reminder():
+    """Công việc hết hạn sau 30 phút: mốc 1 ngày và 1 giờ đều đã qua - chỉ nhắc một lần (mốc nhỏ nhất)"""
+    scheduler = DeadlineScheduler(lambda now: [], leads_minutes=(1440, 60))
+    scheduler.track(_task(1, timedelta(minutes=30)))
+    assert len(scheduler) == 1
+    fired = _due(scheduler, datetime.now() + timedelta(seconds=1))
+    assert [reminder.lead_minutes for reminder in fired] == [60]
+
+
+def test_partially_passed_leads_keep_future_lead():
+    scheduler = DeadlineScheduler(lambda now: [], leads_minutes=(1440, 60))
+    task = _task(1, timedelta(hours=2))
+    scheduler.track(task)
+    assert [reminder.lead_minutes for reminder in _due(scheduler, datetime.now() + timedelta(seconds=1))] == [1440]
+    assert scheduler.next_fire_at == task.due_date - timedelta(minutes=60)
+
+
+def test_fired_reminders_are_not_repeated_after_reload():
+    task = _task(1, timedelta(hours=2))
+    deadlines = [(task.id, task.title, task.assigned_to, task.due_date)]
+    scheduler = DeadlineScheduler(lambda now: deadlines, leads_minutes=(1440, 60))
+    scheduler.reload()
+    assert len(_due(scheduler, datetime.now() + timedelta(seconds=1))) == 1
+
+    scheduler.reload()
+    assert len(scheduler) == 1  # Chỉ còn mốc 1 giờ
+    assert _due(scheduler, datetime.now() + timedelta(seconds=1)) == []
+
+    # Dời hạn: due_date mới được nhắc lại từ đầu
+    task.due_date = task.due_date + timedelta(days=3)
+    scheduler.track(task)
+    assert len(scheduler) == 2
+
+
+def test_closed_or_deleted_tasks_are_unscheduled():
+    scheduler = DeadlineScheduler(lambda now: [], leads_minutes=(1440, 60))
+    task = _task(1, timedelta(days=3))
+    scheduler.track(task)
+    task.status = TaskStatus.COMPLETED
+    scheduler.track(task)
+    assert len(scheduler) == 0 and scheduler.next_fire_at is None
+
+    scheduler.track(_task(2, timedelta(days=3)))
+    scheduler.discard(2)
+    assert len(scheduler) == 0
+    assert _due(scheduler, datetime.now() + timedelta(days=4)) == []
+
+
+def test_change_events_fetch_each_task_once():
+    calls = {'fetch': 0, 'load': 0}
+    tasks = {1: _task(1, timedelta(days=3))}
+
+    def load(now):
+        calls['load'] += 1
+        return []
+
+    def fetch(task_id):
+        calls['fetch'] += 1
+        return tasks.get(task_id)
+
+    scheduler = DeadlineScheduler(load, fetch, leads_minutes=(60,))
+    scheduler.apply_change_events([ChangeEvent('tasks', 1, 'U')] * 20 + [ChangeEvent('members', 5, 'U')])
+    assert calls == {'fetch': 1, 'load': 0}
+    assert len(scheduler) == 1
+
+    scheduler.apply_change_events([ChangeEvent('tasks', 1, 'U'), ChangeEvent('tasks', 1, 'D')])
+    assert calls['fetch'] == 1 and len(scheduler) == 0
+
+
+def test_large_or_resync_batches_reload():
+    calls = {'fetch': 0, 'load': 0}
+
+    def load(now):
+        calls['load'] += 1
+        return []
+
+    def fetch(task_id):
+        calls['fetch'] += 1
+
+    scheduler = DeadlineScheduler(load, fetch)
+    scheduler.apply_change_events([ChangeEvent('tasks', task_id, 'U') for task_id in range(100)], max_fetches=50)
+    scheduler.apply_change_events([ChangeEvent('tasks', None, 'R')])
+    assert calls == {'fetch': 0, 'load': 2}
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test thời gian import khi khởi động GUI (cold start)
+Dùng `python -X importtime` để đo và so sánh với ngân sách IMPORT_TIME_BUDGET_MS
+"""
+import os
+import subprocess
+import sys
+sys.path.append(os.path.dirname(__file__))
+
+from config.settings import AppConfig
+
+GUI_ENTRY_MODULE = "presentation.gui.main_window"
+
+# Các thư viện nặng không được phép import khi mở cửa sổ đầu tiên
+HEAVY_MODULES = ["pandas", "openpyxl", "matplotlib", "numpy"]
+
+
+def _run_importtime(code: str) -> list:
+    """Chạy python -X importtime và trả về danh sách (module, cumulative_us, depth)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Import failed:\n{result.stderr[-2000:]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), int(cumulative.strip()), depth))
+    return entries
+
+
+def measure_gui_import_time() -> tuple:
+    """Đo tổng thời gian import (ms) của GUI entry point, bỏ qua các module của interpreter"""
+    baseline = {name for name, _, _ in _run_importtime("pass")}
+    entries = _run_importtime(f"import {GUI_ENTRY_MODULE}")
+
+    total_us = sum(cumulative for name, cumulative, depth in entries
+                   if depth == 0 and name not in baseline)
+    imported = {name for name, _, _ in entries}
+    return total_us / 1000.0, imported
+
+
+def test_gui_import_time():
+    """Cold-start import của GUI phải nằm trong ngân sách và không kéo theo thư viện nặng"""
+    total_ms, imported = measure_gui_import_time()
+    print(f"⏱️ {GUI_ENTRY_MODULE}: {total_ms:.1f} ms (budget {AppConfig.IMPORT_TIME_BUDGET_MS} ms)")
+
+    heavy = [module for module in HEAVY_MODULES if module in imported]
+    assert not heavy, f"Heavy modules imported at startup: {', '.join(heavy)}"
+    assert total_ms <= AppConfig.IMPORT_TIME_BUDGET_MS, (
+        f"GUI import took {total_ms:.1f} ms, budget is {AppConfig.IMPORT_TIME_BUDGET_MS} ms"
+    )
+
+
+if __name__ == "__main__":
+    print("🧪 Test GUI Import Time")
+    print("=" * 35)
+    test_gui_import_time()
+    print("✅ Import time within budget!")
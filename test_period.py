@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test chuẩn hóa kỳ báo cáo: chuỗi nhập tự do -> khoảng ngày [start, end]
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(__file__))
+
+from datetime import date, datetime
+
+import pytest
+
+from domain.entities.period import MAX_PERIOD_DAYS, current_period, make_period, parse_period
+
+
+@pytest.mark.parametrize("text, kind, start, end", [
+    ("2024-01", 'month', date(2024, 1, 1), date(2024, 1, 31)),
+    ("2024/2", 'month', date(2024, 2, 1), date(2024, 2, 29)),
+    ("Tháng 02/2023", 'month', date(2023, 2, 1), date(2023, 2, 28)),
+    ("thang 12-2024", 'month', date(2024, 12, 1), date(2024, 12, 31)),
+    ("T3/2024", 'month', date(2024, 3, 1), date(2024, 3, 31)),
+    ("07/2024", 'month', date(2024, 7, 1), date(2024, 7, 31)),
+    ("Q1-2024", 'quarter', date(2024, 1, 1), date(2024, 3, 31)),
+    ("Quý 4/2024", 'quarter', date(2024, 10, 1), date(2024, 12, 31)),
+    ("2024-Q3", 'quarter', date(2024, 7, 1), date(2024, 9, 30)),
+    ("2024-H2", 'half', date(2024, 7, 1), date(2024, 12, 31)),
+    ("H1 2024", 'half', date(2024, 1, 1), date(2024, 6, 30)),
+    ("Năm 2024", 'year', date(2024, 1, 1), date(2024, 12, 31)),
+    ("  2023  ", 'year', date(2023, 1, 1), date(2023, 12, 31)),
+])
+def test_parse_period(text, kind, start, end):
+    period = parse_period(text)
+    assert period is not None
+    assert (period.kind, period.start, period.end) == (kind, start, end)
+
+
+@pytest.mark.parametrize("text", [None, "", "2023-Special", "2024-13", "Q5-2024", "2024-H3", "tháng 0/2024"])
+def test_unrecognized_period(text):
+    assert parse_period(text) is None
+
+
+@pytest.mark.parametrize("kind, number", [('month', 1), ('month', 12), ('quarter', 2), ('half', 2), ('year', 1)])
+def test_label_round_trip(kind, number):
+    """Nhãn của nút "Tháng này/Quý này/Năm này" parse lại ra đúng kỳ"""
+    period = make_period(kind, 2024, number)
+    assert parse_period(period.label) == period
+
+
+def test_current_period_and_bounds():
+    period = current_period('quarter', datetime(2024, 8, 15, 10, 30))
+    assert (period.number, period.start, period.end) == (3, date(2024, 7, 1), date(2024, 9, 30))
+    assert period.bounds() == (datetime(2024, 7, 1), datetime(2024, 10, 1))
+
+
+def test_year_fits_max_period_days():
+    """MAX_PERIOD_DAYS giới hạn range scan - kỳ dài nhất (năm nhuận) không được vượt"""
+    leap = make_period('year', 2024)
+    assert (leap.end - leap.start).days + 1 == MAX_PERIOD_DAYS
+
+
+def test_make_period_rejects_invalid():
+    with pytest.raises(ValueError):
+        make_period('week', 2024)
+    with pytest.raises(ValueError):
+        make_period('quarter', 2024, 5)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test lịch sử phiên bản báo cáo: delta theo dòng, nhịp lưu toàn văn và phát hiện phiên bản hỏng
+Dùng repository trong bộ nhớ - không cần PostgreSQL
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(__file__))
+
+import pytest
+
+from application.services.report_revisions import (
+    ReportRevisionService, apply_delta, content_hash, encode_delta, side_by_side
+)
+
+
+class InMemoryRevisionRepository:
+    """Cùng giao diện với ReportRevisionRepository, giữ các phiên bản trong một list"""
+
+    def __init__(self):
+        self.rows = []
+
+    def create(self, revision):
+        revision.id = len(self.rows) + 1
+        self.rows.append(revision)
+        return revision
+
+    def get_latest(self, report_id):
+        rows = [row for row in self.rows if row.report_id == report_id]
+        return max(rows, key=lambda row: row.revision) if rows else None
+
+    def get_chain(self, report_id, revision):
+        rows = sorted((row for row in self.rows if row.report_id == report_id and row.revision <= revision),
+                      key=lambda row: row.revision)
+        snapshots = [index for index, row in enumerate(rows) if row.is_snapshot]
+        return rows[snapshots[-1]:] if snapshots else []
+
+    def get_by_report(self, report_id):
+        return sorted((row for row in self.rows if row.report_id == report_id),
+                      key=lambda row: row.revision, reverse=True)
+
+    def delete_by_report(self, report_id):
+        before = len(self.rows)
+        self.rows = [row for row in self.rows if row.report_id != report_id]
+        return before - len(self.rows)
+
+
+@pytest.mark.parametrize("base, content", [
+    ("a\nb\nc\n", "a\nB\nc\nd\n"),
+    ("dòng 1\r\ndòng 2\r\ndòng 3\r\n", "dòng 1\r\ndòng 2 sửa\r\ndòng 3\r\n"),
+    ("a\r\nb\nc", "a\nb\r\nc"),
+    ("không xuống dòng cuối", "không xuống dòng cuối\nthêm dòng"),
+    ("a\nb\n", "a\nb"),
+    ("", "nội dung mới\n"),
+    ("xóa hết\n", ""),
+    ("tab\x0bdọc phân cách\n", "tab\x0bdọc đã sửa\n"),
+])
+def test_delta_round_trip(base, content):
+    """apply_delta(base, encode_delta(base, content)) dựng lại đúng từng byte, kể cả CRLF và dòng cuối"""
+    assert apply_delta(base, encode_delta(base, content)) == content
+
+
+def test_delta_copies_unchanged_lines():
+    """Dòng không đổi lưu bằng khoảng [i, j] thay vì chép lại văn bản"""
+    base = "".join(f"dòng {number}\n" for number in range(200))
+    content = base.replace("dòng 100\n", "dòng 100 đã sửa\n")
+    delta = encode_delta(base, content)
+    assert len(delta) < len(content) // 10
+    assert apply_delta(base, delta) == content
+
+
+def test_side_by_side_pairs_lines():
+    rows = side_by_side("a\nb\nc", "a\nB\nc\nd")
+    assert [(row.tag, row.old_number, row.new_number) for row in rows] == [
+        ('equal', 1, 1), ('replace', 2, 2), ('equal', 3, 3), ('insert', None, 4),
+    ]
+
+
+def _versions(count):
+    """Mỗi phiên bản sửa thêm một dòng so với phiên bản trước - delta luôn nhỏ hơn toàn văn"""
+    lines = [f"mục {line}: nội dung ban đầu của báo cáo\n" for line in range(30)]
+    versions = []
+    for version in range(1, count + 1):
+        lines[version % 30] = f"mục {version % 30}: sửa ở phiên bản {version}\n"
+        versions.append("".join(lines))
+    return versions
+
+
+@pytest.mark.parametrize("snapshot_every", [1, 2, 3, 10])
+def test_snapshot_cadence_and_chain(snapshot_every):
+    """Phiên bản 1, 1 + k*snapshot_every là toàn văn; mọi phiên bản dựng lại được từ chuỗi ngắn"""
+    repository = InMemoryRevisionRepository()
+    service = ReportRevisionService(repository, snapshot_every=snapshot_every)
+    versions = _versions(2 * snapshot_every + 2)
+    for content in versions:
+        service.record(7, content)
+
+    stored = sorted(repository.rows, key=lambda row: row.revision)
+    assert [row.revision for row in stored] == list(range(1, len(versions) + 1))
+    for row in stored:
+        assert row.is_snapshot == ((row.revision - 1) % snapshot_every == 0)
+
+    # Service mới (không có cache phiên bản mới nhất) phải dựng lại từ repository
+    fresh = ReportRevisionService(repository, snapshot_every=snapshot_every)
+    for revision, content in enumerate(versions, start=1):
+        chain = repository.get_chain(7, revision)
+        assert chain[0].is_snapshot and len(chain) <= snapshot_every
+        assert fresh.get_content(7, revision) == content
+
+
+def test_unchanged_content_is_not_recorded():
+    service = ReportRevisionService(InMemoryRevisionRepository(), snapshot_every=5)
+    assert service.record(1, "giống nhau\n") is not None
+    assert service.record(1, "giống nhau\n") is None
+
+
+def test_previous_content_becomes_first_revision():
+    """Báo cáo có từ trước khi có lịch sử: nội dung cũ thành phiên bản 1"""
+    repository = InMemoryRevisionRepository()
+    service = ReportRevisionService(repository, snapshot_every=5)
+    service.record(3, "mới\n", previous="cũ\n")
+    fresh = ReportRevisionService(repository, snapshot_every=5)
+    assert fresh.get_content(3, 1) == "cũ\n"
+    assert fresh.get_content(3, 2) == "mới\n"
+
+
+def test_corrupted_revision_is_detected():
+    """Snapshot bị sửa ngoài ý muốn làm hash phiên bản dựng lại không khớp"""
+    repository = InMemoryRevisionRepository()
+    service = ReportRevisionService(repository, snapshot_every=10)
+    for content in _versions(3):
+        service.record(9, content)
+    repository.rows[0].data = repository.rows[0].data.replace("mục 0", "mục O")
+    assert not repository.rows[2].is_snapshot
+
+    fresh = ReportRevisionService(repository, snapshot_every=10)
+    with pytest.raises(ValueError, match="bị hỏng"):
+        fresh.get_content(9, 3)
+    assert content_hash(_versions(3)[2]) == repository.rows[2].content_sha256
+
+
+def test_missing_revision_raises():
+    service = ReportRevisionService(InMemoryRevisionRepository(), snapshot_every=10)
+    service.record(4, "một\n")
+    with pytest.raises(ValueError):
+        service.get_content(4, 5)
+    with pytest.raises(ValueError):
+        service.get_content(99)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))